@@ -1,6 +1,33 @@
 import ephem
+import math
+import threading
+
+import numpy as np
 from datetime import date, datetime, timedelta
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple, Optional
+
+from app.ephemeris_table import EphemerisTable
+
+# ephem search for each of the next phase dates returned by get_moon_data
+PHASE_SEARCHES = {
+    'next_full_moon': ephem.next_full_moon,
+    'next_new_moon': ephem.next_new_moon,
+    'next_first_quarter': ephem.next_first_quarter_moon,
+    'next_last_quarter': ephem.next_last_quarter_moon,
+}
+
+# Kilometres per astronomical unit, for distances reported by ephem in AU
+KM_PER_AU = ephem.meters_per_au / 1000.0
+
+# Observer used when no location is given: sea level at 0°N 0°E
+DEFAULT_LOCATION = {'latitude': 0.0, 'longitude': 0.0, 'elevation': 0.0}
+
+# Sidereal days per solar day, for advancing local sidereal time
+SIDEREAL_RATE = 1.00273790935
+
+# Instants at which get_phase_curve computes positions; everything in between
+# is interpolated, since the Moon's coordinates are smooth over a day
+CURVE_ANCHORS = 5
 
 class AstronomyAdapter:
     """
@@ -8,49 +35,177 @@ class AstronomyAdapter:
     
     This class provides an interface to astronomical calculations
     using the ephem library, specifically for moon phase information.
+    
+    Each thread reuses its own Observer, Moon and Sun objects, so one
+    adapter can be shared by all request threads without allocating
+    ephem objects per call.
     """
     
-    def get_moon_data(self, date_obj: date, time_str: str = '22:00:00') -> Dict[str, Any]:
+    def __init__(self, table: Optional[EphemerisTable] = None):
+        """
+        Initialize the adapter.
+        
+        Args:
+            table: Optional precomputed ephemeris table, consulted before ephem
+                for instants and phase dates it covers
+        """
+        self.table = table
+        self._local = threading.local()
+    
+    def get_moon_data(self, date_obj: date, time_str: str = '22:00:00',
+                      location: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         """
         Get moon data for the specified date and time.
         
         Args:
             date_obj: The date for which to calculate moon data
             time_str: The time of day as a string in format "HH:MM:SS", defaults to 10 PM
+            location: Optional observer location with 'latitude' and 'longitude' in
+                degrees and 'elevation' in meters; defaults to a sea-level
+                observer at 0°N 0°E
+            
+        Returns:
+            dict: Dictionary containing moon illumination, phase angle, earth distance (AU)
+                and next phase dates
+        """
+        # Position and illumination at the requested instant
+        phase_state = self.get_phase_state(date_obj, time_str, location)
+        obs_date = phase_state['ephem_date']
+        
+        moon_data = {
+            'illumination': phase_state['illumination'],
+            'phase_angle': phase_state['phase_angle'],
+            'earth_distance': phase_state['earth_distance']
+        }
+        
+        # Calculate next phase dates, from the table's event index when it covers them
+        for name, search in PHASE_SEARCHES.items():
+            next_date = self.table.next_phase_date(name, obs_date) if self.table else None
+            if next_date is None:
+                next_date = search(obs_date)
+            moon_data[name] = self._ephem_date_to_python_date(next_date)
+        
+        return moon_data
+    
+    def get_phase_state(self, date_obj: date, time_str: str = '22:00:00',
+                        location: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Get the moon's illumination and phase angle without searching for phase dates.
+        
+        This is the cheap part of get_moon_data, for callers that need many
+        instants (e.g. animation frames) but not the next phase dates.
+        
+        Args:
+            date_obj: The date for which to calculate moon data
+            time_str: The time of day as a string in format "HH:MM:SS", defaults to 10 PM
+            location: Optional observer location, as for get_moon_data
             
         Returns:
-            dict: Dictionary containing moon illumination, phase angle, and next phase dates
+            dict: Dictionary with 'illumination' (0-1), 'phase_angle' (0-360),
+                'earth_distance' (AU) and the 'ephem_date' of the instant
         """
-        # Convert date and time to ephem date format (Dublin JD)
-        date_str = date_obj.strftime('%Y/%m/%d')
-        date_time_str = f"{date_str} {time_str}"
-        obs_date = ephem.Date(date_time_str)
+        # Convert date and time to ephem date format (Dublin JD); a tuple
+        # avoids ephem's string parser
+        hours, minutes, seconds = time_str.split(':')
+        obs_date = ephem.Date((date_obj.year, date_obj.month, date_obj.day,
+                               int(hours), int(minutes), float(seconds)))
+        
+        # The table holds geocentric-observer samples only
+        if self.table is not None and not location:
+            sample = self.table.get_phase_state(obs_date)
+            if sample is not None:
+                sample['ephem_date'] = obs_date
+                return sample
         
-        # Create an observer at approximately sea level
-        observer = ephem.Observer()
+        # Position this thread's observer (sea level at 0°N 0°E by default)
+        observer, moon, sun = self._get_bodies()
         observer.date = obs_date
-        observer.pressure = 0  # Ignore atmospheric refraction
+        self._apply_location(observer, location or DEFAULT_LOCATION)
         
-        # Calculate moon position and illumination
-        moon = ephem.Moon(observer)
+        # Compute each body exactly once for the instant; only the Sun's
+        # heliocentric longitude is used, which does not depend on the observer
+        moon.compute(observer)
+        sun.compute(obs_date)
         illumination = moon.phase / 100.0  # ephem.Moon.phase returns percentage 0-100
         
         # Calculate phase angle (0-360 degrees)
-        phase_angle = self._calculate_moon_phase_angle(moon, observer)
-        
-        # Calculate next phase dates
-        next_full_moon = ephem.next_full_moon(obs_date)
-        next_new_moon = ephem.next_new_moon(obs_date)
-        next_first_quarter = ephem.next_first_quarter_moon(obs_date)
-        next_last_quarter = ephem.next_last_quarter_moon(obs_date)
+        phase_angle = self._calculate_moon_phase_angle(moon, sun)
         
         return {
             'illumination': illumination,
             'phase_angle': phase_angle,
-            'next_full_moon': self._ephem_date_to_python_date(next_full_moon),
-            'next_new_moon': self._ephem_date_to_python_date(next_new_moon),
-            'next_first_quarter': self._ephem_date_to_python_date(next_first_quarter),
-            'next_last_quarter': self._ephem_date_to_python_date(next_last_quarter)
+            'earth_distance': moon.earth_distance,
+            'ephem_date': obs_date
+        }
+    
+    def get_phase_curve(self, start: datetime, hours: float, points: int,
+                        location: Optional[Dict[str, float]] = None) -> Dict[str, List[float]]:
+        """
+        Get illumination, phase angle and altitude at evenly spaced instants.
+        
+        ephem computes the Moon and Sun at only CURVE_ANCHORS instants. The
+        coordinates are interpolated to all points with one polynomial fit,
+        and altitudes are computed for all points at once from the
+        interpolated coordinates and the local sidereal time, corrected for
+        parallax. The cost barely depends on the number of points, and
+        altitudes agree with ephem's to a few hundredths of a degree.
+        
+        Args:
+            start: First instant as a naive UTC datetime
+            hours: Time from the first to the last instant
+            points: Number of instants, at least 2
+            location: Optional observer location, as for get_moon_data
+            
+        Returns:
+            dict: 'times' (naive UTC datetimes), 'illumination_percent',
+                'phase_angle' (0-360) and 'altitude' (degrees), one value per instant
+        """
+        if points < 2:
+            raise ValueError("A curve needs at least 2 points")
+        
+        observer, moon, sun = self._get_bodies()
+        self._apply_location(observer, location or DEFAULT_LOCATION)
+        first = ephem.Date(start)
+        span = hours / 24.0
+        
+        # Exact positions at the anchors
+        anchor_fractions = np.linspace(0.0, 1.0, CURVE_ANCHORS)
+        samples = []
+        for fraction in anchor_fractions:
+            instant = ephem.Date(first + fraction * span)
+            moon.compute(instant)
+            sun.compute(instant)
+            samples.append((moon.g_ra, moon.g_dec, moon.earth_distance, moon.phase,
+                            math.radians(self._calculate_moon_phase_angle(moon, sun))))
+        right_ascension, declination, distance, phase, elongation = (np.array(values) for values in zip(*samples))
+        
+        # Interpolate to every point; angles are unwrapped so they do not jump at 360
+        fractions = np.linspace(0.0, 1.0, points)
+        def interpolate(values):
+            return np.polyval(np.polyfit(anchor_fractions, values, CURVE_ANCHORS - 1), fractions)
+        right_ascension = interpolate(np.unwrap(right_ascension))
+        declination = interpolate(declination)
+        distance = interpolate(distance)
+        illumination = np.clip(interpolate(phase), 0.0, 100.0)
+        phase_angle = np.degrees(interpolate(np.unwrap(elongation))) % 360.0
+        
+        # Altitudes from the hour angle, then the Moon's parallax for a surface observer
+        observer.date = first
+        sidereal = float(observer.sidereal_time()) + fractions * span * 2.0 * math.pi * SIDEREAL_RATE
+        hour_angle = sidereal - right_ascension
+        latitude = float(observer.lat)
+        geocentric_altitude = np.arcsin(
+            np.sin(latitude) * np.sin(declination)
+            + np.cos(latitude) * np.cos(declination) * np.cos(hour_angle)
+        )
+        horizontal_parallax = np.arcsin(ephem.earth_radius / (distance * ephem.meters_per_au))
+        altitude = geocentric_altitude - np.arcsin(np.sin(horizontal_parallax) * np.cos(geocentric_altitude))
+        
+        return {
+            'times': [ephem.Date(first + fraction * span).datetime() for fraction in fractions],
+            'illumination_percent': illumination.tolist(),
+            'phase_angle': phase_angle.tolist(),
+            'altitude': np.degrees(altitude).tolist(),
         }
     
     def calculate_illumination(self, moon_data: Dict[str, Any]) -> float:
@@ -78,50 +233,76 @@ class AstronomyAdapter:
         """
         return moon_data['phase_angle']
     
-    def _calculate_moon_phase_angle(self, moon, observer) -> float:
+    def calculate_distance_km(self, moon_data: Dict[str, Any]) -> Optional[float]:
+        """
+        Get the distance from the observer to the Moon.
+        
+        ephem measures it from the observer's location, so it differs from
+        the geocentric distance by up to an Earth radius.
+        
+        Args:
+            moon_data: Dictionary containing moon data with 'earth_distance' in AU
+            
+        Returns:
+            float: Distance in kilometres, or None if the data has no distance
+        """
+        earth_distance = moon_data.get('earth_distance')
+        return earth_distance * KM_PER_AU if earth_distance is not None else None
+    
+    def _calculate_moon_phase_angle(self, moon, sun) -> float:
         """
         Calculate the moon phase angle in degrees (0-360).
         
+        The angle is the Moon's elongation from the Sun along the ecliptic:
+        0 at new moon, 90 at first quarter, 180 at full moon and 270 at
+        last quarter, so angles above 180 mean the Moon is waning.
+        
         Args:
-            moon: ephem.Moon object
-            observer: ephem.Observer object
+            moon: ephem.Moon computed for the instant
+            sun: ephem.Sun computed for the same instant
             
         Returns:
             float: Phase angle in degrees
         """
-        # Calculate the phase angle based on elongation
-        earth_to_moon = moon.earth_distance
-        earth_to_sun = ephem.Sun(observer).earth_distance
-        moon_to_sun = ephem.separation(moon, ephem.Sun(observer))
+        # For the Moon, hlon is its geocentric ecliptic longitude; for the Sun,
+        # hlon is the Earth's heliocentric longitude, opposite the Sun's geocentric one
+        elongation = moon.hlon - (sun.hlon + ephem.pi)
+        return float(self._normalize_angle(elongation)) * 180.0 / ephem.pi
+    
+    def _get_bodies(self) -> Tuple[ephem.Observer, ephem.Moon, ephem.Sun]:
+        """
+        Get this thread's reusable observer and bodies, creating them on first use.
         
-        # Calculate phase angle using the law of cosines
-        try:
-            cos_phase_angle = (earth_to_moon**2 + earth_to_sun**2 - 2*earth_to_moon*earth_to_sun*
-                               ephem.cos(moon_to_sun)) / (2*earth_to_moon*earth_to_sun)
-            phase_angle = ephem.degrees(ephem.acos(cos_phase_angle))
-            
-            # Convert to degrees and ensure range 0-360
-            angle_deg = float(phase_angle) * 180.0 / ephem.pi
-            
-            # Adjust based on waxing/waning to ensure full cycle
-            sun_ra = ephem.Sun(observer).ra
-            moon_ra = moon.ra
-            
-            # If the Moon is to the west of the Sun, it's waxing
-            if self._normalize_angle(moon_ra - sun_ra) < ephem.pi:
-                return angle_deg
-            else:
-                return 360.0 - angle_deg
-            
-        except (ValueError, ZeroDivisionError):
-            # Fallback calculation: use moon.phase to estimate angle
-            # This is less accurate but provides a reasonable approximation
-            return moon.phase * 3.6  # Convert 0-100 phase to 0-360 angle
+        Returns:
+            tuple: (observer, moon, sun)
+        """
+        local = self._local
+        if not hasattr(local, 'observer'):
+            local.observer = ephem.Observer()
+            local.observer.pressure = 0  # Ignore atmospheric refraction
+            local.moon = ephem.Moon()
+            local.sun = ephem.Sun()
+        
+        return local.observer, local.moon, local.sun
+    
+    def _apply_location(self, observer, location: Dict[str, float]):
+        """
+        Position an observer at the given location.
+        
+        Args:
+            observer: ephem.Observer object to update in place
+            location: Dictionary with 'latitude', 'longitude' (degrees) and
+                optional 'elevation' (meters)
+        """
+        # ephem takes floats as radians (strings would be parsed as degrees)
+        observer.lat = math.radians(location['latitude'])
+        observer.lon = math.radians(location['longitude'])
+        observer.elevation = location.get('elevation', 0.0)
     
     def _normalize_angle(self, angle):
         """Normalize an angle to be between 0 and 2π."""
         two_pi = 2 * ephem.pi
-        return angle - two_pi * ephem.floor(angle / two_pi)
+        return angle - two_pi * math.floor(angle / two_pi)
     
     def _ephem_date_to_python_date(self, ephem_date) -> date:
         """
@@ -0,0 +1,208 @@
+import bisect
+import math
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import ephem
+
+from app.adapters.astronomy_adapter import KM_PER_AU
+
+# Full moons nearer than this are supermoons and farther than this micromoons
+# (the perigee and apogee ranges are roughly 356,500-370,400 km and
+# 404,000-406,700 km)
+SUPERMOON_MAX_KM = 360000.0
+MICROMOON_MIN_KM = 405000.0
+
+DISTANCE_EVENTS = ('perigee', 'apogee', 'supermoon', 'micromoon')
+
+# Days between distance samples when scanning for extrema; perigee and
+# apogee are about 14 days apart, so no extremum is missed
+SCAN_STEP_DAYS = 0.25
+
+# Extrema are refined until the bracket is shorter than this (about 1 minute)
+REFINE_TOLERANCE_DAYS = 1.0 / 1440.0
+
+_INVERSE_GOLDEN = (math.sqrt(5) - 1) / 2
+
+class DistanceEvent:
+    """
+    A perigee, apogee, supermoon or micromoon.
+    """
+
+    def __init__(self, kind: str, ephem_date: float, distance_km: float):
+        """
+        Initialize the event.
+
+        Args:
+            kind: One of DISTANCE_EVENTS
+            ephem_date: Instant of the event as an ephem date
+            distance_km: Distance between the centres of the Earth and the Moon
+        """
+        self.kind = kind
+        self.ephem_date = ephem_date
+        self.distance_km = distance_km
+
+    @property
+    def when(self) -> datetime:
+        """The instant of the event as a naive UTC datetime."""
+        return ephem.Date(self.ephem_date).datetime()
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Convert the event to a dictionary.
+
+        Returns:
+            dict: Kind, ISO timestamp (UTC) and distance in kilometres
+        """
+        return {
+            "kind": self.kind,
+            "datetime": self.when.isoformat(timespec='seconds'),
+            "distance_km": round(self.distance_km, 1)
+        }
+
+class DistanceEventIndex:
+    """
+    Precomputed, sorted index of lunar distance events.
+
+    Perigees and apogees are found by scanning the Moon's geocentric distance
+    and refining each extremum; full moons are classified as supermoons or
+    micromoons by their distance. Queries bisect the sorted instants, like
+    the phase events of an EphemerisTable.
+    """
+
+    def __init__(self, events: Dict[str, List[DistanceEvent]], start: float, end: float):
+        """
+        Initialize the index from already sorted events.
+
+        Args:
+            events: Events by kind, each list sorted by instant
+            start: First covered instant as an ephem date
+            end: Last covered instant as an ephem date
+        """
+        self.events = events
+        self.start = start
+        self.end = end
+        self._dates = {kind: [event.ephem_date for event in events[kind]] for kind in DISTANCE_EVENTS}
+
+    @classmethod
+    def build(cls, start_date: date, days: int) -> 'DistanceEventIndex':
+        """
+        Compute the distance events between midnight UTC on start_date and days later.
+
+        Args:
+            start_date: First day covered
+            days: Number of days covered
+
+        Returns:
+            DistanceEventIndex: The index
+        """
+        if days < 1:
+            raise ValueError("days must be positive")
+
+        start = float(ephem.Date(start_date.strftime('%Y/%m/%d')))
+        end = start + days
+        moon = ephem.Moon()
+        events = {kind: [] for kind in DISTANCE_EVENTS}
+
+        # Scan one step beyond each end so extrema at the boundaries are bracketed
+        samples = int(math.ceil(days / SCAN_STEP_DAYS)) + 3
+        instants = [start + (index - 1) * SCAN_STEP_DAYS for index in range(samples)]
+        distances = [_distance_km(moon, instant) for instant in instants]
+
+        for index in range(1, samples - 1):
+            previous, current, following = distances[index - 1:index + 2]
+            if current < previous and current <= following:
+                kind, sign = 'perigee', 1.0
+            elif current > previous and current >= following:
+                kind, sign = 'apogee', -1.0
+            else:
+                continue
+
+            instant = _refine_extremum(moon, instants[index - 1], instants[index + 1], sign)
+            if start <= instant < end:
+                events[kind].append(DistanceEvent(kind, instant, _distance_km(moon, instant)))
+
+        full_moon = float(ephem.next_full_moon(start))
+        while full_moon < end:
+            distance = _distance_km(moon, full_moon)
+            if distance < SUPERMOON_MAX_KM:
+                events['supermoon'].append(DistanceEvent('supermoon', full_moon, distance))
+            elif distance > MICROMOON_MIN_KM:
+                events['micromoon'].append(DistanceEvent('micromoon', full_moon, distance))
+            full_moon = float(ephem.next_full_moon(full_moon))
+
+        return cls(events, start, end)
+
+    def next_event(self, kind: str, after: datetime) -> Optional[DistanceEvent]:
+        """
+        Find the first event of a kind after an instant.
+
+        Args:
+            kind: One of DISTANCE_EVENTS
+            after: The instant as a naive UTC datetime
+
+        Returns:
+            DistanceEvent: The event, or None if the index ends first or
+                does not cover the instant
+        """
+        instant = float(ephem.Date(after))
+        if instant < self.start:
+            return None
+
+        dates = self._dates[kind]
+        index = bisect.bisect_right(dates, instant)
+        return self.events[kind][index] if index < len(dates) else None
+
+    def events_between(self, start: datetime, end: datetime) -> List[DistanceEvent]:
+        """
+        List the events of every kind in a time range.
+
+        Args:
+            start: Start of the range (inclusive) as a naive UTC datetime
+            end: End of the range (exclusive) as a naive UTC datetime
+
+        Returns:
+            list: Events sorted by instant
+        """
+        first, last = float(ephem.Date(start)), float(ephem.Date(end))
+        found = []
+        for kind in DISTANCE_EVENTS:
+            dates = self._dates[kind]
+            found.extend(self.events[kind][bisect.bisect_left(dates, first):bisect.bisect_left(dates, last)])
+
+        return sorted(found, key=lambda event: event.ephem_date)
+
+def _distance_km(moon: ephem.Moon, instant: float) -> float:
+    """Geocentric distance of the Moon at an ephem date in kilometres."""
+    moon.compute(instant)
+    return moon.earth_distance * KM_PER_AU
+
+def _refine_extremum(moon: ephem.Moon, low: float, high: float, sign: float) -> float:
+    """
+    Golden-section search for the extremum of the distance in a bracket.
+
+    Args:
+        moon: Moon object reused for the computations
+        low: Start of the bracket as an ephem date
+        high: End of the bracket as an ephem date
+        sign: 1 to find a minimum (perigee), -1 for a maximum (apogee)
+
+    Returns:
+        float: ephem date of the extremum
+    """
+    left = high - _INVERSE_GOLDEN * (high - low)
+    right = low + _INVERSE_GOLDEN * (high - low)
+    left_value = sign * _distance_km(moon, left)
+    right_value = sign * _distance_km(moon, right)
+
+    while high - low > REFINE_TOLERANCE_DAYS:
+        if left_value < right_value:
+            high, right, right_value = right, left, left_value
+            left = high - _INVERSE_GOLDEN * (high - low)
+            left_value = sign * _distance_km(moon, left)
+        else:
+            low, left, left_value = left, right, right_value
+            right = low + _INVERSE_GOLDEN * (high - low)
+            right_value = sign * _distance_km(moon, right)
+
+    return (low + high) / 2
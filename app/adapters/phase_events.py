@@ -0,0 +1,88 @@
+import math
+from datetime import datetime, timedelta
+from typing import Iterator, Tuple
+
+import ephem
+
+# Phase names by elongation quadrant: the Moon's elongation from the Sun is
+# 0, 90, 180 and 270 degrees at new moon, first quarter, full moon and last quarter
+PHASE_EVENT_NAMES = ("New Moon", "First Quarter", "Full Moon", "Last Quarter")
+
+# Mean rate at which the Moon's elongation grows, in degrees per day (360 / 29.53)
+MEAN_ELONGATION_RATE = 360.0 / 29.530589
+
+# Refinement stops once a correction is below this (in days, about 1 second)
+REFINE_TOLERANCE_DAYS = 1.0 / 86400.0
+
+def iter_phase_events(start: datetime, end: datetime) -> Iterator[Tuple[datetime, str]]:
+    """
+    Lazily generate the major phases between two instants, in order.
+
+    Each event is found from the previous one: the next quarter of
+    elongation is predicted from the mean rate and refined with a few secant
+    steps on the same Sun and Moon objects, instead of a fresh ephem.next_*
+    search per phase. Events are produced only as they are consumed.
+
+    Args:
+        start: Start of the range (inclusive) as a naive UTC datetime
+        end: End of the range (exclusive) as a naive UTC datetime
+
+    Yields:
+        tuple: (instant as a naive UTC datetime rounded to the second, phase name)
+    """
+    moon, sun = ephem.Moon(), ephem.Sun()
+    instant, last = float(ephem.Date(start)), float(ephem.Date(end))
+
+    elongation = _elongation(moon, sun, instant)
+    quadrant = int(elongation // 90.0) + 1
+    while True:
+        target = (quadrant % 4) * 90.0
+        guess = instant + ((target - elongation) % 360.0) / MEAN_ELONGATION_RATE
+        instant = _refine_crossing(moon, sun, guess, target)
+        if instant >= last:
+            return
+        yield _round_to_second(ephem.Date(instant).datetime()), PHASE_EVENT_NAMES[quadrant % 4]
+        elongation = target
+        quadrant += 1
+
+def _elongation(moon: ephem.Moon, sun: ephem.Sun, instant: float) -> float:
+    """Moon's apparent geocentric ecliptic longitude minus the Sun's, in degrees (0-360), as ephem.next_* uses."""
+    moon.compute(instant)
+    sun.compute(instant)
+    moon_longitude = ephem.Ecliptic(ephem.Equatorial(moon.g_ra, moon.g_dec, epoch=instant), epoch=instant).lon
+    sun_longitude = ephem.Ecliptic(ephem.Equatorial(sun.g_ra, sun.g_dec, epoch=instant), epoch=instant).lon
+    return math.degrees(moon_longitude - sun_longitude) % 360.0
+
+def _refine_crossing(moon: ephem.Moon, sun: ephem.Sun, guess: float, target: float) -> float:
+    """
+    Find when the elongation reaches a target angle near an estimate.
+
+    Args:
+        moon: Moon object reused for the computations
+        sun: Sun object reused for the computations
+        guess: Estimated ephem date of the crossing
+        target: Elongation in degrees to reach
+
+    Returns:
+        float: ephem date of the crossing
+    """
+    def offset(instant: float) -> float:
+        # Signed angle from the target, in [-180, 180)
+        return (_elongation(moon, sun, instant) - target + 180.0) % 360.0 - 180.0
+
+    previous, current = guess, guess + 1.0 / 24.0
+    previous_offset, current_offset = offset(previous), offset(current)
+    for _ in range(20):
+        if current_offset == previous_offset:
+            break
+        following = current - current_offset * (current - previous) / (current_offset - previous_offset)
+        previous, previous_offset = current, current_offset
+        current, current_offset = following, offset(following)
+        if abs(current - previous) < REFINE_TOLERANCE_DAYS:
+            break
+
+    return current
+
+def _round_to_second(moment: datetime) -> datetime:
+    """Round a datetime to the nearest second."""
+    return (moment + timedelta(microseconds=500000)).replace(microsecond=0)
@@ -0,0 +1,150 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.ephemeris_table import EphemerisTable
+
+# A single batch item: (date, "HH:MM:SS", optional observer location)
+MoonDataRequest = Tuple[date, str, Optional[Dict[str, float]]]
+
+# Adapter kept alive in each worker process so ephem state stays warm between chunks
+_worker_adapter: Optional[AstronomyAdapter] = None
+
+def _init_worker(table_path: Optional[str] = None):
+    """
+    Create the per-process adapter once when a worker starts.
+
+    Args:
+        table_path: Optional ephemeris table to map read-only in the worker
+    """
+    global _worker_adapter
+    _worker_adapter = AstronomyAdapter(table=EphemerisTable(table_path) if table_path else None)
+
+def _compute_chunk(chunk: List[MoonDataRequest]) -> List[Dict[str, Any]]:
+    """
+    Compute moon data for every request in a chunk inside a worker process.
+
+    Args:
+        chunk: List of (date, time, location) requests
+
+    Returns:
+        list: Moon data dictionaries in the same order as the chunk
+    """
+    adapter = _worker_adapter or AstronomyAdapter()
+    return [adapter.get_moon_data(date_obj, time_str, location)
+            for date_obj, time_str, location in chunk]
+
+class ProcessPoolAstronomyAdapter(AstronomyAdapter):
+    """
+    Astronomy adapter that fans batches of calculations out to worker processes.
+
+    Single calls behave exactly like AstronomyAdapter and run in-process.
+    Batches are split into chunks that are computed by a pool of worker
+    processes, each holding its own warm adapter, and results are streamed
+    back in request order.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = 64,
+                 max_pending_chunks: Optional[int] = None, table_path: Optional[str] = None):
+        """
+        Initialize the adapter without starting any worker processes.
+
+        Args:
+            max_workers: Number of worker processes (defaults to the CPU count)
+            chunk_size: Number of requests sent to a worker at a time
+            max_pending_chunks: Upper bound on chunks in flight, which bounds the
+                memory held by results that have not been consumed yet
+                (defaults to twice the number of workers)
+            table_path: Optional ephemeris table built by build_ephemeris_table;
+                the parent and every worker map the same file instead of each
+                holding a private copy
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        super().__init__(table=EphemerisTable(table_path) if table_path else None)
+        self.table_path = table_path
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks or 2 * self.max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def get_moon_data_batch(self, requests: Iterable[MoonDataRequest]) -> Iterator[Dict[str, Any]]:
+        """
+        Compute moon data for many (date, time, location) requests.
+
+        Requests are consumed lazily, so the input may be a generator of any
+        length. Results are yielded in the same order as the requests.
+
+        Args:
+            requests: Iterable of (date, time, location) tuples; location may be None
+
+        Yields:
+            dict: Moon data for each request, in order
+        """
+        executor = self._get_executor()
+        chunks = self._iter_chunks(requests)
+        pending = deque()
+
+        try:
+            # Prime the pipeline, then keep it full as results are consumed
+            for chunk in chunks:
+                pending.append(executor.submit(_compute_chunk, chunk))
+                if len(pending) >= self.max_pending_chunks:
+                    break
+
+            while pending:
+                results = pending.popleft().result()
+                next_chunk = next(chunks, None)
+                if next_chunk is not None:
+                    pending.append(executor.submit(_compute_chunk, next_chunk))
+                yield from results
+        finally:
+            # The consumer stopped early or a worker failed: drop queued work
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """
+        Stop the worker processes.
+
+        Args:
+            wait: Whether to block until running chunks have finished
+            cancel_pending: Whether to cancel chunks that have not started yet
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Finish in-flight work on a clean exit, abandon it on errors
+        self.shutdown(wait=True, cancel_pending=exc_type is not None)
+        return False
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker pool on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.table_path,)
+            )
+        return self._executor
+
+    def _iter_chunks(self, requests: Iterable[MoonDataRequest]) -> Iterator[List[MoonDataRequest]]:
+        """Group requests into lists of at most chunk_size items."""
+        chunk = []
+        for request in requests:
+            chunk.append(request)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
@@ -0,0 +1,240 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import ephem
+import numpy as np
+
+from app.utils.cache_utils import LRUCache
+
+# Atmospheric refraction at the horizon, in radians; 37 arcminutes matches
+# ephem's rise and set times for its default 1010 mbar and 15 °C
+HORIZON_REFRACTION = math.radians(37.0 / 60.0)
+
+# ephem dates count days from this instant (Dublin Julian Day 0)
+EPHEM_EPOCH = datetime(1899, 12, 31, 12, 0, 0)
+
+class MoonTrack:
+    """
+    Geocentric Moon positions sampled across one UTC day.
+
+    Everything that does not depend on the observer is computed here once,
+    so any number of sites can derive their events from the same samples.
+    """
+
+    def __init__(self, date_obj: date, step_minutes: int = 10):
+        """
+        Sample the Moon from 00:00 UTC on the date to 00:00 UTC the next day.
+
+        Args:
+            date_obj: The UTC day to sample
+            step_minutes: Minutes between samples
+        """
+        start = float(ephem.Date(date_obj.strftime('%Y/%m/%d')))
+        count = 24 * 60 // step_minutes + 1
+        self.date = date_obj
+        self.times = start + np.arange(count) * (step_minutes / 1440.0)
+
+        # A Greenwich observer gives the apparent sidereal time at longitude 0
+        greenwich = ephem.Observer()
+        moon = ephem.Moon()
+        ra, dec, sidereal, horizon = [], [], [], []
+
+        for instant in self.times:
+            moon.compute(ephem.Date(instant))
+            greenwich.date = ephem.Date(instant)
+            ra.append(float(moon.ra))
+            dec.append(float(moon.dec))
+            sidereal.append(float(greenwich.sidereal_time()))
+
+            # Geocentric altitude of the centre when the upper limb touches the
+            # horizon: lifted by parallax, lowered by the Moon's radius and refraction
+            parallax = math.asin(ephem.earth_radius / (moon.earth_distance * ephem.meters_per_au))
+            horizon.append(parallax - float(moon.radius) - HORIZON_REFRACTION)
+
+        self.ra = np.array(ra)
+        self.dec = np.array(dec)
+        self.sidereal_time = np.array(sidereal)
+        self.sin_horizon = np.sin(np.array(horizon))
+
+def compute_events(track: MoonTrack, latitudes: np.ndarray,
+                   longitudes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Find moonrise, moonset and transit for many sites at once.
+
+    Altitudes are evaluated for every site and sample as one array, and
+    each event is interpolated between the two samples around it. Observer
+    elevation is ignored, like ephem's own rise and set calculations.
+
+    Args:
+        track: Moon samples for the day
+        latitudes: Site latitudes in degrees
+        longitudes: Site longitudes in degrees (east positive)
+
+    Returns:
+        dict: 'moonrise', 'moonset' and 'transit' arrays of ephem dates,
+            NaN where the event does not happen during the day
+    """
+    latitudes = np.radians(np.asarray(latitudes, dtype=float))[:, None]
+    longitudes = np.radians(np.asarray(longitudes, dtype=float))[:, None]
+
+    # Local hour angle wrapped to [-pi, pi)
+    hour_angle = (track.sidereal_time + longitudes - track.ra + math.pi) % (2 * math.pi) - math.pi
+
+    sin_altitude = (np.sin(latitudes) * np.sin(track.dec)
+                    + np.cos(latitudes) * np.cos(track.dec) * np.cos(hour_angle))
+    height = sin_altitude - track.sin_horizon
+
+    # The hour angle passes zero at transit; exclude its wrap from +pi to -pi
+    transit = (hour_angle[:, :-1] < 0) & (hour_angle[:, 1:] >= 0) & (
+        hour_angle[:, 1:] - hour_angle[:, :-1] < math.pi)
+
+    return {
+        'moonrise': _interpolate_crossing(track.times, height, (height[:, :-1] < 0) & (height[:, 1:] >= 0)),
+        'moonset': _interpolate_crossing(track.times, height, (height[:, :-1] >= 0) & (height[:, 1:] < 0)),
+        'transit': _interpolate_crossing(track.times, hour_angle, transit),
+    }
+
+def ephem_days_to_datetime(value: float) -> Optional[datetime]:
+    """
+    Convert an ephem date number to a naive UTC datetime.
+
+    Args:
+        value: Days since the ephem epoch, or NaN
+
+    Returns:
+        datetime: The UTC instant rounded to the second, or None for NaN
+    """
+    if math.isnan(value):
+        return None
+    return EPHEM_EPOCH + timedelta(seconds=round(value * 86400.0))
+
+def _interpolate_crossing(times: np.ndarray, values: np.ndarray, crossings: np.ndarray) -> np.ndarray:
+    """Linearly interpolate the first zero crossing per row, NaN where there is none."""
+    found = crossings.any(axis=1)
+    index = crossings.argmax(axis=1)
+    rows = np.arange(values.shape[0])
+
+    before = values[rows, index]
+    after = values[rows, index + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where(after != before, before / (before - after), 0.0)
+
+    step = times[1] - times[0]
+    return np.where(found, times[index] + fraction * step, np.nan)
+
+def _compute_event_chunk(track: MoonTrack, latitudes: np.ndarray,
+                         longitudes: np.ndarray) -> Dict[str, np.ndarray]:
+    """Worker entry point: compute events for one chunk of sites."""
+    return compute_events(track, latitudes, longitudes)
+
+class RiseSetAdapter:
+    """
+    Adapter computing moonrise, moonset and transit for many locations.
+
+    The Moon's geocentric track is computed once per UTC day and cached, so
+    the cost per site is a few vectorized array operations instead of an
+    ephem.Observer and its iterative rise/set searches. Very large site lists
+    can optionally be split across worker processes.
+    """
+
+    def __init__(self, step_minutes: int = 10, cache_days: int = 32,
+                 max_workers: Optional[int] = None, parallel_threshold: Optional[int] = None,
+                 chunk_size: int = 5000):
+        """
+        Initialize the adapter without starting any worker processes.
+
+        Args:
+            step_minutes: Minutes between Moon samples; events are interpolated
+                between samples
+            cache_days: Number of daily tracks kept in memory
+            max_workers: Number of worker processes (defaults to the CPU count)
+            parallel_threshold: Site count from which batches are split across
+                worker processes; None computes everything in-process
+            chunk_size: Number of sites sent to a worker at a time
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.step_minutes = step_minutes
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.chunk_size = chunk_size
+        self._tracks = LRUCache(max_entries=cache_days)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def get_track(self, date_obj: date) -> MoonTrack:
+        """
+        Get the Moon's track for a UTC day, computing it once.
+
+        Args:
+            date_obj: The UTC day
+
+        Returns:
+            MoonTrack: The cached samples for the day
+        """
+        return self._tracks.get_or_create(date_obj, lambda: MoonTrack(date_obj, self.step_minutes))
+
+    def get_rise_set_batch(self, date_obj: date,
+                           locations: Iterable[Dict[str, float]]) -> List[Dict[str, Optional[datetime]]]:
+        """
+        Compute moonrise, moonset and transit during a UTC day for many locations.
+
+        Args:
+            date_obj: The UTC day
+            locations: Dictionaries with 'latitude' and 'longitude' in degrees
+
+        Returns:
+            list: One dictionary per location, in order, with 'moonrise',
+                'moonset' and 'transit' as naive UTC datetimes or None
+        """
+        locations = list(locations)
+        if not locations:
+            return []
+
+        latitudes = np.array([location['latitude'] for location in locations], dtype=float)
+        longitudes = np.array([location['longitude'] for location in locations], dtype=float)
+        events = self._compute(self.get_track(date_obj), latitudes, longitudes)
+
+        names = list(events)
+        columns = [[ephem_days_to_datetime(value) for value in events[name].tolist()] for name in names]
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the worker processes.
+
+        Args:
+            wait: Whether to block until running chunks have finished
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        return False
+
+    def _compute(self, track: MoonTrack, latitudes: np.ndarray,
+                 longitudes: np.ndarray) -> Dict[str, np.ndarray]:
+        """Compute events in-process or across the worker pool depending on size."""
+        if self.parallel_threshold is None or len(latitudes) < self.parallel_threshold:
+            return compute_events(track, latitudes, longitudes)
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        # The track is small, so each chunk carries its own copy
+        futures = [
+            self._executor.submit(_compute_event_chunk, track,
+                                  latitudes[start:start + self.chunk_size],
+                                  longitudes[start:start + self.chunk_size])
+            for start in range(0, len(latitudes), self.chunk_size)
+        ]
+        results = [future.result() for future in futures]
+        return {name: np.concatenate([result[name] for result in results]) for name in results[0]}
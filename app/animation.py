@@ -0,0 +1,353 @@
+import hashlib
+import io
+import struct
+import zlib
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from app.image_provider import RENDERER_VERSION, ImageProvider
+from app.moon_calculator import ENGINE_VERSION, MoonCalculator
+from app.utils.cache_utils import LRUCache
+
+# Mimetype of each supported animation format
+ANIMATION_MIMETYPES = {
+    'gif': 'image/gif',
+    'apng': 'image/apng',
+    'webp': 'image/webp',
+}
+
+# Frame sizes are snapped to these values so the cache stays small
+ANIMATION_SIZES = (64, 128, 256)
+
+# Palette shared by every GIF frame: index 0 is transparent, 1-255 are greys
+GIF_PALETTE = [0, 0, 0] + [value for level in range(255) for value in (level * 255 // 254,) * 3]
+
+class AnimationService:
+    """
+    Service producing animations of the moon's phase over a period of days.
+
+    Frames are rendered lazily, one day at a time, and each frame is encoded
+    as soon as it is rendered, so no more than one raw frame is alive at a
+    time regardless of the number of days. Finished animations are cached
+    by their quantized parameters.
+    """
+
+    def __init__(self, moon_calculator: MoonCalculator, image_provider: ImageProvider,
+                 cache: Optional[LRUCache] = None, frame_duration_ms: int = 100):
+        """
+        Initialize the AnimationService.
+
+        Args:
+            moon_calculator: Calculator providing the daily phase series
+            image_provider: Provider used to render each frame
+            cache: Cache for encoded animations (defaults to a 32 MB LRU)
+            frame_duration_ms: Display time of each frame in milliseconds
+        """
+        self.moon_calculator = moon_calculator
+        self.image_provider = image_provider
+        self.cache = cache if cache is not None else LRUCache(max_entries=64, max_bytes=32 * 1024 * 1024)
+        self.frame_duration_ms = frame_duration_ms
+
+    @staticmethod
+    def quantize_size(size: int) -> int:
+        """
+        Snap a requested frame size to the nearest supported size.
+
+        Args:
+            size: Requested width and height in pixels
+
+        Returns:
+            int: One of ANIMATION_SIZES
+        """
+        return min(ANIMATION_SIZES, key=lambda candidate: abs(candidate - size))
+
+    def cache_key(self, start_date: date, days: int, size: int, image_format: str) -> Tuple:
+        """Build the cache key for quantized animation parameters and the engine and renderer versions."""
+        return (start_date.isoformat(), days, self.quantize_size(size), image_format, self.frame_duration_ms,
+                ENGINE_VERSION, RENDERER_VERSION)
+
+    def etag(self, start_date: date, days: int, size: int, image_format: str) -> str:
+        """
+        Get the ETag of an animation without rendering it.
+
+        Args:
+            start_date: First day of the animation
+            days: Number of frames, one per day
+            size: Requested frame size in pixels
+            image_format: One of ANIMATION_MIMETYPES
+
+        Returns:
+            str: A stable validator for the animation
+        """
+        key = self.cache_key(start_date, days, size, image_format)
+        return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+    def get_animation(self, start_date: date, days: int, size: int,
+                      image_format: str) -> Tuple[Optional[bytes], Iterator[bytes]]:
+        """
+        Get an animation from the cache or as a stream of encoded chunks.
+
+        Args:
+            start_date: First day of the animation
+            days: Number of frames, one per day
+            size: Requested frame size in pixels (snapped to ANIMATION_SIZES)
+            image_format: One of ANIMATION_MIMETYPES
+
+        Returns:
+            tuple: (cached bytes, None) on a hit, or (None, chunk iterator) on a miss;
+                a fully consumed iterator stores the result in the cache
+        """
+        if image_format not in ANIMATION_MIMETYPES:
+            raise ValueError(f"Unsupported animation format: {image_format}")
+        if days < 1:
+            raise ValueError("An animation needs at least one day")
+
+        key = self.cache_key(start_date, days, size, image_format)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, None
+
+        frames = self.iter_frames(start_date, days, self.quantize_size(size))
+        encoder = ENCODERS[image_format]
+        return None, self._cache_when_complete(key, encoder(frames, days, self.frame_duration_ms))
+
+    def iter_frames(self, start_date: date, days: int, size: int) -> Iterator[Image.Image]:
+        """
+        Render one frame per day, lazily.
+
+        Args:
+            start_date: First day of the animation
+            days: Number of days
+            size: Frame width and height in pixels
+
+        Yields:
+            Image: The RGBA frame for each day
+        """
+        for _, illumination, phase_angle in self.moon_calculator.iter_phase_series(start_date, days):
+            yield self.image_provider.render_moon_image(illumination, phase_angle, size)
+
+    def _cache_when_complete(self, key: Tuple, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Pass chunks through and cache the joined result once the stream ends."""
+        collected: Optional[List[bytes]] = []
+        total = 0
+        limit = self.cache.max_bytes
+
+        for chunk in chunks:
+            if collected is not None:
+                collected.append(chunk)
+                total += len(chunk)
+                # Too large to cache: stop holding on to the output
+                if limit is not None and total > limit:
+                    collected = None
+            yield chunk
+
+        if collected is not None:
+            self.cache.set(key, b''.join(collected))
+
+def stream_gif(frames: Iterable[Image.Image], frame_count: int, duration_ms: int) -> Iterator[bytes]:
+    """
+    Encode frames as a looping animated GIF, one frame at a time.
+
+    Every frame is mapped to the same grey palette, so each one can be
+    encoded on its own and appended to the stream.
+
+    Args:
+        frames: RGBA frames of equal size
+        frame_count: Number of frames (unused; GIF does not need it up front)
+        duration_ms: Display time of each frame
+
+    Yields:
+        bytes: Chunks of the GIF file
+    """
+    delay = max(2, round(duration_ms / 10))
+    # Graphic control: restore to background, transparent index 0
+    control = b'!\xf9\x04' + bytes([(2 << 2) | 1]) + struct.pack('<H', delay) + b'\x00\x00'
+    header_sent = False
+
+    for frame in frames:
+        header, image_block = _split_gif(_encode_gif_frame(frame))
+        if not header_sent:
+            loop = b'!\xff\x0bNETSCAPE2.0\x03\x01' + struct.pack('<H', 0) + b'\x00'
+            yield header + loop
+            header_sent = True
+        yield control + image_block
+
+    if header_sent:
+        yield b';'
+
+def stream_apng(frames: Iterable[Image.Image], frame_count: int, duration_ms: int) -> Iterator[bytes]:
+    """
+    Encode frames as a looping animated PNG, one frame at a time.
+
+    Each frame is encoded as a grayscale+alpha PNG and its image data is
+    re-wrapped as APNG frame chunks.
+
+    Args:
+        frames: RGBA frames of equal size
+        frame_count: Number of frames, which APNG records in its header
+        duration_ms: Display time of each frame
+
+    Yields:
+        bytes: Chunks of the APNG file
+    """
+    sequence = 0
+
+    for index, frame in enumerate(frames):
+        buffer = io.BytesIO()
+        frame.convert('LA').save(buffer, format='PNG', compress_level=6)
+        chunks = _split_png(buffer.getvalue())
+
+        if index == 0:
+            ihdr = next(data for chunk_type, data in chunks if chunk_type == b'IHDR')
+            yield (b'\x89PNG\r\n\x1a\n' + _png_chunk(b'IHDR', ihdr)
+                   + _png_chunk(b'acTL', struct.pack('>II', frame_count, 0)))
+
+        # Frame control: full-frame region, cleared to transparent before the next frame
+        control = struct.pack('>IIIIIHHBB', sequence, frame.width, frame.height, 0, 0,
+                              duration_ms, 1000, 1, 0)
+        output = [_png_chunk(b'fcTL', control)]
+        sequence += 1
+
+        for chunk_type, data in chunks:
+            if chunk_type != b'IDAT':
+                continue
+            if index == 0:
+                output.append(_png_chunk(b'IDAT', data))
+            else:
+                output.append(_png_chunk(b'fdAT', struct.pack('>I', sequence) + data))
+                sequence += 1
+        yield b''.join(output)
+
+    yield _png_chunk(b'IEND', b'')
+
+def stream_webp(frames: Iterable[Image.Image], frame_count: int, duration_ms: int) -> Iterator[bytes]:
+    """
+    Encode frames as a looping animated WebP.
+
+    Frames are encoded one at a time as lossless WebP images. The RIFF
+    header must state the total size, so the encoded frames (not the raw
+    ones) are kept until the end and the file is emitted in one piece.
+
+    Args:
+        frames: RGBA frames of equal size
+        frame_count: Number of frames (unused)
+        duration_ms: Display time of each frame
+
+    Yields:
+        bytes: The WebP file
+    """
+    animation_frames = []
+    width = height = 0
+
+    for frame in frames:
+        width, height = frame.size
+        buffer = io.BytesIO()
+        frame.save(buffer, format='WEBP', lossless=True, quality=80, method=4)
+        image_chunks = b''.join(chunk for fourcc, chunk in _split_riff(buffer.getvalue())
+                                if fourcc in (b'ALPH', b'VP8 ', b'VP8L'))
+
+        # Frame at the origin, disposed to background and not blended
+        frame_header = (_uint24(0) + _uint24(0) + _uint24(width - 1) + _uint24(height - 1)
+                        + _uint24(duration_ms) + bytes([0b11]))
+        animation_frames.append(_riff_chunk(b'ANMF', frame_header + image_chunks))
+
+    if not animation_frames:
+        return
+
+    # Extended format header: animation and alpha flags plus the canvas size
+    vp8x = _riff_chunk(b'VP8X', bytes([0x12, 0, 0, 0]) + _uint24(width - 1) + _uint24(height - 1))
+    anim = _riff_chunk(b'ANIM', struct.pack('<IH', 0, 0))
+    body = b'WEBP' + vp8x + anim + b''.join(animation_frames)
+    yield b'RIFF' + struct.pack('<I', len(body)) + body
+
+# Streaming encoder for each format
+ENCODERS = {
+    'gif': stream_gif,
+    'apng': stream_apng,
+    'webp': stream_webp,
+}
+
+def _encode_gif_frame(frame: Image.Image) -> bytes:
+    """Encode one RGBA frame as a single-image GIF using GIF_PALETTE."""
+    pixels = np.asarray(frame.convert('LA'))
+    luminance = pixels[..., 0].astype(np.uint16)
+    indices = np.where(pixels[..., 1] >= 128, 1 + luminance * 254 // 255, 0).astype(np.uint8)
+
+    paletted = Image.frombytes('P', frame.size, indices.tobytes())
+    paletted.putpalette(GIF_PALETTE)
+
+    buffer = io.BytesIO()
+    paletted.save(buffer, format='GIF', optimize=False)
+    return buffer.getvalue()
+
+def _split_gif(data: bytes) -> Tuple[bytes, bytes]:
+    """
+    Split a single-image GIF into its header and image block.
+
+    Returns:
+        tuple: (signature, screen descriptor and global colour table,
+                image descriptor and data without any extensions)
+    """
+    flags = data[10]
+    position = 13 + (3 * 2 ** ((flags & 7) + 1) if flags & 0x80 else 0)
+    header = data[:6] + data[6:10] + bytes([flags, 0]) + data[12:position]
+
+    while position < len(data):
+        introducer = data[position]
+        if introducer == 0x21:  # Extension: skip its sub-blocks
+            position = _skip_sub_blocks(data, position + 2)
+        elif introducer == 0x2C:  # Image descriptor, optional colour table, LZW data
+            start = position
+            local_flags = data[position + 9]
+            position += 10
+            if local_flags & 0x80:
+                position += 3 * 2 ** ((local_flags & 7) + 1)
+            position = _skip_sub_blocks(data, position + 1)
+            return header, data[start:position]
+        else:
+            break
+
+    raise ValueError("GIF frame contains no image")
+
+def _skip_sub_blocks(data: bytes, position: int) -> int:
+    """Return the position after a run of GIF sub-blocks."""
+    while data[position]:
+        position += data[position] + 1
+    return position + 1
+
+def _split_png(data: bytes) -> List[Tuple[bytes, bytes]]:
+    """Split a PNG file into (chunk type, chunk data) pairs."""
+    chunks = []
+    position = 8
+    while position < len(data):
+        length, chunk_type = struct.unpack('>I4s', data[position:position + 8])
+        chunks.append((chunk_type, data[position + 8:position + 8 + length]))
+        position += 12 + length
+    return chunks
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Build a PNG chunk with its length and CRC."""
+    return (struct.pack('>I', len(data)) + chunk_type + data
+            + struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
+
+def _split_riff(data: bytes) -> List[Tuple[bytes, bytes]]:
+    """Split a WebP file into (fourcc, complete chunk including padding) pairs."""
+    chunks = []
+    position = 12
+    while position + 8 <= len(data):
+        fourcc, size = struct.unpack('<4sI', data[position:position + 8])
+        end = position + 8 + size + (size & 1)
+        chunks.append((fourcc, data[position:end]))
+        position = end
+    return chunks
+
+def _riff_chunk(fourcc: bytes, payload: bytes) -> bytes:
+    """Build a RIFF chunk, padded to an even length."""
+    return fourcc + struct.pack('<I', len(payload)) + payload + (b'\x00' if len(payload) & 1 else b'')
+
+def _uint24(value: int) -> bytes:
+    """Encode an unsigned 24-bit little-endian integer."""
+    return struct.pack('<I', value)[:3]
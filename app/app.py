@@ -1,12 +1,176 @@
+import hashlib
+import hmac
 import os
-from flask import Flask, render_template, request, send_from_directory
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from flask import (Flask, Response, current_app, jsonify, make_response, render_template, request,
+                   stream_with_context, url_for)
+from werkzeug.exceptions import BadRequest, Forbidden, HTTPException, NotFound
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Optional
 
 from app.config import load_config
 from app.app_service import AppService
-from app.moon_calculator import MoonCalculator
-from app.image_provider import ImageProvider
+from app.cache_snapshot import init_cache_snapshots
+from app.animation import ANIMATION_MIMETYPES, AnimationService
+from app.compression import init_compression, send_asset, send_archived_image
+from app.moon_calculator import ENGINE_VERSION, MoonCalculator
+from app.image_provider import RENDERER_VERSION, TILE_LEVELS, TILE_SIZE, ImageProvider
+from app.image_archive import ImageArchive
+from app.image_export import ImageExportService
+from app.memory_profiler import MemoryProfiler
+from app.moon_curve import MoonCurveService, render_curve_svg
+from app.load_monitor import LoadMonitor, init_load_monitor
+from app.ephemeris_table import EphemerisTable
+from app.ephemeris_feed import build_ephemeris_feed, feed_version
+from app.phase_calendar import calendar_etag, iter_phase_calendar
 from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.adapters.distance_events import DISTANCE_EVENTS, DistanceEventIndex
+from app.utils.cache_utils import LRUCache
+from app.utils.date_utils import get_current_date, timezone_offset_minutes
+from app.utils.image_utils import quantize_illumination, svg_file_to_data_uri
+
+# Range of dates that can be requested with /?date=
+MIN_QUERY_DATE = date(1900, 1, 1)
+MAX_QUERY_DATE = date(2100, 12, 31)
+
+def render_moon_page(moon_data: dict, live: bool = True,
+                     date_url: Optional[Callable[[date], str]] = None) -> str:
+    """
+    Render the moon phase page for complete moon data.
+    
+    Must be called inside a request context so that URLs can be built.
+    
+    Args:
+        moon_data: Complete moon data as returned by AppService.get_complete_moon_data
+        live: Whether the page updates itself when the date changes; pages
+            for a chosen date stay on that date
+        date_url: Optional function returning the URL of the page for another
+            date, used for the previous and next day links
+        
+    Returns:
+        str: Rendered HTML page
+    """
+    # Work on a copy so callers can keep using their data
+    moon_data = dict(moon_data)
+    
+    # Extract the image path from the complete data
+    image_path = moon_data.pop('visualization_path', '')
+    
+    # Get just the filename from the path
+    image_filename = os.path.basename(image_path)
+    
+    # Inline small SVG images to save the separate image request
+    image_src = None
+    if image_path.endswith('.svg') and current_app.config.get('INLINE_SVG_IMAGES'):
+        image_src = svg_file_to_data_uri(image_path)
+    
+    # How the moon changes during the night, in the configured timezone
+    offset_minutes = timezone_offset_minutes(current_app.config['TIMEZONE'], moon_data['date'])
+    curve = current_app.extensions['moon_curve_service'].get_curve(moon_data['date'], offset_minutes)
+    
+    # Let the browser compute later days itself when it can pick the same images
+    phase_images = current_app.extensions['app_service'].image_provider.client_phase_images()
+    if phase_images is not None:
+        phase_images = {name: url_for('serve_image', filename=filename)
+                        for name, filename in phase_images.items()}
+    
+    return render_template(
+        'index.html',
+        moon_data=moon_data,
+        image_filename=image_filename,
+        image_src=image_src,
+        moon_version=moon_data_version(moon_data['date']),
+        phase_images=phase_images,
+        ephemeris_url=url_for('ephemeris_feed', version=feed_version(), year=moon_data['date'].year),
+        live=live,
+        curve_svg=render_curve_svg(curve),
+        curve_url=url_for('moon_curve_svg', tz=offset_minutes),
+        phase_time=current_app.config['DEFAULT_TIME'],
+        previous_url=date_url(moon_data['date'] - timedelta(days=1)) if date_url else None,
+        next_url=date_url(moon_data['date'] + timedelta(days=1)) if date_url else None
+    )
+
+def moon_data_version(date_obj: date) -> str:
+    """
+    Get the version of the moon data shown for a date.
+    
+    The data only changes with the date or when the engine or renderer
+    changes, so the version can be known without computing anything.
+    
+    Args:
+        date_obj: The date shown
+        
+    Returns:
+        str: Version string, also used as the ETag of /api/moon
+    """
+    return f"{date_obj.isoformat()}.{ENGINE_VERSION}.{RENDERER_VERSION}"
+
+def moon_update_payload(moon_data: dict) -> dict:
+    """
+    Build the /api/moon document the page uses to update itself in place.
+    
+    Must be called inside a request context so that URLs can be built.
+    
+    Args:
+        moon_data: Complete moon data as returned by AppService.get_complete_moon_data
+        
+    Returns:
+        dict: JSON-serializable phase data, image URL and the time of the next update
+    """
+    date_obj = moon_data['date']
+    next_phase_date = moon_data.get('next_phase_date')
+    image_filename = os.path.basename(moon_data.get('visualization_path', ''))
+    
+    # The shown date rolls over at midnight UTC, see get_current_date
+    next_update = datetime.combine(date_obj + timedelta(days=1), time.min)
+    
+    return {
+        'version': moon_data_version(date_obj),
+        'date': date_obj.isoformat(),
+        'phase_name': moon_data['phase_name'],
+        'illumination_percent': moon_data['illumination_percent'],
+        'image_url': url_for('serve_image', filename=image_filename),
+        'next_phase_name': moon_data.get('next_phase_name'),
+        'next_phase_date': next_phase_date.isoformat() if next_phase_date else None,
+        'days_until_next_phase': moon_data.get('days_until_next_phase'),
+        'next_update': next_update.isoformat() + 'Z',
+        'tiles': moon_tiles_descriptor(moon_data['illumination_percent'], moon_data['phase_angle'])
+    }
+
+def moon_tiles_descriptor(illumination_percent: float, phase_angle: float) -> dict:
+    """
+    Describe the deep-zoom tile pyramid of a phase for tile viewers.
+    
+    Must be called inside a request context so that URLs can be built.
+    
+    Args:
+        illumination_percent: Percentage of the moon that is illuminated (0-100)
+        phase_angle: The phase angle in degrees (0-360)
+        
+    Returns:
+        dict: 'url' template with {z}, {x} and {y} placeholders, 'tile_size' and 'levels'
+    """
+    first_tile = url_for('moon_tile', illumination=int(quantize_illumination(illumination_percent)),
+                         direction='waning' if phase_angle > 180.0 else 'waxing', level=0, x=0, y=0)
+    return {
+        'url': first_tile[:-len('0/0/0')] + '{z}/{x}/{y}',
+        'tile_size': TILE_SIZE,
+        'levels': TILE_LEVELS,
+    }
+
+def mark_degraded(response: Response) -> Response:
+    """
+    Mark a response as served in degraded mode under load.
+    
+    Args:
+        response: Response built from degraded moon data
+        
+    Returns:
+        Response: The response with an X-Moon-Degraded header and no caching
+    """
+    response.headers['X-Moon-Degraded'] = '1'
+    response.cache_control.no_store = True
+    return response
 
 def create_app(test_config=None):
     """
@@ -37,50 +201,481 @@ def create_app(test_config=None):
     os.makedirs(images_dir, exist_ok=True)
     
     # Setup dependencies
-    astronomy_adapter = AstronomyAdapter()
-    moon_calculator = MoonCalculator(astronomy_adapter=astronomy_adapter)
-    image_provider = ImageProvider(base_path=images_dir)
+    table_path = app.config['EPHEMERIS_TABLE_PATH']
+    astronomy_adapter = AstronomyAdapter(table=EphemerisTable(table_path) if table_path else None)
+    # Perigees, apogees and supermoons from the start of this year, looked up by bisection
+    index_start = date(get_current_date().year, 1, 1)
+    distance_events = DistanceEventIndex.build(
+        index_start, (date(index_start.year + app.config['DISTANCE_EVENT_YEARS'], 1, 1) - index_start).days
+    )
+    moon_calculator = MoonCalculator(astronomy_adapter=astronomy_adapter, default_time=app.config['DEFAULT_TIME'])
+    archive_path = app.config['IMAGE_ARCHIVE_PATH']
+    image_archive = ImageArchive(archive_path) if archive_path else None
+    image_provider = ImageProvider(
+        base_path=images_dir,
+        image_format=app.config['MOON_IMAGE_FORMAT'],
+        archive=image_archive,
+        encoding_profile=app.config['IMAGE_ENCODING_PROFILE'],
+        apparent_size=app.config['APPARENT_SIZE_IMAGES'],
+        tile_cache_bytes=app.config['TILE_CACHE_BYTES']
+    )
+    profiler = MemoryProfiler()
+    if app.config['MEMORY_PROFILING']:
+        profiler.start()
+    load_monitor = LoadMonitor(
+        max_in_flight=app.config['DEGRADE_MAX_IN_FLIGHT'],
+        p95_budget_ms=app.config['DEGRADE_P95_MS']
+    )
     app_service = AppService(
         moon_calculator=moon_calculator,
-        image_provider=image_provider
+        image_provider=image_provider,
+        cache=LRUCache(max_entries=app.config['MOON_DATA_CACHE_SIZE']),
+        prefetch_executor=ThreadPoolExecutor(
+            max_workers=app.config['PREFETCH_WORKERS'],
+            thread_name_prefix='moon-prefetch'
+        ) if app.config['PREFETCH_DAYS'] > 0 else None,
+        profiler=profiler,
+        load_monitor=load_monitor
+    )
+    page_cache = LRUCache(max_entries=app.config['PAGE_CACHE_SIZE'])
+    feed_cache = LRUCache(max_entries=8)
+    
+    animation_service = AnimationService(
+        moon_calculator=moon_calculator,
+        image_provider=image_provider,
+        cache=LRUCache(max_entries=64, max_bytes=app.config['ANIMATION_CACHE_BYTES']),
+        frame_duration_ms=app.config['ANIMATION_FRAME_MS']
+    )
+    
+    image_export_service = ImageExportService(moon_calculator=moon_calculator, image_provider=image_provider)
+    moon_curve_service = MoonCurveService(
+        astronomy_adapter=astronomy_adapter,
+        cache=LRUCache(max_entries=app.config['CURVE_CACHE_SIZE']),
+        location={'latitude': app.config['OBSERVER_LATITUDE'], 'longitude': app.config['OBSERVER_LONGITUDE']}
     )
     
+    # Expose the service to tooling such as the static site exporter
+    app.extensions['app_service'] = app_service
+    app.extensions['page_cache'] = page_cache
+    app.extensions['memory_profiler'] = profiler
+    app.extensions['moon_curve_service'] = moon_curve_service
+    
+    # Track load first so every later hook counts towards request latency;
+    # only the moon data routes are served degraded, so only they are tracked
+    init_load_monitor(app, load_monitor, endpoints=('index', 'moon_api'))
+    
+    # Compress dynamic responses and serve pre-compressed static assets
+    init_compression(app)
+    
+    # Keep computed data and rendered pages across restarts; a template or
+    # observation setting change invalidates the snapshot just like an engine
+    # or renderer upgrade
+    with open(os.path.join(base_dir, 'templates', 'index.html'), 'rb') as template_file:
+        template_digest = hashlib.sha1(template_file.read()).hexdigest()
+    observation = ":".join(str(app.config[name]) for name in
+                           ('DEFAULT_TIME', 'TIMEZONE', 'OBSERVER_LATITUDE', 'OBSERVER_LONGITUDE'))
+    
+    def snapshot_entry_usable(name: str, key, value) -> bool:
+        # Generated images are not in the snapshot: after a redeploy or with a
+        # fresh images directory, drop entries whose image is gone so it is
+        # rendered again. Pages are kept only along with their date's data.
+        if name == 'pages':
+            value = app_service.cache.get(date.fromisoformat(key.split(':')[0]))
+            if value is None:
+                return False
+        return image_provider.has_image(value.get('visualization_path', ''))
+    
+    init_cache_snapshots(app, {'moon_data': app_service.cache, 'pages': page_cache},
+                         version_extra=f"{template_digest}:{observation}", keep=snapshot_entry_usable)
+    
     # Register routes
     @app.route('/')
     def index():
         """
         Main route that displays the moon phase visualization.
         
+        Query parameters: date (YYYY-MM-DD, default today) to show another night.
+        
         Returns:
             str: Rendered HTML page
         """
-        # Get the complete moon data
-        moon_data = app_service.get_complete_moon_data()
+        today = get_current_date()
+        try:
+            date_obj = date.fromisoformat(request.args.get('date', today.isoformat()))
+        except ValueError:
+            raise BadRequest("Invalid date, expected YYYY-MM-DD")
+        if not MIN_QUERY_DATE <= date_obj <= MAX_QUERY_DATE:
+            raise BadRequest(f"date must be between {MIN_QUERY_DATE} and {MAX_QUERY_DATE}")
         
-        # Extract the image path from the complete data
-        image_path = moon_data.pop('visualization_path', '')
+        # Visitors usually step through adjacent nights; compute them ahead
+        radius = app.config['PREFETCH_DAYS']
+        app_service.prefetch_complete_moon_data(
+            date_obj + timedelta(days=offset)
+            for distance in range(1, radius + 1) for offset in (distance, -distance)
+        )
         
-        # Get just the filename from the path
-        image_filename = os.path.basename(image_path)
+        # Only today's page follows the date; a page for a chosen date stays put
+        live = date_obj == today
         
-        return render_template(
-            'index.html',
-            moon_data=moon_data,
-            image_filename=image_filename
-        )
+        def date_url(other: date) -> str:
+            return url_for('index', date=other.isoformat())
+        
+        # The page only changes with the date, so render it once per day
+        key = f"{date_obj.isoformat()}:{'live' if live else 'fixed'}"
+        page = page_cache.get(key)
+        if page is None:
+            moon_data = app_service.get_complete_moon_data(date_obj)
+            page = render_moon_page(moon_data, live, date_url)
+            
+            # Degraded pages are served but not kept, so full ones follow recovery
+            if moon_data.get('degraded'):
+                return mark_degraded(make_response(page))
+            page_cache.set(key, page)
+        
+        return page
+    
+    @app.route('/api/moon')
+    def moon_api():
+        """
+        Current moon data for pages updating themselves in place.
+        
+        Clients revalidate with If-None-Match; until the date changes the
+        answer is a 304 that computes nothing.
+        
+        Returns:
+            Response: The JSON document from moon_update_payload, or 304
+        """
+        today = get_current_date()
+        etag = moon_data_version(today)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            moon_data = app_service.get_complete_moon_data(today)
+            response = jsonify(moon_update_payload(moon_data))
+            if moon_data.get('degraded'):
+                # No validator: clients must fetch the full data once load drops
+                return mark_degraded(response)
+        
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response
+    
+    def moon_curve_from_request() -> dict:
+        """Get the curve for the date, tz, points and span query parameters, see moon_curve_api."""
+        try:
+            date_obj = date.fromisoformat(request.args.get('date', get_current_date().isoformat()))
+            tz = request.args.get('tz')
+            offset_minutes = int(tz) if tz is not None else timezone_offset_minutes(app.config['TIMEZONE'], date_obj)
+            points = int(request.args.get('points', 48))
+        except ValueError:
+            raise BadRequest("Invalid date, tz or points")
+        if not MIN_QUERY_DATE <= date_obj <= MAX_QUERY_DATE:
+            raise BadRequest(f"date must be between {MIN_QUERY_DATE} and {MAX_QUERY_DATE}")
+        
+        try:
+            return moon_curve_service.get_curve(date_obj, offset_minutes, points, request.args.get('span', 'night'))
+        except ValueError as error:
+            raise BadRequest(str(error))
+    
+    @app.route('/api/moon/curve')
+    def moon_curve_api():
+        """
+        How illumination, phase angle and altitude change across a night or day.
+        
+        Query parameters: date (YYYY-MM-DD, default today), tz (minutes east
+        of UTC, default the TIMEZONE setting), points (2-288, default 48) and
+        span ("night" from 6 PM or "day" from midnight, local time).
+        
+        Returns:
+            Response: JSON curve from MoonCurveService.get_curve
+        """
+        response = jsonify(moon_curve_from_request())
+        response.cache_control.public = True
+        response.cache_control.max_age = 86400
+        return response
+    
+    @app.route('/moon/curve.svg')
+    def moon_curve_svg():
+        """
+        The curve of moon_curve_api as an SVG sparkline.
+        
+        Returns:
+            Response: SVG from render_curve_svg
+        """
+        response = Response(render_curve_svg(moon_curve_from_request()), mimetype='image/svg+xml')
+        response.cache_control.public = True
+        response.cache_control.max_age = 86400
+        return response
+    
+    @app.route('/api/moon/distance-events')
+    def distance_events_api():
+        """
+        The next perigee, apogee, supermoon and micromoon after a date.
+        
+        Query parameters: date (YYYY-MM-DD, default today); events are looked
+        up from midnight UTC of that date.
+        
+        Returns:
+            Response: JSON with the next event of each kind, or null where the
+                index (DISTANCE_EVENT_YEARS from January 1) has none
+        """
+        try:
+            date_obj = date.fromisoformat(request.args.get('date', get_current_date().isoformat()))
+        except ValueError:
+            raise BadRequest("Invalid date, expected YYYY-MM-DD")
+        if not MIN_QUERY_DATE <= date_obj <= MAX_QUERY_DATE:
+            raise BadRequest(f"date must be between {MIN_QUERY_DATE} and {MAX_QUERY_DATE}")
+        
+        after = datetime.combine(date_obj, time.min)
+        next_events = {kind: distance_events.next_event(kind, after) for kind in DISTANCE_EVENTS}
+        response = jsonify({
+            'date': date_obj.isoformat(),
+            'next': {kind: event.to_dict() if event else None for kind, event in next_events.items()}
+        })
+        response.cache_control.public = True
+        response.cache_control.max_age = 86400
+        return response
+    
+    @app.route('/api/ephemeris/<version>/<int:year>.bin')
+    def ephemeris_feed(version, year):
+        """
+        Serve the binary phase-event feed the browser computes phases from.
+        
+        The URL contains the feed version, so responses never change and
+        clients cache them for a year.
+        
+        Args:
+            version: Feed version, see feed_version
+            year: Calendar year the feed covers
+            
+        Returns:
+            Response: The feed from build_ephemeris_feed
+        """
+        if version != feed_version() or not 1900 <= year <= 2100:
+            raise NotFound()
+        
+        response = Response(feed_cache.get_or_create(year, lambda: build_ephemeris_feed(year, astronomy_adapter)),
+                            mimetype='application/octet-stream')
+        response.set_etag(f"{version}-{year}")
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+        return response.make_conditional(request)
+    
+    @app.route('/phases.ics')
+    def phase_calendar():
+        """
+        Stream an iCalendar subscription of the new, first quarter, full and
+        last quarter moons.
+        
+        Query parameters: years (YYYY or YYYY-YYYY, default this year and the
+        next), at most PHASE_CALENDAR_MAX_YEARS years.
+        
+        Calendar clients poll subscriptions often; the ETag depends only on
+        the years, so revalidation is a 304 that computes nothing.
+        
+        Returns:
+            Response: The calendar, streamed event by event, or 304
+        """
+        this_year = get_current_date().year
+        try:
+            first, _, last = request.args.get('years', f"{this_year}-{this_year + 1}").partition('-')
+            first_year = int(first)
+            last_year = int(last) if last else first_year
+        except ValueError:
+            raise BadRequest("Invalid years, expected YYYY or YYYY-YYYY")
+        
+        max_years = app.config['PHASE_CALENDAR_MAX_YEARS']
+        if not MIN_QUERY_DATE.year <= first_year <= last_year <= MAX_QUERY_DATE.year:
+            raise BadRequest(f"years must be between {MIN_QUERY_DATE.year} and {MAX_QUERY_DATE.year}")
+        if last_year - first_year + 1 > max_years:
+            raise BadRequest(f"At most {max_years} years per calendar")
+        
+        etag = calendar_etag(first_year, last_year)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(stream_with_context(iter_phase_calendar(first_year, last_year)),
+                                mimetype='text/calendar')
+            response.headers['Content-Disposition'] = 'inline; filename="phases.ics"'
+        
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = 86400
+        return response
+    
+    @app.route('/animation')
+    def animation():
+        """
+        Stream an animation of the moon's phase, one frame per day.
+        
+        Query parameters: start (YYYY-MM-DD, default today), days (default 30),
+        size (snapped to 64, 128 or 256, default 128) and format (gif, apng or webp).
+        
+        Returns:
+            Response: The animation, streamed on a cache miss
+        """
+        try:
+            start_date = date.fromisoformat(request.args.get('start', get_current_date().isoformat()))
+            days = int(request.args.get('days', 30))
+            size = int(request.args.get('size', 128))
+        except ValueError:
+            raise BadRequest("Invalid start, days or size")
+        
+        image_format = request.args.get('format', 'gif')
+        if image_format not in ANIMATION_MIMETYPES:
+            raise BadRequest(f"Unsupported animation format: {image_format}")
+        if not 1 <= days <= app.config['ANIMATION_MAX_DAYS']:
+            raise BadRequest(f"days must be between 1 and {app.config['ANIMATION_MAX_DAYS']}")
+        # Frames are computed while streaming, so every day must be in range up front
+        if not MIN_QUERY_DATE <= start_date <= MAX_QUERY_DATE - timedelta(days=days - 1):
+            raise BadRequest(f"Animated days must be between {MIN_QUERY_DATE} and {MAX_QUERY_DATE}")
+        
+        # The ETag depends only on the parameters, so revalidation renders nothing
+        etag = animation_service.etag(start_date, days, size, image_format)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
+        cached, chunks = animation_service.get_animation(start_date, days, size, image_format)
+        body = [cached] if cached is not None else stream_with_context(chunks)
+        
+        response = Response(body, mimetype=ANIMATION_MIMETYPES[image_format])
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = 86400
+        return response
+    
+    @app.route('/export/images', methods=['POST'])
+    def export_images():
+        """
+        Stream a ZIP of the moon images for a list of dates.
+        
+        JSON body: dates (list of YYYY-MM-DD) or start (YYYY-MM-DD) and days,
+        sizes (pixels, default [400]) and formats (png, webp or svg, default
+        ["png"]); at most EXPORT_MAX_DATES dates.
+        
+        Returns:
+            Response: The archive from ImageExportService.iter_zip, streamed
+        """
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            raise BadRequest("Expected a JSON object")
+        
+        max_dates = app.config['EXPORT_MAX_DATES']
+        try:
+            # Check the number of dates before building any of them
+            count = len(body['dates']) if 'dates' in body else int(body.get('days', 1))
+            if not 1 <= count <= max_dates:
+                raise BadRequest(f"Between 1 and {max_dates} dates per export")
+            if 'dates' in body:
+                dates = [date.fromisoformat(value) for value in body['dates']]
+            else:
+                start_date = date.fromisoformat(body['start'])
+                start_date + timedelta(days=count - 1)  # Raises OverflowError past date.max
+                dates = [start_date + timedelta(days=offset) for offset in range(count)]
+            sizes = [int(size) for size in body.get('sizes', [400])]
+            formats = [str(image_format) for image_format in body.get('formats', ['png'])]
+        except (KeyError, TypeError, ValueError, OverflowError):
+            raise BadRequest("Expected dates or start and days, sizes and formats")
+        
+        if not all(MIN_QUERY_DATE <= date_obj <= MAX_QUERY_DATE for date_obj in dates):
+            raise BadRequest(f"Dates must be between {MIN_QUERY_DATE} and {MAX_QUERY_DATE}")
+        if not sizes or not formats or len(set(sizes)) > 4:
+            raise BadRequest("Between 1 and 4 sizes and at least one format")
+        
+        chunks = image_export_service.iter_zip(dates, list(dict.fromkeys(sizes)), list(dict.fromkeys(formats)))
+        try:
+            # Arguments are validated when the first chunk is produced
+            first_chunk = next(chunks)
+        except ValueError as error:
+            raise BadRequest(str(error))
+        
+        def archive():
+            yield first_chunk
+            yield from chunks
+        
+        response = Response(stream_with_context(archive()), mimetype='application/zip')
+        response.headers['Content-Disposition'] = 'attachment; filename="moon-images.zip"'
+        response.cache_control.no_store = True
+        return response
+    
+    @app.route('/admin/memory')
+    def memory_report():
+        """
+        Dump the memory profile of the moon data stages.
+        
+        Requires the ADMIN_TOKEN as a bearer token; without a configured
+        token the endpoint does not exist. Query parameter: limit (number of
+        allocation sites, default 10).
+        
+        Returns:
+            Response: JSON report from MemoryProfiler.report
+        """
+        token = app.config['ADMIN_TOKEN']
+        if not token:
+            raise NotFound()
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+            raise Forbidden()
+        
+        try:
+            limit = int(request.args.get('limit', 10))
+        except ValueError:
+            raise BadRequest("Invalid limit")
+        
+        response = jsonify(profiler.report(limit))
+        response.cache_control.no_store = True
+        return response
     
     @app.route('/images/<path:filename>')
     def serve_image(filename):
         """
         Serve moon images from the images directory.
         
+        Images in the packed archive are served from memory; loose files go
+        through send_asset, which handles pre-compressed siblings and sendfile.
+        
         Args:
             filename: The name of the image file to serve
             
         Returns:
             Response: The image file
         """
-        return send_from_directory(images_dir, filename)
+        archived = image_provider.get_archived_image(filename)
+        if archived is not None:
+            return send_archived_image(filename, *archived)
+        
+        return send_asset(images_dir, filename)
+    
+    @app.route('/tiles/<int:illumination>/<direction>/<int:level>/<int:x>/<int:y>')
+    def moon_tile(illumination, direction, level, x, y):
+        """
+        Serve one tile of the deep-zoom moon pyramid, rendering it on first use.
+        
+        Args:
+            illumination: Illuminated percentage, 0-100
+            direction: "waxing" or "waning"
+            level: Pyramid level, see moon_tiles_descriptor
+            x: Tile column
+            y: Tile row
+            
+        Returns:
+            Response: The tile image
+        """
+        if illumination > 100 or direction not in ('waxing', 'waning'):
+            raise NotFound()
+        
+        try:
+            path = image_provider.get_moon_tile(illumination, 270.0 if direction == 'waning' else 90.0, level, x, y)
+        except ValueError:
+            raise NotFound()
+        
+        response = send_asset(images_dir, os.path.relpath(path, images_dir))
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = 86400
+        return response
     
     @app.errorhandler(Exception)
     def handle_error(error):
@@ -93,6 +688,10 @@ def create_app(test_config=None):
         Returns:
             tuple: (error page, status code)
         """
+        # HTTP errors such as 404 for a missing image keep their own status
+        if isinstance(error, HTTPException):
+            return error
+        
         app.logger.error(f"An error occurred: {str(error)}")
         return render_template('error.html', error=str(error)), 500
     
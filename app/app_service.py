@@ -1,11 +1,20 @@
-from datetime import date
-from typing import Optional, Dict, Any
+import logging
+import threading
+from concurrent.futures import Executor, Future
+from contextlib import nullcontext
+from datetime import date, timedelta
+from typing import Optional, Dict, Any, Iterable, Tuple
 
 from app.domain.moon_model import MoonPhaseData
 from app.moon_calculator import MoonCalculator
 from app.image_provider import ImageProvider
+from app.load_monitor import LoadMonitor
+from app.memory_profiler import MemoryProfiler
+from app.utils.cache_utils import LRUCache
 from app.utils.date_utils import get_current_date
 
+logger = logging.getLogger(__name__)
+
 class AppService:
     """
     Application service that orchestrates the workflow of the application.
@@ -14,16 +23,31 @@ class AppService:
     the core application use cases.
     """
     
-    def __init__(self, moon_calculator: MoonCalculator, image_provider: ImageProvider):
+    def __init__(self, moon_calculator: MoonCalculator, image_provider: ImageProvider,
+                 cache: Optional[LRUCache] = None, prefetch_executor: Optional[Executor] = None,
+                 profiler: Optional[MemoryProfiler] = None, load_monitor: Optional[LoadMonitor] = None):
         """
         Initialize the AppService with required dependencies.
         
         Args:
             moon_calculator: The calculator for moon phase data
             image_provider: The provider for moon visualizations
+            cache: Optional cache of complete moon data by date
+            prefetch_executor: Optional executor computing prefetched dates in
+                the background; prefetching also needs a cache
+            profiler: Optional memory profiler attributing allocations to the
+                calculate, visualize and serialize stages
+            load_monitor: Optional monitor; while it reports overload, uncached
+                dates are served in degraded mode (see get_complete_moon_data)
         """
         self.moon_calculator = moon_calculator
         self.image_provider = image_provider
+        self.cache = cache
+        self.prefetch_executor = prefetch_executor
+        self.profiler = profiler
+        self.load_monitor = load_monitor
+        self._prefetching: Dict[date, Future] = {}
+        self._prefetch_lock = threading.Lock()
     
     def get_moon_phase_data(self, date_obj: Optional[date] = None) -> MoonPhaseData:
         """
@@ -58,20 +82,145 @@ class AppService:
         """
         Get complete moon data including phase information and visualization.
         
+        While the load monitor reports overload, a date that is not cached is
+        served in degraded mode instead: the static image of its phase name
+        is used, the next phase comes from a cached neighbouring date (or is
+        left out) rather than from a search, and the result has 'degraded'
+        set to True and is not cached.
+        
         Args:
             date_obj: The date for which to get moon data (optional)
             
         Returns:
             dict: Dictionary containing moon phase data and visualization path
         """
+        if date_obj is None:
+            date_obj = get_current_date()
+        
+        if self.cache is None:
+            if self.overloaded():
+                return self._compute_degraded_moon_data(date_obj)
+            return self._compute_complete_moon_data(date_obj)
+        
+        if self.overloaded():
+            cached = self.cache.get(date_obj)
+            return dict(cached) if cached is not None else self._compute_degraded_moon_data(date_obj)
+        
+        # Wait for a prefetch of the date instead of computing it a second time
+        with self._prefetch_lock:
+            pending = self._prefetching.get(date_obj)
+        if pending is not None:
+            pending.result()
+        
+        # Hand out copies so callers cannot change the cached data
+        return dict(self.cache.get_or_create(date_obj, lambda: self._compute_complete_moon_data(date_obj)))
+    
+    def prefetch_complete_moon_data(self, dates: Iterable[date]) -> int:
+        """
+        Compute complete moon data for dates in the background.
+        
+        Dates already cached or being prefetched are skipped, so a later
+        request for one of the dates is a cache hit.
+        
+        Args:
+            dates: Dates likely to be requested soon
+            
+        Returns:
+            int: Number of dates submitted
+        """
+        # Speculative work only makes an overload worse
+        if self.cache is None or self.prefetch_executor is None or self.overloaded():
+            return 0
+        
+        submitted = 0
+        with self._prefetch_lock:
+            for date_obj in dates:
+                if date_obj in self._prefetching or date_obj in self.cache:
+                    continue
+                self._prefetching[date_obj] = self.prefetch_executor.submit(self._prefetch, date_obj)
+                submitted += 1
+        
+        return submitted
+    
+    def overloaded(self) -> bool:
+        """
+        Whether requests should currently be served in degraded mode.
+        
+        Returns:
+            bool: True if a load monitor reports overload
+        """
+        return self.load_monitor is not None and self.load_monitor.overloaded()
+    
+    def _prefetch(self, date_obj: date):
+        """Compute and cache the data for a prefetched date; errors are only logged."""
+        try:
+            self.cache.get_or_create(date_obj, lambda: self._compute_complete_moon_data(date_obj))
+        except Exception as error:
+            logger.warning("Could not prefetch moon data for %s: %s", date_obj, error)
+        finally:
+            with self._prefetch_lock:
+                self._prefetching.pop(date_obj, None)
+    
+    def _compute_complete_moon_data(self, date_obj: Optional[date]) -> Dict[str, Any]:
+        """Calculate and visualize the moon data for a date without caching."""
         # Get the moon phase data
-        moon_data = self.get_moon_phase_data(date_obj)
+        with self._stage('calculate'):
+            moon_data = self.get_moon_phase_data(date_obj)
         
         # Get the visualization
-        visualization_path = self.get_moon_visualization(moon_data)
+        with self._stage('visualize'):
+            visualization_path = self.get_moon_visualization(moon_data)
         
         # Convert moon data to dictionary and add visualization path
+        with self._stage('serialize'):
+            result = moon_data.to_dict()
+            result['visualization_path'] = visualization_path
+        
+        return result
+    
+    def _compute_degraded_moon_data(self, date_obj: date) -> Dict[str, Any]:
+        """Cheaply approximate the complete moon data for a date, see get_complete_moon_data."""
+        # Only the moon's position; the next-phase searches are skipped
+        _, illumination_percent, phase_angle = next(self.moon_calculator.iter_phase_series(date_obj, 1))
+        phase_name = self.moon_calculator.get_phase_name(illumination_percent, phase_angle > 180.0)
+        next_phase_date, next_phase_name = self._cached_next_phase(date_obj)
+        
+        moon_data = MoonPhaseData(
+            date=date_obj,
+            illumination_percent=illumination_percent,
+            phase_name=phase_name,
+            phase_angle=phase_angle,
+            next_phase_date=next_phase_date,
+            next_phase_name=next_phase_name
+        )
+        
         result = moon_data.to_dict()
-        result['visualization_path'] = visualization_path
+        result['visualization_path'] = self.image_provider.get_static_moon_image(phase_name)
+        result['degraded'] = True
+        return result
+    
+    def _cached_next_phase(self, date_obj: date, max_days_back: int = 7) -> Tuple[Optional[date], Optional[str]]:
+        """
+        Find the next phase of a date from the cached data of a preceding date.
         
-        return result
\ No newline at end of file
+        Args:
+            date_obj: The date whose next phase is wanted
+            max_days_back: How many preceding dates to look at
+            
+        Returns:
+            tuple: (next_phase_date, next_phase_name), or (None, None) if no
+                cached date before it still has that phase ahead
+        """
+        if self.cache is None:
+            return None, None
+        
+        for days_back in range(1, max_days_back + 1):
+            cached = self.cache.get(date_obj - timedelta(days=days_back))
+            if cached and cached.get('next_phase_date') and cached['next_phase_date'] > date_obj:
+                return cached['next_phase_date'], cached['next_phase_name']
+        
+        return None, None
+    
+    def _stage(self, name: str):
+        """Context manager attributing memory to a stage when profiling."""
+        return self.profiler.stage(name) if self.profiler is not None else nullcontext()
\ No newline at end of file
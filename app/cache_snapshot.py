@@ -0,0 +1,231 @@
+import atexit
+import hashlib
+import hmac
+import json
+import logging
+import threading
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+import ephem
+from flask import Flask
+
+from app.image_provider import RENDERER_VERSION
+from app.moon_calculator import ENGINE_VERSION
+from app.utils.cache_utils import LRUCache
+from app.utils.file_utils import atomic_write_bytes
+
+# Snapshot layout: magic (8 bytes), HMAC-SHA256 of the payload (32 bytes),
+# then the payload as UTF-8 JSON with the version string and cache entries
+SNAPSHOT_MAGIC = b'MOONSNP1'
+SNAPSHOT_FORMAT = 1
+
+logger = logging.getLogger(__name__)
+
+def snapshot_version(extra: str = '') -> str:
+    """
+    Build the version string a snapshot must match to be loaded.
+
+    It covers the snapshot format, the calculation engine (including the
+    ephem release) and the renderer, so upgrading any of them invalidates
+    older snapshots.
+
+    Args:
+        extra: Additional component, e.g. a digest of the page template
+
+    Returns:
+        str: The version string
+    """
+    return f"{SNAPSHOT_FORMAT}:{ENGINE_VERSION}:{ephem.__version__}:{RENDERER_VERSION}:{extra}"
+
+class CacheSnapshot:
+    """
+    Versioned, authenticated snapshot file of in-memory caches.
+
+    Entries are stored as JSON (dates are tagged so they round-trip), signed
+    with an HMAC so that truncated, corrupted or tampered files are rejected,
+    and written atomically so a crash mid-save leaves the previous snapshot.
+    """
+
+    def __init__(self, path: str, secret_key: str, version: str):
+        """
+        Initialize the snapshot.
+
+        Args:
+            path: Snapshot file path
+            secret_key: Key used to sign and verify the file
+            version: Version string the file must carry, see snapshot_version
+        """
+        self.path = path
+        self.secret_key = secret_key.encode('utf-8')
+        self.version = version
+
+    def save(self, caches: Dict[str, LRUCache]) -> int:
+        """
+        Write the current contents of caches to the snapshot file.
+
+        Args:
+            caches: Caches to save by name; keys and values must be JSON
+                serializable apart from dates
+
+        Returns:
+            int: Number of entries written
+        """
+        entries = {name: [[_encode(key), _encode(value)] for key, value in cache.items()]
+                   for name, cache in caches.items()}
+        payload = json.dumps({'version': self.version, 'caches': entries},
+                             separators=(',', ':')).encode('utf-8')
+
+        atomic_write_bytes(self.path, SNAPSHOT_MAGIC + self._sign(payload) + payload)
+        return sum(len(items) for items in entries.values())
+
+    def restore(self, caches: Dict[str, LRUCache],
+                keep: Optional[Callable[[str, Any, Any], bool]] = None) -> int:
+        """
+        Load a valid snapshot into caches, ignoring missing or stale files.
+
+        Caches not present in the snapshot are left alone, and entries
+        already in a cache are not overwritten. Caches are filled in the
+        order given, so keep can consult the caches restored before.
+
+        Args:
+            caches: Caches to fill by name
+            keep: Optional check called with (cache name, key, value); entries
+                it rejects, e.g. ones referring to files that are gone, are skipped
+
+        Returns:
+            int: Number of entries restored
+        """
+        entries = self.load()
+        if entries is None:
+            return 0
+
+        restored = 0
+        for name, cache in caches.items():
+            for key, value in entries.get(name, []):
+                if key not in cache and (keep is None or keep(name, key, value)):
+                    cache.set(key, value)
+                    restored += 1
+
+        return restored
+
+    def load(self) -> Optional[Dict[str, List[List[Any]]]]:
+        """
+        Read and verify the snapshot file.
+
+        Returns:
+            dict: Cache entries by cache name as [key, value] pairs, or None if
+                the file is missing, fails the integrity check or has another version
+        """
+        try:
+            with open(self.path, 'rb') as snapshot_file:
+                data = snapshot_file.read()
+        except FileNotFoundError:
+            return None
+
+        header_size = len(SNAPSHOT_MAGIC) + hashlib.sha256().digest_size
+        signature, payload = data[len(SNAPSHOT_MAGIC):header_size], data[header_size:]
+        if not data.startswith(SNAPSHOT_MAGIC) or not hmac.compare_digest(signature, self._sign(payload)):
+            logger.warning("Ignoring cache snapshot that failed its integrity check: %s", self.path)
+            return None
+
+        snapshot = json.loads(payload.decode('utf-8'))
+        if snapshot.get('version') != self.version:
+            logger.info("Ignoring cache snapshot from another version: %s", self.path)
+            return None
+
+        return {name: [[_decode(key), _decode(value)] for key, value in items]
+                for name, items in snapshot['caches'].items()}
+
+    def _sign(self, payload: bytes) -> bytes:
+        """Compute the HMAC of a payload."""
+        return hmac.new(self.secret_key, payload, hashlib.sha256).digest()
+
+def init_cache_snapshots(app: Flask, caches: Dict[str, LRUCache], version_extra: str = '',
+                         keep: Optional[Callable[[str, Any, Any], bool]] = None) -> Optional[CacheSnapshot]:
+    """
+    Restore caches from a snapshot on first use and save them periodically and at exit.
+
+    Configuration keys:
+        CACHE_SNAPSHOT_PATH: Snapshot file; empty disables snapshots
+        CACHE_SNAPSHOT_INTERVAL: Seconds between periodic saves; 0 saves only at exit
+        SECRET_KEY: Key used to sign the snapshot
+
+    The snapshot is read when the first request arrives rather than in
+    create_app, so startup stays fast and a bad file never stops the app.
+
+    Args:
+        app: The Flask application
+        caches: Caches to persist by name
+        version_extra: Extra version component, see snapshot_version
+        keep: Optional check for restored entries, see CacheSnapshot.restore
+
+    Returns:
+        CacheSnapshot: The snapshot, or None if snapshots are disabled
+    """
+    path = app.config['CACHE_SNAPSHOT_PATH']
+    if not path:
+        return None
+
+    snapshot = CacheSnapshot(path, app.config['SECRET_KEY'], snapshot_version(version_extra))
+    app.extensions['cache_snapshot'] = snapshot
+    restore_lock = threading.Lock()
+    restored = []
+
+    @app.before_request
+    def restore_snapshot():
+        if restored:
+            return
+        with restore_lock:
+            if not restored:
+                try:
+                    count = snapshot.restore(caches, keep)
+                    app.logger.info(f"Restored {count} cache entries from {path}")
+                except (OSError, ValueError) as error:
+                    app.logger.warning(f"Could not restore cache snapshot: {error}")
+                restored.append(True)
+
+    def save_snapshot():
+        try:
+            snapshot.save(caches)
+        except (OSError, TypeError, ValueError) as error:
+            logger.warning("Could not save cache snapshot: %s", error)
+
+    atexit.register(save_snapshot)
+
+    interval = app.config['CACHE_SNAPSHOT_INTERVAL']
+    if interval > 0:
+        _start_periodic_saves(save_snapshot, interval)
+
+    return snapshot
+
+def _start_periodic_saves(save, interval: float):
+    """Run save every interval seconds on a daemon thread."""
+    stopped = threading.Event()
+
+    def run():
+        while not stopped.wait(interval):
+            save()
+
+    threading.Thread(target=run, name='cache-snapshot', daemon=True).start()
+    atexit.register(stopped.set)
+
+def _encode(value: Any) -> Any:
+    """Tag dates (recursively) so they survive the JSON round trip."""
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+def _decode(value: Any) -> Any:
+    """Reverse _encode."""
+    if isinstance(value, dict):
+        if set(value) == {'__date__'}:
+            return date.fromisoformat(value['__date__'])
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
@@ -0,0 +1,223 @@
+import hashlib
+import mimetypes
+import os
+from typing import Iterable, List, Optional, Tuple
+
+from flask import Flask, Response, current_app, request, send_from_directory
+from werkzeug.security import safe_join
+from werkzeug.exceptions import NotFound
+
+from app.utils.cache_utils import LRUCache
+from app.utils.file_utils import gzip_bytes, write_gzip_sibling
+
+# Mimetypes worth compressing; images such as PNG are already compressed
+COMPRESSIBLE_MIMETYPES = (
+    'text/html', 'text/css', 'text/plain', 'text/calendar',
+    'application/javascript', 'text/javascript', 'application/json', 'image/svg+xml',
+)
+
+# File extensions that get pre-compressed siblings by the build step
+PRECOMPRESS_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg')
+
+def init_compression(app: Flask) -> LRUCache:
+    """
+    Enable gzip compression of dynamic responses and pre-compressed static assets.
+
+    Configuration keys:
+        COMPRESS_MIN_SIZE: Smallest body in bytes worth compressing
+        COMPRESS_LEVEL: zlib level used for dynamic responses
+        COMPRESS_CACHE_SIZE: Number of compressed bodies kept in memory
+        SENDFILE_MODE: '', 'x-sendfile' or 'x-accel-redirect'
+        X_ACCEL_REDIRECT_PREFIX: nginx internal location mapped to the static folder
+
+    Args:
+        app: The Flask application
+
+    Returns:
+        LRUCache: The cache of compressed response bodies
+    """
+    compressed_cache = LRUCache(max_entries=app.config['COMPRESS_CACHE_SIZE'])
+    app.extensions['compressed_cache'] = compressed_cache
+
+    # Let Werkzeug emit X-Sendfile instead of streaming file bodies
+    if app.config['SENDFILE_MODE'] == 'x-sendfile':
+        app.config['USE_X_SENDFILE'] = True
+
+    # Serve static assets through the negotiating sender
+    static_folder = app.static_folder
+    app.view_functions['static'] = lambda filename: send_asset(static_folder, filename)
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        return compress_dynamic_response(response, compressed_cache)
+
+    return compressed_cache
+
+def accepts_gzip() -> bool:
+    """
+    Check whether the current request accepts gzip-encoded responses.
+
+    Returns:
+        bool: True if gzip is an acceptable content coding
+    """
+    return request.accept_encodings['gzip'] > 0
+
+def compress_dynamic_response(response: Response, cache: LRUCache) -> Response:
+    """
+    Gzip a generated response body if the client and content allow it.
+
+    Identical bodies (e.g. the same page for every visitor on a given day)
+    are compressed once and served from the cache afterwards.
+
+    Args:
+        response: The outgoing response
+        cache: Cache of compressed bodies keyed by a digest of the plain body
+
+    Returns:
+        Response: The response, compressed in place when appropriate
+    """
+    response.vary.add('Accept-Encoding')
+
+    # File and streamed responses are left to the static handling
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or not accepts_gzip()):
+        return response
+
+    body = response.get_data()
+    if len(body) < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+
+    level = current_app.config['COMPRESS_LEVEL']
+    key = (hashlib.sha1(body).digest(), level)
+    compressed = cache.get_or_create(key, lambda: gzip_bytes(body, level))
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = 'gzip'
+
+    # A strong validator must differ between encodings of the same resource
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-gzip")
+
+    return response
+
+def send_asset(directory: str, filename: str) -> Response:
+    """
+    Send a file, preferring a fresh pre-compressed ``.gz`` sibling when accepted.
+
+    Depending on SENDFILE_MODE the file body is streamed by Flask, handed to
+    the front server via X-Sendfile, or redirected internally via
+    X-Accel-Redirect so that Python never reads it.
+
+    Args:
+        directory: Directory the file is served from
+        filename: Requested path relative to the directory
+
+    Returns:
+        Response: The file response
+    """
+    path = safe_join(directory, filename)
+    if path is None:
+        raise NotFound()
+
+    send_name, encoding = select_variant(path, filename)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    if current_app.config['SENDFILE_MODE'] == 'x-accel-redirect':
+        if not os.path.isfile(path):
+            raise NotFound()
+        response = _accel_redirect_response(directory, send_name, mimetype)
+    else:
+        response = send_from_directory(directory, send_name, mimetype=mimetype)
+
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+
+    return response
+
+def send_archived_image(filename: str, data: memoryview, etag: str) -> Response:
+    """
+    Send an image held in the memory-mapped image archive.
+    
+    With ARCHIVE_ZERO_COPY_RESPONSES the memoryview slice itself is handed to
+    the WSGI server. Strict PEP 3333 servers (e.g. gunicorn, wsgiref) only
+    accept bytes, so by default the slice is copied once into bytes, which
+    still avoids the open/stat/read of a loose file.
+    
+    Args:
+        filename: Requested image name, used for the mimetype
+        data: Encoded image bytes from the archive
+        etag: The entry's ETag from the archive index
+        
+    Returns:
+        Response: The image response, or 304 if the client's copy is current
+    """
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    body = data if current_app.config['ARCHIVE_ZERO_COPY_RESPONSES'] else bytes(data)
+    
+    response = Response([body], mimetype=mimetype, direct_passthrough=True)
+    response.content_length = len(data)
+    response.set_etag(etag)
+    
+    return response.make_conditional(request)
+
+def select_variant(path: str, filename: str) -> Tuple[str, Optional[str]]:
+    """
+    Choose between a file and its pre-compressed sibling.
+
+    The sibling is used only when the client accepts gzip and the sibling is
+    at least as new as the original, so stale builds are never served.
+
+    Args:
+        path: Absolute path of the requested file
+        filename: Requested path relative to the served directory
+
+    Returns:
+        tuple: (filename to send, content encoding or None)
+    """
+    gzip_path = path + '.gz'
+    if (accepts_gzip() and os.path.isfile(path) and os.path.isfile(gzip_path)
+            and os.path.getmtime(gzip_path) >= os.path.getmtime(path)):
+        return filename + '.gz', 'gzip'
+
+    return filename, None
+
+def precompress_directory(directory: str, extensions: Iterable[str] = PRECOMPRESS_EXTENSIONS,
+                          min_size: int = 0, compress_level: int = 9) -> List[str]:
+    """
+    Write ``.gz`` siblings for the compressible files under a directory.
+
+    Args:
+        directory: Directory to walk
+        extensions: File extensions to compress
+        min_size: Files smaller than this are skipped
+        compress_level: zlib compression level (1-9)
+
+    Returns:
+        list: Paths of the written ``.gz`` files
+    """
+    extensions = tuple(extensions)
+    written = []
+
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            if not filename.endswith(extensions) or os.path.getsize(path) < min_size:
+                continue
+            written.append(write_gzip_sibling(path, compress_level))
+
+    return written
+
+def _accel_redirect_response(directory: str, filename: str, mimetype: str) -> Response:
+    """Build an empty response asking nginx to serve the file itself."""
+    prefix = current_app.config['X_ACCEL_REDIRECT_PREFIX'].rstrip('/')
+    relative_dir = os.path.relpath(directory, current_app.static_folder).replace(os.sep, '/')
+    parts = [prefix] + ([relative_dir] if relative_dir != '.' else []) + [filename]
+
+    response = Response(mimetype=mimetype)
+    response.headers['X-Accel-Redirect'] = '/'.join(parts)
+    return response
@@ -14,12 +14,60 @@ def load_config() -> Dict[str, Any]:
         'DEBUG': os.environ.get('DEBUG', 'True').lower() in ['true', 'yes', '1'],
         
         # Application settings
-        'DEFAULT_TIME': os.environ.get('DEFAULT_TIME', '22:00:00'),  # 10 PM
-        'TIMEZONE': os.environ.get('TIMEZONE', 'UTC'),
+        'DEFAULT_TIME': os.environ.get('DEFAULT_TIME', '22:00:00'),  # 10 PM UTC, the instant each date's phase is computed for
+        'TIMEZONE': os.environ.get('TIMEZONE', 'UTC'),  # timezone of the night curve on the page
+        'OBSERVER_LATITUDE': float(os.environ.get('OBSERVER_LATITUDE', 0.0)),  # degrees, for moon altitudes
+        'OBSERVER_LONGITUDE': float(os.environ.get('OBSERVER_LONGITUDE', 0.0)),  # degrees east
+        
+        # Image settings
+        'MOON_IMAGE_FORMAT': os.environ.get('MOON_IMAGE_FORMAT', 'png'),  # 'png' or 'svg'
+        'INLINE_SVG_IMAGES': os.environ.get('INLINE_SVG_IMAGES', 'False').lower() in ['true', 'yes', '1'],
+        'IMAGE_ENCODING_PROFILE': os.environ.get('IMAGE_ENCODING_PROFILE', 'default'),  # see ENCODING_PROFILES
+        'APPARENT_SIZE_IMAGES': os.environ.get('APPARENT_SIZE_IMAGES', 'False').lower() in ['true', 'yes', '1'],  # draw the moon at its apparent size
+        'IMAGE_ARCHIVE_PATH': os.environ.get('IMAGE_ARCHIVE_PATH', ''),  # packed archive, see build_image_archive.py
+        'ARCHIVE_ZERO_COPY_RESPONSES': os.environ.get('ARCHIVE_ZERO_COPY_RESPONSES', 'False').lower() in ['true', 'yes', '1'],
+        
+        # Astronomy settings
+        'EPHEMERIS_TABLE_PATH': os.environ.get('EPHEMERIS_TABLE_PATH', ''),  # see build_ephemeris_table.py
+        'DISTANCE_EVENT_YEARS': int(os.environ.get('DISTANCE_EVENT_YEARS', 2)),  # years of perigees and apogees indexed from January 1
         
         # Caching settings
         'CACHE_TYPE': os.environ.get('CACHE_TYPE', 'SimpleCache'),
         'CACHE_DEFAULT_TIMEOUT': int(os.environ.get('CACHE_DEFAULT_TIMEOUT', 86400)),  # 24 hours
+        'MOON_DATA_CACHE_SIZE': int(os.environ.get('MOON_DATA_CACHE_SIZE', 366)),  # dates
+        'PAGE_CACHE_SIZE': int(os.environ.get('PAGE_CACHE_SIZE', 64)),  # rendered pages
+        'PREFETCH_DAYS': int(os.environ.get('PREFETCH_DAYS', 3)),  # neighbouring dates computed ahead, 0 disables
+        'PREFETCH_WORKERS': int(os.environ.get('PREFETCH_WORKERS', 1)),
+        'CACHE_SNAPSHOT_PATH': os.environ.get('CACHE_SNAPSHOT_PATH', ''),  # empty disables snapshots
+        'CACHE_SNAPSHOT_INTERVAL': int(os.environ.get('CACHE_SNAPSHOT_INTERVAL', 300)),  # seconds, 0 = at exit only
+        'ANIMATION_CACHE_BYTES': int(os.environ.get('ANIMATION_CACHE_BYTES', 32 * 1024 * 1024)),
+        'TILE_CACHE_BYTES': int(os.environ.get('TILE_CACHE_BYTES', 64 * 1024 * 1024)),  # deep-zoom tiles on disk
+        'CURVE_CACHE_SIZE': int(os.environ.get('CURVE_CACHE_SIZE', 256)),  # intraday curves
+        
+        # Animation settings
+        'ANIMATION_MAX_DAYS': int(os.environ.get('ANIMATION_MAX_DAYS', 366)),
+        'ANIMATION_FRAME_MS': int(os.environ.get('ANIMATION_FRAME_MS', 100)),
+        
+        # Calendar settings
+        'PHASE_CALENDAR_MAX_YEARS': int(os.environ.get('PHASE_CALENDAR_MAX_YEARS', 10)),  # years per /phases.ics request
+        
+        # Export settings
+        'EXPORT_MAX_DATES': int(os.environ.get('EXPORT_MAX_DATES', 3660)),  # dates per /export/images request
+        
+        # Compression and static file settings
+        'COMPRESS_MIN_SIZE': int(os.environ.get('COMPRESS_MIN_SIZE', 500)),  # bytes
+        'COMPRESS_LEVEL': int(os.environ.get('COMPRESS_LEVEL', 6)),
+        'COMPRESS_CACHE_SIZE': int(os.environ.get('COMPRESS_CACHE_SIZE', 128)),  # entries
+        'SENDFILE_MODE': os.environ.get('SENDFILE_MODE', ''),  # '', 'x-sendfile' or 'x-accel-redirect'
+        'X_ACCEL_REDIRECT_PREFIX': os.environ.get('X_ACCEL_REDIRECT_PREFIX', '/protected-static'),
+        
+        # Load shedding settings: serve degraded pages while over either budget (0 disables a budget)
+        'DEGRADE_MAX_IN_FLIGHT': int(os.environ.get('DEGRADE_MAX_IN_FLIGHT', 32)),  # concurrent requests
+        'DEGRADE_P95_MS': float(os.environ.get('DEGRADE_P95_MS', 1000)),  # recent 95th percentile latency
+        
+        # Diagnostics settings
+        'MEMORY_PROFILING': os.environ.get('MEMORY_PROFILING', 'False').lower() in ['true', 'yes', '1'],  # tracemalloc, slows requests
+        'ADMIN_TOKEN': os.environ.get('ADMIN_TOKEN', ''),  # bearer token for /admin endpoints, empty disables them
         
         # Security settings
         'STRICT_TRANSPORT_SECURITY': os.environ.get('STRICT_TRANSPORT_SECURITY', 'True').lower() in ['true', 'yes', '1'],
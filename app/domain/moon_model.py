@@ -15,7 +15,8 @@ class MoonPhaseData:
         phase_name: str,
         phase_angle: float,
         next_phase_date: Optional[date] = None,
-        next_phase_name: Optional[str] = None
+        next_phase_name: Optional[str] = None,
+        distance_km: Optional[float] = None
     ):
         """
         Initialize a new MoonPhaseData instance.
@@ -27,6 +28,7 @@ class MoonPhaseData:
             phase_angle: The phase angle in degrees (0-360)
             next_phase_date: The date of the next major phase change (optional)
             next_phase_name: The name of the next major phase (optional)
+            distance_km: Distance from the observer to the Moon in kilometres (optional)
         """
         self.date = date
         self.illumination_percent = illumination_percent
@@ -34,6 +36,7 @@ class MoonPhaseData:
         self.phase_angle = phase_angle
         self.next_phase_date = next_phase_date
         self.next_phase_name = next_phase_name
+        self.distance_km = distance_km
     
     def is_full_moon(self) -> bool:
         """
@@ -80,5 +83,6 @@ class MoonPhaseData:
             "phase_angle": self.phase_angle,
             "next_phase_date": self.next_phase_date,
             "next_phase_name": self.next_phase_name,
-            "days_until_next_phase": self.days_until_next_phase()
+            "days_until_next_phase": self.days_until_next_phase(),
+            "distance_km": self.distance_km
         }
\ No newline at end of file
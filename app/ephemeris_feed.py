@@ -0,0 +1,142 @@
+import math
+import struct
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+import ephem
+
+from app.adapters.astronomy_adapter import PHASE_SEARCHES, AstronomyAdapter
+from app.moon_calculator import ENGINE_VERSION
+
+# Feed layout (all values little-endian):
+#   header:  magic (8s), format version (H), kind of the first event (H,
+#            index into FEED_EVENTS), event count (I), first event (q, Unix seconds)
+#   deltas:  seconds from each event to the next (count - 1 uint32)
+#   bends:   for each interval between events, the Moon's elongation at the
+#            interval's midpoint minus the straight line between its ends,
+#            in hundredths of a degree (count - 1 int16)
+# Consecutive events are quarters apart (90 degrees of elongation), so the
+# elongation inside an interval is 90 * k + 90 * u + 4 * bend * u * (1 - u)
+# for the fraction u of the interval elapsed.
+FEED_MAGIC = b'MOONFED1'
+FEED_FORMAT = 1
+FEED_HEADER = struct.Struct('<8sHHIq')
+FEED_EVENTS = ('next_new_moon', 'next_first_quarter', 'next_full_moon', 'next_last_quarter')
+
+# Phase events are searched this far around the requested year, so every
+# instant of the year falls between two events in the feed
+FEED_MARGIN_DAYS = 10
+
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+def feed_version() -> str:
+    """
+    Get the version of the feeds generated by this release.
+
+    Clients cache a feed forever under a URL containing the version, so it
+    must change whenever the engine or ephem would produce other events.
+
+    Returns:
+        str: The version string
+    """
+    return f"{FEED_FORMAT}.{ENGINE_VERSION}.{ephem.__version__}"
+
+def build_ephemeris_feed(year: int, adapter: Optional[AstronomyAdapter] = None) -> bytes:
+    """
+    Encode the phase events around a year as a compact binary feed.
+
+    Args:
+        year: Calendar year (UTC) the feed must cover
+        adapter: Adapter used for elongations at interval midpoints
+
+    Returns:
+        bytes: The feed, a few hundred bytes per year
+    """
+    adapter = adapter or AstronomyAdapter()
+    start = ephem.Date(date(year, 1, 1) - timedelta(days=FEED_MARGIN_DAYS))
+    end = ephem.Date(date(year + 1, 1, 1) + timedelta(days=FEED_MARGIN_DAYS))
+
+    # Merge the four kinds of events into one ascending sequence
+    events = []
+    for kind, name in enumerate(FEED_EVENTS):
+        event = PHASE_SEARCHES[name](start)
+        while event < end:
+            events.append((round(_to_unix(event)), kind))
+            event = PHASE_SEARCHES[name](event)
+    events.sort()
+
+    deltas, bends = [], []
+    for (first, kind), (second, _) in zip(events, events[1:]):
+        midpoint = _UNIX_EPOCH + timedelta(seconds=(first + second) / 2)
+        state = adapter.get_phase_state(midpoint.date(), midpoint.strftime('%H:%M:%S'))
+        # Unwrap relative to the straight line, which is at 90 * kind + 45
+        bend = (state['phase_angle'] - (90 * kind + 45) + 180) % 360 - 180
+        deltas.append(second - first)
+        bends.append(round(bend * 100))
+
+    header = FEED_HEADER.pack(FEED_MAGIC, FEED_FORMAT, events[0][1], len(events), events[0][0])
+    body = struct.pack(f'<{len(deltas)}I{len(bends)}h', *deltas, *bends)
+    return header + body
+
+def parse_ephemeris_feed(data: bytes) -> Dict[str, Any]:
+    """
+    Decode a feed written by build_ephemeris_feed.
+
+    Args:
+        data: The feed
+
+    Returns:
+        dict: 'events' as a list of (Unix seconds, kind) and 'bends' in degrees
+
+    Raises:
+        ValueError: If the data is not a valid feed
+    """
+    if len(data) < FEED_HEADER.size:
+        raise ValueError("Not an ephemeris feed")
+
+    magic, version, first_kind, count, first = FEED_HEADER.unpack_from(data, 0)
+    if magic != FEED_MAGIC or version != FEED_FORMAT or count < 2:
+        raise ValueError("Not an ephemeris feed")
+    if len(data) != FEED_HEADER.size + 6 * (count - 1):
+        raise ValueError("Corrupt ephemeris feed")
+
+    values = struct.unpack_from(f'<{count - 1}I{count - 1}h', data, FEED_HEADER.size)
+    events = [(first, first_kind)]
+    for delta in values[:count - 1]:
+        events.append((events[-1][0] + delta, (events[-1][1] + 1) % 4))
+
+    return {'events': events, 'bends': [bend / 100.0 for bend in values[count - 1:]]}
+
+def phase_from_feed(feed: Dict[str, Any], moment: datetime) -> Optional[Dict[str, Any]]:
+    """
+    Compute the moon's phase at an instant from a parsed feed.
+
+    This is the reference for the computation in static/js/main.js.
+
+    Args:
+        feed: Feed as returned by parse_ephemeris_feed
+        moment: The instant as a naive UTC datetime
+
+    Returns:
+        dict: 'phase_angle' (0-360), 'illumination_percent' (0-100) and the
+            'next_event' as (Unix seconds, kind), or None outside the feed
+    """
+    events = feed['events']
+    seconds = (moment - _UNIX_EPOCH).total_seconds()
+
+    for index, ((first, kind), (second, _)) in enumerate(zip(events, events[1:])):
+        if first <= seconds < second:
+            fraction = (seconds - first) / (second - first)
+            bend = feed['bends'][index]
+            phase_angle = (90 * kind + 90 * fraction + 4 * bend * fraction * (1 - fraction)) % 360
+            return {
+                'phase_angle': phase_angle,
+                'illumination_percent': (1 - math.cos(math.radians(phase_angle))) / 2 * 100,
+                'next_event': events[index + 1],
+            }
+
+    return None
+
+def _to_unix(ephem_date: float) -> float:
+    """Convert an ephem date to Unix seconds."""
+    return (ephem.Date(ephem_date).datetime() - _UNIX_EPOCH).total_seconds()
@@ -0,0 +1,212 @@
+import mmap
+import struct
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Any, Optional
+
+import ephem
+import numpy as np
+
+from app.utils.file_utils import atomic_write_bytes
+
+# Table layout (all values little-endian):
+#   header:  magic (8s), format version (H), reserved (H), sample count (I),
+#            first sample (d, ephem date), sample step (d, days),
+#            event counts for new, first quarter, full and last quarter moons (4I)
+#   samples: illumination (0-1), phase angle (degrees) and earth distance (AU),
+#            one float64 column each
+#   events:  sorted ephem dates of each phase, one float64 column per phase
+TABLE_MAGIC = b'MOONEPH1'
+# Bump when what a column means changes, so tables built before are rejected
+# (2: phase_angle is the elongation, as ENGINE_VERSION 3 computes it)
+TABLE_VERSION = 2
+HEADER_FORMAT = struct.Struct('<8sHHIdd4I')
+SAMPLE_COLUMNS = ('illumination', 'phase_angle', 'earth_distance')
+PHASE_EVENTS = ('next_new_moon', 'next_first_quarter', 'next_full_moon', 'next_last_quarter')
+
+# Instants closer than this to a sample (in days, about 1 second) use the sample
+SAMPLE_TOLERANCE = 1.0 / 86400.0
+
+class EphemerisTable:
+    """
+    Read-only, memory-mapped table of precomputed moon positions and phase dates.
+
+    The table is built once per host by build_ephemeris_table and mapped by
+    every process that opens it. Placed on a RAM-backed filesystem such as
+    /dev/shm, all workers share the same physical pages, so per-process
+    memory stays flat as workers are added and nobody repeats the warm-up.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open and map a table.
+
+        Args:
+            path: Path to a table written by build_ephemeris_table
+
+        Raises:
+            ValueError: If the file is not a valid table
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"Not an ephemeris table: {path}")
+
+        try:
+            self._read_columns()
+        except ValueError:
+            self.close()
+            raise
+
+    def get_phase_state(self, ephem_date: float) -> Optional[Dict[str, Any]]:
+        """
+        Look up the moon's state at a sampled instant.
+
+        Args:
+            ephem_date: The instant as an ephem date
+
+        Returns:
+            dict: 'illumination', 'phase_angle' and 'earth_distance' as in
+                AstronomyAdapter.get_phase_state, or None if the instant is
+                not one of the table's samples
+        """
+        position = (float(ephem_date) - self.start) / self.step
+        index = int(round(position))
+        if not 0 <= index < len(self.illumination) or abs(position - index) * self.step > SAMPLE_TOLERANCE:
+            return None
+
+        return {
+            'illumination': float(self.illumination[index]),
+            'phase_angle': float(self.phase_angle[index]),
+            'earth_distance': float(self.earth_distance[index]),
+        }
+
+    def next_phase_date(self, event: str, ephem_date: float) -> Optional[float]:
+        """
+        Find the first phase event of a kind after an instant.
+
+        Args:
+            event: One of PHASE_EVENTS, e.g. 'next_full_moon'
+            ephem_date: The instant as an ephem date
+
+        Returns:
+            float: ephem date of the event, or None if the table ends first
+        """
+        dates = self.events[event]
+        # Events before the table's first sample are not stored, so earlier
+        # instants cannot be answered either
+        if float(ephem_date) < self.start:
+            return None
+
+        index = int(np.searchsorted(dates, float(ephem_date), side='right'))
+        return float(dates[index]) if index < len(dates) else None
+
+    def close(self):
+        """Release the mapping and the file handle."""
+        # numpy views keep exports of the mapping alive; drop them first
+        self.illumination = self.phase_angle = self.earth_distance = None
+        self.events = {}
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _read_columns(self):
+        """Parse the header and create read-only array views over the mapping."""
+        if len(self._mmap) < HEADER_FORMAT.size:
+            raise ValueError(f"Not an ephemeris table: {self.path}")
+
+        magic, version, _, count, start, step, *event_counts = HEADER_FORMAT.unpack_from(self._mmap, 0)
+        if magic != TABLE_MAGIC:
+            raise ValueError(f"Not an ephemeris table: {self.path}")
+        if version != TABLE_VERSION:
+            raise ValueError(f"Unsupported ephemeris table version {version}: {self.path}")
+
+        expected_size = HEADER_FORMAT.size + 8 * (count * len(SAMPLE_COLUMNS) + sum(event_counts))
+        if len(self._mmap) != expected_size or step <= 0:
+            raise ValueError(f"Corrupt ephemeris table: {self.path}")
+
+        self.start = start
+        self.step = step
+
+        # Views over a read-only mapping are read-only arrays; nothing is copied
+        offset = HEADER_FORMAT.size
+        for name in SAMPLE_COLUMNS:
+            setattr(self, name, np.frombuffer(self._mmap, dtype='<f8', count=count, offset=offset))
+            offset += 8 * count
+
+        self.events = {}
+        for name, event_count in zip(PHASE_EVENTS, event_counts):
+            self.events[name] = np.frombuffer(self._mmap, dtype='<f8', count=event_count, offset=offset)
+            offset += 8 * event_count
+
+def build_ephemeris_table(output_path: str, start_date: date, days: int,
+                          step_hours: float = 1.0) -> int:
+    """
+    Precompute moon positions and phase dates and write them as a table.
+
+    Samples are taken every step_hours from midnight UTC on start_date for
+    the given number of days. Phase events are searched far enough past the
+    end that every sampled instant has all of its next phase dates.
+
+    Args:
+        output_path: Path of the table to write, e.g. under /dev/shm
+        start_date: First day to sample
+        days: Number of days to sample
+        step_hours: Hours between samples; whole-hour times of day are
+            served from the table when this divides 24
+
+    Returns:
+        int: Number of samples written
+    """
+    # Imported here to avoid a cycle: the adapter reads tables
+    from app.adapters.astronomy_adapter import AstronomyAdapter
+
+    if days < 1 or step_hours <= 0:
+        raise ValueError("days and step_hours must be positive")
+
+    adapter = AstronomyAdapter()
+    start = float(ephem.Date(start_date.strftime('%Y/%m/%d')))
+    step = step_hours / 24.0
+    count = int(round(days / step))
+
+    midnight = datetime.combine(start_date, time.min)
+    columns = {name: np.empty(count) for name in SAMPLE_COLUMNS}
+    for index in range(count):
+        moment = midnight + timedelta(hours=index * step_hours)
+        state = adapter.get_phase_state(moment.date(), moment.strftime('%H:%M:%S'))
+        for name in SAMPLE_COLUMNS:
+            columns[name][index] = state[name]
+
+    # A lunation is under 30 days, so every phase recurs within 31 days of the end
+    end = start + count * step + 31
+    search = {
+        'next_new_moon': ephem.next_new_moon,
+        'next_first_quarter': ephem.next_first_quarter_moon,
+        'next_full_moon': ephem.next_full_moon,
+        'next_last_quarter': ephem.next_last_quarter_moon,
+    }
+    events = {}
+    for name in PHASE_EVENTS:
+        dates = []
+        event = search[name](start)
+        while event < end:
+            dates.append(float(event))
+            event = search[name](event)
+        events[name] = np.array(dates)
+
+    header = HEADER_FORMAT.pack(TABLE_MAGIC, TABLE_VERSION, 0, count, start, step,
+                                *(len(events[name]) for name in PHASE_EVENTS))
+    body = [columns[name].astype('<f8').tobytes() for name in SAMPLE_COLUMNS]
+    body += [events[name].astype('<f8').tobytes() for name in PHASE_EVENTS]
+    atomic_write_bytes(output_path, b''.join([header] + body))
+
+    return count
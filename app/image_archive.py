@@ -0,0 +1,165 @@
+import hashlib
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from app.utils.file_utils import atomic_write_bytes
+
+# Archive layout (all integers little-endian):
+#   header:  magic (8s), format version (H), reserved (H), entry count (I)
+#   index:   one fixed-width record per entry, sorted by name:
+#            name (64s, UTF-8, NUL padded), data offset (Q), length (I), ETag digest (16s)
+#   data:    the encoded images, concatenated
+ARCHIVE_MAGIC = b'MOONPAK1'
+ARCHIVE_VERSION = 1
+HEADER_FORMAT = struct.Struct('<8sHHI')
+RECORD_FORMAT = struct.Struct('<64sQI16s')
+MAX_NAME_BYTES = 64
+
+class ImageArchive:
+    """
+    Read-only, memory-mapped archive of encoded images.
+
+    One file replaces thousands of small image files. The file is mapped
+    read-only, so every worker process on a host shares the same page-cache
+    pages, and an entry is returned as a memoryview slice without copying.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open and map an archive.
+
+        Args:
+            path: Path to an archive written by build_image_archive
+
+        Raises:
+            ValueError: If the file is not a valid archive
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"Not an image archive: {path}")
+
+        self._view = memoryview(self._mmap)
+        self._index = self._read_index()
+
+    def get(self, name: str) -> Optional[Tuple[memoryview, str]]:
+        """
+        Get an entry without copying its bytes.
+
+        Args:
+            name: Entry name, e.g. "full_moon.png"
+
+        Returns:
+            tuple: (memoryview of the encoded image, ETag) or None if missing
+        """
+        entry = self._index.get(name)
+        if entry is None:
+            return None
+
+        offset, length, etag = entry
+        return self._view[offset:offset + length], etag
+
+    def names(self) -> Iterator[str]:
+        """Iterate over the entry names in sorted order."""
+        return iter(sorted(self._index))
+
+    def close(self):
+        """Release the mapping and the file handle."""
+        self._index = {}
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _read_index(self) -> Dict[str, Tuple[int, int, str]]:
+        """Parse the header and index records into a name lookup table."""
+        if len(self._mmap) < HEADER_FORMAT.size:
+            raise ValueError(f"Not an image archive: {self.path}")
+
+        magic, version, _, count = HEADER_FORMAT.unpack_from(self._mmap, 0)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f"Not an image archive: {self.path}")
+        if version != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported image archive version {version}: {self.path}")
+
+        data_start = HEADER_FORMAT.size + count * RECORD_FORMAT.size
+        index = {}
+        for position in range(HEADER_FORMAT.size, data_start, RECORD_FORMAT.size):
+            raw_name, offset, length, digest = RECORD_FORMAT.unpack_from(self._mmap, position)
+            if offset < data_start or offset + length > len(self._mmap):
+                raise ValueError(f"Corrupt image archive index: {self.path}")
+            index[raw_name.rstrip(b'\0').decode('utf-8')] = (offset, length, digest.hex())
+
+        return index
+
+def build_image_archive(output_path: str, entries: Iterable[Tuple[str, bytes]]) -> int:
+    """
+    Write an archive from (name, encoded bytes) pairs.
+
+    The archive is written atomically, so running servers keep reading the
+    previous file until they reopen it.
+
+    Args:
+        output_path: Path of the archive to write
+        entries: Pairs of entry name and encoded image bytes; later
+            duplicates of a name replace earlier ones
+
+    Returns:
+        int: Number of entries written
+    """
+    images = {}
+    for name, data in entries:
+        if len(name.encode('utf-8')) > MAX_NAME_BYTES:
+            raise ValueError(f"Entry name too long for archive: {name}")
+        images[name] = bytes(data)
+
+    names = sorted(images)
+    data_start = HEADER_FORMAT.size + len(names) * RECORD_FORMAT.size
+
+    header = HEADER_FORMAT.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0, len(names))
+    records = []
+    offset = data_start
+    for name in names:
+        data = images[name]
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        records.append(RECORD_FORMAT.pack(name.encode('utf-8'), offset, len(data), digest))
+        offset += len(data)
+
+    atomic_write_bytes(output_path, b''.join([header] + records + [images[name] for name in names]))
+    return len(names)
+
+def iter_directory_images(directory: str,
+                          extensions: Tuple[str, ...] = ('.png', '.svg', '.webp')) -> Iterator[Tuple[str, bytes]]:
+    """
+    Read the image files in a directory as archive entries.
+
+    Args:
+        directory: Directory containing image files
+        extensions: File extensions to include
+
+    Yields:
+        tuple: (filename, file bytes)
+    """
+    for filename in sorted(os.listdir(directory)):
+        path = os.path.join(directory, filename)
+        if filename.endswith(extensions) and os.path.isfile(path):
+            with open(path, 'rb') as image_file:
+                yield filename, image_file.read()
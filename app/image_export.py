@@ -0,0 +1,193 @@
+import csv
+import io
+import os
+import time
+import zipfile
+from datetime import date
+from typing import Iterator, List, Sequence, Tuple
+
+from app.image_provider import ImageProvider
+from app.moon_calculator import MoonCalculator
+from app.utils.image_utils import encode_image, profile_extension, quantize_illumination, render_phase_svg
+
+# Encoder profile of each raster export format; the provider's own profile is
+# used instead when it produces the same format, so its cached files match
+EXPORT_PROFILES = {
+    'png': 'default',
+    'webp': 'webp-lossless',
+}
+EXPORT_FORMATS = tuple(EXPORT_PROFILES) + ('svg',)
+
+# Size of the images the provider caches, see ImageProvider.render_moon_image
+CACHED_IMAGE_SIZE = 400
+
+EXPORT_MIN_SIZE = 16
+EXPORT_MAX_SIZE = 2048
+
+class ImageExportService:
+    """
+    Service streaming moon images for many dates as a ZIP archive.
+
+    Dates sharing a quantized phase share one image, so an archive holds at
+    most 202 images per size and format however many dates it covers; a
+    manifest maps every date to its images. Entries are written to the
+    response as soon as they are encoded and nothing is written to disk, so
+    memory does not grow with the number of dates.
+    """
+
+    def __init__(self, moon_calculator: MoonCalculator, image_provider: ImageProvider):
+        """
+        Initialize the ImageExportService.
+
+        Args:
+            moon_calculator: Calculator providing the phase of each date
+            image_provider: Provider whose archive and cached files are reused
+                and which renders the missing images
+        """
+        self.moon_calculator = moon_calculator
+        self.image_provider = image_provider
+
+    def iter_zip(self, dates: Sequence[date], sizes: Sequence[int],
+                 formats: Sequence[str]) -> Iterator[bytes]:
+        """
+        Stream a ZIP archive of the images for a list of dates.
+
+        The archive starts with manifest.csv (date, phase name, illumination
+        and one column per size and format naming the image entry), followed
+        by each distinct image under images/<size>/.
+
+        Args:
+            dates: Dates to export, in the order of the manifest
+            sizes: Image widths and heights in pixels
+            formats: Image formats, each one of EXPORT_FORMATS
+
+        Yields:
+            bytes: Consecutive chunks of the archive
+        """
+        for image_format in formats:
+            if image_format not in EXPORT_FORMATS:
+                raise ValueError(f"Unsupported export format: {image_format}")
+        for size in sizes:
+            if not EXPORT_MIN_SIZE <= size <= EXPORT_MAX_SIZE:
+                raise ValueError(f"Sizes must be between {EXPORT_MIN_SIZE} and {EXPORT_MAX_SIZE}")
+
+        output = _ChunkWriter()
+        modified = time.localtime()[:6]
+        with zipfile.ZipFile(output, 'w') as archive:
+            # The manifest is written row by row while the phases are computed
+            manifest_info = zipfile.ZipInfo('manifest.csv', modified)
+            manifest_info.compress_type = zipfile.ZIP_DEFLATED
+            with archive.open(manifest_info, 'w') as manifest_file:
+                manifest = io.TextIOWrapper(manifest_file, encoding='utf-8', newline='')
+                writer = csv.writer(manifest)
+                writer.writerow(['date', 'phase_name', 'illumination_percent'] +
+                                [f"{image_format}_{size}" for size in sizes for image_format in formats])
+                for date_obj, illumination, phase_angle in self._iter_phases(dates):
+                    waning = phase_angle > 180.0
+                    writer.writerow([date_obj.isoformat(), self.moon_calculator.get_phase_name(illumination, waning),
+                                     round(illumination, 2)] +
+                                    [self.entry_name(illumination, phase_angle, size, image_format)
+                                     for size in sizes for image_format in formats])
+                    manifest.flush()
+                    yield output.drain()
+                manifest.detach()
+
+            # Second pass: each distinct image once, in the order first needed
+            written = set()
+            for _, illumination, phase_angle in self._iter_phases(dates):
+                for size in sizes:
+                    for image_format in formats:
+                        name = self.entry_name(illumination, phase_angle, size, image_format)
+                        if name in written:
+                            continue
+                        written.add(name)
+
+                        info = zipfile.ZipInfo(name, modified)
+                        # Raster formats are compressed already
+                        info.compress_type = zipfile.ZIP_DEFLATED if image_format == 'svg' else zipfile.ZIP_STORED
+                        archive.writestr(info, self.render(illumination, phase_angle, size, image_format))
+                        yield output.drain()
+
+        yield output.drain()
+
+    def entry_name(self, illumination_percent: float, phase_angle: float, size: int, image_format: str) -> str:
+        """
+        Get the archive entry holding the image of a phase.
+
+        Args:
+            illumination_percent: Percentage of the moon that is illuminated (0-100)
+            phase_angle: The phase angle in degrees (0-360)
+            size: Image width and height in pixels
+            image_format: One of EXPORT_FORMATS
+
+        Returns:
+            str: Entry name such as "images/400/moon_75_waxing.png"
+        """
+        extension = profile_extension(self._profile(image_format)) if image_format != 'svg' else 'svg'
+        return f"images/{size}/{ImageProvider.phase_image_name(illumination_percent, phase_angle, extension)}"
+
+    def render(self, illumination_percent: float, phase_angle: float, size: int, image_format: str) -> bytes:
+        """
+        Get the encoded image of a phase, reusing the provider's renders when possible.
+
+        Args:
+            illumination_percent: Percentage of the moon that is illuminated (0-100)
+            phase_angle: The phase angle in degrees (0-360)
+            size: Image width and height in pixels
+            image_format: One of EXPORT_FORMATS
+
+        Returns:
+            bytes: The encoded image
+        """
+        quantized = quantize_illumination(illumination_percent)
+        if image_format == 'svg':
+            return render_phase_svg(quantized, phase_angle, size).encode('utf-8')
+
+        profile = self._profile(image_format)
+        if size == CACHED_IMAGE_SIZE and profile == self.image_provider.encoding_profile:
+            name = self.image_provider.phase_image_name(quantized, phase_angle, profile_extension(profile))
+            archived = self.image_provider.get_archived_image(name)
+            if archived is not None:
+                return bytes(archived[0])
+            path = os.path.join(self.image_provider.base_path, name)
+            if os.path.exists(path):
+                with open(path, 'rb') as image_file:
+                    return image_file.read()
+
+        return encode_image(self.image_provider.render_moon_image(quantized, phase_angle, size), profile)
+
+    def _profile(self, image_format: str) -> str:
+        """Encoder profile for a raster export format."""
+        if profile_extension(self.image_provider.encoding_profile) == image_format:
+            return self.image_provider.encoding_profile
+        return EXPORT_PROFILES[image_format]
+
+    def _iter_phases(self, dates: Sequence[date]) -> Iterator[Tuple[date, float, float]]:
+        """Compute (date, illumination_percent, phase_angle) for each date, without next-phase searches."""
+        for date_obj in dates:
+            yield next(self.moon_calculator.iter_phase_series(date_obj, 1))
+
+class _ChunkWriter(io.RawIOBase):
+    """Unseekable file collecting what ZipFile writes until it is drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
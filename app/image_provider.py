@@ -1,10 +1,32 @@
 import os
-import time
 from PIL import Image, ImageDraw
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 from app.domain.moon_model import MoonPhaseData
-from app.utils.image_utils import create_circular_mask, apply_phase_to_image
+from app.image_archive import ImageArchive
+from app.utils.cache_utils import DiskLRUCache
+from app.utils.image_utils import (
+    create_circular_mask, apply_phase_to_image, render_phase_svg, render_phase_tile,
+    quantize_illumination, encode_image, get_encoding_profile, profile_extension
+)
+from app.utils.file_utils import create_file_once
+
+# Bump when rendering changes so cached pages and images are discarded
+RENDERER_VERSION = "1"
+
+# Apparent-size rendering: the disc is drawn in proportion to MEAN_DISTANCE_KM
+# divided by the Moon's distance, quantized to APPARENT_SCALE_STEP so only a
+# handful of sizes (about 0.93 to 1.07) are ever rendered per phase
+MEAN_DISTANCE_KM = 384400.0
+APPARENT_SCALE_STEP = 0.02
+APPARENT_SCALE_MIN = 0.92
+APPARENT_SCALE_MAX = 1.08
+
+# Deep-zoom tile pyramid: level 0 shows the whole moon in one TILE_SIZE tile
+# and each level doubles the resolution, up to DEEP_ZOOM_SIZE pixels across
+TILE_SIZE = 256
+DEEP_ZOOM_SIZE = 8192
+TILE_LEVELS = (DEEP_ZOOM_SIZE // TILE_SIZE).bit_length()
 
 class ImageProvider:
     """
@@ -26,14 +48,37 @@ class ImageProvider:
         "Waning Crescent": "waning_crescent.png"
     }
     
-    def __init__(self, base_path: str):
+    # Supported output formats for moon visualizations
+    IMAGE_FORMATS = ("png", "svg")
+    
+    def __init__(self, base_path: str, image_format: str = "png",
+                 archive: Optional[ImageArchive] = None, encoding_profile: str = "default",
+                 apparent_size: bool = False, tile_cache_bytes: int = 64 * 1024 * 1024):
         """
         Initialize the ImageProvider with the path to static images.
         
         Args:
             base_path: Path to the directory containing moon images
+            image_format: "png" for raster images or "svg" for vector images
+            archive: Optional packed archive of pre-rendered images, consulted
+                before loose files
+            encoding_profile: Encoder profile for generated raster images,
+                one of ENCODING_PROFILES in app.utils.image_utils
+            apparent_size: Whether raster images show the moon's apparent
+                size at its current distance (when the phase data has one)
+            tile_cache_bytes: Disk space for deep-zoom tiles beyond the
+                level 0 overviews, which are never evicted
         """
+        if image_format not in self.IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        get_encoding_profile(encoding_profile)  # Fail fast on unknown profiles
+        
         self.base_path = base_path
+        self.image_format = image_format
+        self.archive = archive
+        self.encoding_profile = encoding_profile
+        self.apparent_size = apparent_size
+        self.tile_cache = DiskLRUCache(os.path.join(base_path, 'tiles', 'cache'), tile_cache_bytes)
         self._ensure_base_path_exists()
     
     def get_moon_image(self, moon_phase_data: MoonPhaseData) -> str:
@@ -46,6 +91,31 @@ class ImageProvider:
         Returns:
             str: Path to the moon image
         """
+        # Vector images are cheap to render exactly for every phase
+        if self.image_format == "svg":
+            return self.get_moon_svg_path(
+                moon_phase_data.illumination_percent,
+                moon_phase_data.phase_angle
+            )
+        
+        # Sizes vary with distance, so neither the archive nor static images apply
+        if self.apparent_size and moon_phase_data.distance_km is not None:
+            return self.get_apparent_size_image(
+                moon_phase_data.illumination_percent,
+                moon_phase_data.phase_angle,
+                moon_phase_data.distance_km
+            )
+        
+        # Prefer an exact pre-rendered phase from the packed archive
+        if self.archive is not None:
+            archived_name = self.phase_image_name(
+                moon_phase_data.illumination_percent,
+                moon_phase_data.phase_angle,
+                profile_extension(self.encoding_profile)
+            )
+            if archived_name in self.archive:
+                return os.path.join(self.base_path, archived_name)
+        
         # Try to get a static image first
         try:
             static_image_path = self.get_static_moon_image(moon_phase_data.phase_name)
@@ -61,6 +131,27 @@ class ImageProvider:
             moon_phase_data.phase_angle
         )
     
+    def client_phase_images(self) -> Optional[Dict[str, str]]:
+        """
+        Get the static image file for each phase name, if those are what get_moon_image serves.
+        
+        Pages that compute the phase in the browser use this to pick the same
+        image the server would.
+        
+        Returns:
+            dict: File name by phase name, or None when images depend on more
+                than the phase name (SVG, archive or apparent-size rendering,
+                or missing static files)
+        """
+        if self.image_format != "png" or self.archive is not None or self.apparent_size:
+            return None
+        
+        for filename in self.PHASE_IMAGE_MAP.values():
+            if not os.path.exists(os.path.join(self.base_path, filename)):
+                return None
+        
+        return dict(self.PHASE_IMAGE_MAP)
+    
     def get_static_moon_image(self, phase_name: str) -> str:
         """
         Get the path to a static moon image for a given phase.
@@ -79,7 +170,12 @@ class ImageProvider:
     
     def generate_moon_image(self, illumination_percent: float, phase_angle: float) -> str:
         """
-        Generate a moon image based on phase data.
+        Get the path to a generated moon image, rendering it on first use.
+        
+        Files are named after the quantized phase, so each one is rendered
+        once. Processes asking for the same phase at the same time wait for
+        a single render, and the file is written atomically, so it is never
+        served half-written.
         
         Args:
             illumination_percent: Percentage of the moon that is illuminated (0-100)
@@ -88,23 +184,217 @@ class ImageProvider:
         Returns:
             str: Path to the generated image
         """
-        # Create a unique filename based on phase data
-        filename = f"moon_{int(illumination_percent)}_{int(phase_angle)}_{int(time.time())}.png"
+        extension = profile_extension(self.encoding_profile)
+        filename = self.phase_image_name(illumination_percent, phase_angle, extension)
         output_path = os.path.join(self.base_path, filename)
         
+        # Render the quantized phase so the file matches its name exactly
+        create_file_once(output_path, lambda: encode_image(
+            self.render_moon_image(quantize_illumination(illumination_percent), phase_angle),
+            self.encoding_profile
+        ))
+        
+        return output_path
+    
+    def get_apparent_size_image(self, illumination_percent: float, phase_angle: float,
+                                distance_km: float) -> str:
+        """
+        Get the path to a moon image drawn at its apparent size, rendering it on first use.
+        
+        Files are named after the quantized phase and the quantized size, so
+        the number of distinct images stays small.
+        
+        Args:
+            illumination_percent: Percentage of the moon that is illuminated (0-100)
+            phase_angle: The phase angle in degrees (0-360)
+            distance_km: Distance from the observer to the Moon
+            
+        Returns:
+            str: Path to the image
+        """
+        scale = self.quantize_apparent_scale(distance_km)
+        extension = profile_extension(self.encoding_profile)
+        base_name = self.phase_image_name(illumination_percent, phase_angle, extension)
+        stem, _ = os.path.splitext(base_name)
+        output_path = os.path.join(self.base_path, f"{stem}_s{round(scale * 100)}.{extension}")
+        
+        create_file_once(output_path, lambda: encode_image(
+            self.render_moon_image(
+                quantize_illumination(illumination_percent),
+                phase_angle,
+                scale=scale / APPARENT_SCALE_MAX
+            ),
+            self.encoding_profile
+        ))
+        
+        return output_path
+    
+    def render_moon_image(self, illumination_percent: float, phase_angle: float,
+                          size: int = 400, scale: float = 1.0) -> Image.Image:
+        """
+        Render a moon image in memory without writing it to disk.
+        
+        Args:
+            illumination_percent: Percentage of the moon that is illuminated (0-100)
+            phase_angle: The phase angle in degrees (0-360)
+            size: Width and height of the square image in pixels
+            scale: Diameter of the moon as a fraction of the image size (0-1);
+                smaller discs are centred on a transparent background
+            
+        Returns:
+            Image: The rendered RGBA image
+        """
+        diameter = round(size * scale)
+        if diameter < size:
+            canvas = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+            offset = (size - diameter) // 2
+            canvas.paste(self.render_moon_image(illumination_percent, phase_angle, diameter), (offset, offset))
+            return canvas
+        
         # Create a base full moon image
-        SIZE = 400  # Size of the image (square)
-        image = Image.new('RGBA', (SIZE, SIZE), (0, 0, 0, 0))
+        image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
         draw = ImageDraw.Draw(image)
         
         # Draw the basic moon circle (white for a full moon)
-        draw.ellipse((0, 0, SIZE, SIZE), fill='white', outline='lightgray')
+        draw.ellipse((0, 0, size, size), fill='white', outline='lightgray')
         
         # Apply phase effects
-        result = apply_phase_to_image(image, illumination_percent, phase_angle)
+        return apply_phase_to_image(image, illumination_percent, phase_angle)
+    
+    def get_moon_tile(self, illumination_percent: float, phase_angle: float,
+                      level: int, x: int, y: int) -> str:
+        """
+        Get the path to one tile of the deep-zoom pyramid, rendering it on first use.
+        
+        Level 0 is the overview, kept under tiles/overview; deeper tiles live
+        in the size-bounded tile cache and are evicted least recently used
+        first. Tiles are rendered one at a time by render_phase_tile, so a
+        request never needs more memory than one tile, whatever the level.
+        
+        Args:
+            illumination_percent: Percentage of the moon that is illuminated (0-100)
+            phase_angle: The phase angle in degrees (0-360)
+            level: Pyramid level, 0 to TILE_LEVELS - 1
+            x: Tile column, 0 to 2 ** level - 1
+            y: Tile row, 0 to 2 ** level - 1
+            
+        Returns:
+            str: Path to the tile image
+            
+        Raises:
+            ValueError: If the tile is outside the pyramid
+        """
+        if not 0 <= level < TILE_LEVELS or not (0 <= x < 2 ** level and 0 <= y < 2 ** level):
+            raise ValueError(f"No tile {x},{y} at level {level}")
+        
+        extension = profile_extension(self.encoding_profile)
+        stem, _ = os.path.splitext(self.phase_image_name(illumination_percent, phase_angle, extension))
+        
+        def render() -> bytes:
+            tile = render_phase_tile(quantize_illumination(illumination_percent), phase_angle,
+                                     TILE_SIZE * 2 ** level, x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE)
+            return encode_image(tile, self.encoding_profile)
+        
+        if level == 0:
+            output_path = os.path.join(self.base_path, 'tiles', 'overview', f"{stem}.{extension}")
+            create_file_once(output_path, render)
+            return output_path
+        
+        return self.tile_cache.get_or_create(f"{stem}_z{level}_{x}_{y}.{extension}", render)
+    
+    def precompute_tile_overviews(self) -> int:
+        """
+        Render the level 0 tile of every quantized phase that is missing.
+        
+        Returns:
+            int: Number of overview tiles in the pyramid set
+        """
+        count = 0
+        for illumination in range(0, 101):
+            for phase_angle in (90.0, 270.0):  # waxing and waning
+                self.get_moon_tile(illumination, phase_angle, 0, 0, 0)
+                count += 1
+        return count
+    
+    def get_archived_image(self, filename: str) -> Optional[Tuple[memoryview, str]]:
+        """
+        Get an image from the packed archive without copying it.
+        
+        Args:
+            filename: Name of the image
+            
+        Returns:
+            tuple: (memoryview of the encoded image, ETag) or None if not archived
+        """
+        if self.archive is None:
+            return None
+        return self.archive.get(filename)
+    
+    def has_image(self, image_path: str) -> bool:
+        """
+        Check whether an image path from get_moon_image can still be served.
+        
+        Args:
+            image_path: Path returned by get_moon_image
+            
+        Returns:
+            bool: True if the file exists or the image is in the packed archive
+        """
+        if os.path.exists(image_path):
+            return True
+        return self.archive is not None and os.path.basename(image_path) in self.archive
+    
+    @staticmethod
+    def quantize_apparent_scale(distance_km: float) -> float:
+        """
+        Quantize the moon's apparent size relative to its size at mean distance.
+        
+        Args:
+            distance_km: Distance from the observer to the Moon
+            
+        Returns:
+            float: Scale rounded to APPARENT_SCALE_STEP and clamped to
+                APPARENT_SCALE_MIN..APPARENT_SCALE_MAX
+        """
+        scale = MEAN_DISTANCE_KM / distance_km
+        quantized = round(scale / APPARENT_SCALE_STEP) * APPARENT_SCALE_STEP
+        return round(min(max(quantized, APPARENT_SCALE_MIN), APPARENT_SCALE_MAX), 2)
+    
+    @staticmethod
+    def phase_image_name(illumination_percent: float, phase_angle: float, extension: str) -> str:
+        """
+        Get the file name used for a rendering of a quantized phase.
+        
+        Args:
+            illumination_percent: Percentage of the moon that is illuminated (0-100)
+            phase_angle: The phase angle in degrees (0-360)
+            extension: File extension without the dot, e.g. "png"
+            
+        Returns:
+            str: File name such as "moon_75_waxing.png"
+        """
+        quantized = quantize_illumination(illumination_percent)
+        direction = "waning" if phase_angle > 180.0 else "waxing"
+        return f"moon_{int(quantized)}_{direction}.{extension}"
+    
+    def get_moon_svg_path(self, illumination_percent: float, phase_angle: float) -> str:
+        """
+        Get the path to an SVG moon image, rendering it on first use.
+        
+        Files are named after the quantized phase, so each one is rendered
+        once and can be cached by clients indefinitely.
+        
+        Args:
+            illumination_percent: Percentage of the moon that is illuminated (0-100)
+            phase_angle: The phase angle in degrees (0-360)
+            
+        Returns:
+            str: Path to the SVG image
+        """
+        filename = self.phase_image_name(illumination_percent, phase_angle, "svg")
+        output_path = os.path.join(self.base_path, filename)
         
-        # Save the result
-        result.save(output_path)
+        create_file_once(output_path, lambda: render_phase_svg(illumination_percent, phase_angle).encode('utf-8'))
         
         return output_path
     
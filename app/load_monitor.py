@@ -0,0 +1,133 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+from flask import Flask, g, request
+
+class LoadMonitor:
+    """
+    Tracks requests in flight and recent latencies to detect overload.
+
+    The monitor is overloaded when more requests are in flight than the
+    budget allows or the 95th percentile latency of the recent window is
+    over budget. It recovers only once both are comfortably below their
+    budgets (by recovery_ratio), so it does not flap at the boundary.
+    """
+
+    def __init__(self, max_in_flight: int = 32, p95_budget_ms: float = 1000.0,
+                 window_seconds: float = 30.0, min_samples: int = 20,
+                 recovery_ratio: float = 0.8, max_samples: int = 1000):
+        """
+        Initialize an idle monitor.
+
+        Args:
+            max_in_flight: Requests in flight above which the app is overloaded;
+                0 disables the check
+            p95_budget_ms: 95th percentile latency above which the app is
+                overloaded; 0 disables the check
+            window_seconds: Age after which latencies no longer count
+            min_samples: Latencies needed before the percentile is trusted
+            recovery_ratio: Fraction of each budget load must fall below to recover
+            max_samples: Latencies kept at most
+        """
+        self.max_in_flight = max_in_flight
+        self.p95_budget_ms = p95_budget_ms
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self.recovery_ratio = recovery_ratio
+        self._latencies = deque(maxlen=max_samples)
+        self._in_flight = 0
+        self._degraded = False
+        self._lock = threading.Lock()
+
+    def request_started(self):
+        """Count a request as in flight."""
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self, latency_ms: float):
+        """
+        Record a finished request.
+
+        Args:
+            latency_ms: Time the request took in milliseconds
+        """
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._latencies.append((time.monotonic(), latency_ms))
+
+    def overloaded(self) -> bool:
+        """
+        Decide whether requests should be served in degraded mode.
+
+        Returns:
+            bool: True while the load is over budget
+        """
+        with self._lock:
+            in_flight = self._in_flight
+            p95 = self._p95_ms()
+
+            if self._degraded:
+                ratio = self.recovery_ratio
+                in_flight_ok = not self.max_in_flight or in_flight <= self.max_in_flight * ratio
+                latency_ok = not self.p95_budget_ms or p95 is None or p95 <= self.p95_budget_ms * ratio
+                self._degraded = not (in_flight_ok and latency_ok)
+            else:
+                self._degraded = bool(
+                    (self.max_in_flight and in_flight > self.max_in_flight)
+                    or (self.p95_budget_ms and p95 is not None and p95 > self.p95_budget_ms)
+                )
+
+            return self._degraded
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the current load figures.
+
+        Returns:
+            dict: Requests in flight, recent p95 latency (or None) and whether degraded
+        """
+        with self._lock:
+            return {'in_flight': self._in_flight, 'p95_ms': self._p95_ms(), 'degraded': self._degraded}
+
+    def _p95_ms(self) -> Optional[float]:
+        """95th percentile of the latencies in the window; the caller must hold the lock."""
+        cutoff = time.monotonic() - self.window_seconds
+        while self._latencies and self._latencies[0][0] < cutoff:
+            self._latencies.popleft()
+
+        if len(self._latencies) < self.min_samples:
+            return None
+
+        ordered = sorted(latency for _, latency in self._latencies)
+        return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+def init_load_monitor(app: Flask, monitor: LoadMonitor, endpoints: Optional[Iterable[str]] = None):
+    """
+    Feed the requests of an app into a load monitor.
+
+    Only the given endpoints are tracked. Streaming routes such as exports
+    stay in flight for as long as the client downloads, which says nothing
+    about how fast pages are served, so they should be left out.
+
+    Args:
+        app: The Flask application
+        monitor: The monitor to update
+        endpoints: Endpoint names to track (defaults to every endpoint)
+    """
+    tracked = set(endpoints) if endpoints is not None else None
+
+    @app.before_request
+    def start_load_tracking():
+        if tracked is not None and request.endpoint not in tracked:
+            return
+        g.load_started = time.perf_counter()
+        monitor.request_started()
+
+    @app.teardown_request
+    def finish_load_tracking(error=None):
+        started = g.pop('load_started', None)
+        if started is not None:
+            monitor.request_finished((time.perf_counter() - started) * 1000.0)
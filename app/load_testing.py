@@ -0,0 +1,364 @@
+import bisect
+import http.client
+import math
+import multiprocessing
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Upper bounds of the latency histogram buckets in milliseconds (roughly
+# four buckets per doubling), followed by an overflow bucket
+HISTOGRAM_BOUNDS_MS = [round(0.25 * 2 ** (step / 4), 3) for step in range(0, 69)]
+
+# Traffic mix used when none is given: pages, images and API calls
+DEFAULT_MIX = [
+    (6.0, '/'),
+    (3.0, '/images/full_moon.png'),
+    (1.0, '/animation?days=7&size=64'),
+]
+
+def parse_mix(specs: List[str]) -> List[Tuple[float, str]]:
+    """
+    Parse traffic mix entries of the form "weight:path".
+
+    Args:
+        specs: Entries such as "6:/" or "1:/animation?days=7"
+
+    Returns:
+        list: (weight, path) pairs
+
+    Raises:
+        ValueError: If an entry is malformed or has a non-positive weight
+    """
+    mix = []
+    for spec in specs:
+        weight, separator, path = spec.partition(':')
+        if not separator or not path.startswith('/') or float(weight) <= 0:
+            raise ValueError(f"Invalid mix entry (expected weight:/path): {spec}")
+        mix.append((float(weight), path))
+    return mix
+
+class LatencyRecorder:
+    """
+    Thread-safe collector of request outcomes for one load-test phase.
+    """
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self._lock = threading.Lock()
+        self.latencies_ms: List[float] = []
+        self.status_codes: Dict[str, int] = {}
+        self.paths: Dict[str, Dict[str, Any]] = {}
+        self.errors = 0
+        self.degraded = 0
+
+    def record(self, path: str, status: Optional[int], latency_ms: float, degraded: bool = False):
+        """
+        Record one request.
+
+        Args:
+            path: Requested path
+            status: HTTP status, or None if the request failed without a response
+            latency_ms: Time from the scheduled start to the end of the response
+            degraded: Whether the server marked the response with X-Moon-Degraded
+        """
+        failed = status is None or status >= 400
+        with self._lock:
+            self.degraded += int(degraded)
+            self.latencies_ms.append(latency_ms)
+            key = str(status) if status is not None else 'connection_error'
+            self.status_codes[key] = self.status_codes.get(key, 0) + 1
+            entry = self.paths.setdefault(path, {'latencies_ms': [], 'errors': 0})
+            entry['latencies_ms'].append(latency_ms)
+            if failed:
+                self.errors += 1
+                entry['errors'] += 1
+
+    def summary(self, duration_s: float) -> Dict[str, Any]:
+        """
+        Summarize the recorded requests.
+
+        Args:
+            duration_s: Wall time of the phase in seconds
+
+        Returns:
+            dict: Throughput, error rate, latency percentiles, histogram and
+                per-path breakdown
+        """
+        with self._lock:
+            count = len(self.latencies_ms)
+            return {
+                'requests': count,
+                'errors': self.errors,
+                'error_rate': round(self.errors / count, 4) if count else 0.0,
+                'degraded': self.degraded,
+                'duration_s': round(duration_s, 3),
+                'throughput_rps': round(count / duration_s, 2) if duration_s > 0 else 0.0,
+                'latency_ms': latency_summary(self.latencies_ms),
+                'histogram': latency_histogram(self.latencies_ms),
+                'status_codes': dict(sorted(self.status_codes.items())),
+                'paths': {
+                    path: {
+                        'requests': len(entry['latencies_ms']),
+                        'errors': entry['errors'],
+                        'p50_ms': percentile(entry['latencies_ms'], 50),
+                        'p99_ms': percentile(entry['latencies_ms'], 99),
+                    }
+                    for path, entry in sorted(self.paths.items())
+                },
+            }
+
+def percentile(values: List[float], percent: float) -> Optional[float]:
+    """
+    Compute a percentile with the nearest-rank method.
+
+    Args:
+        values: Samples
+        percent: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile rounded to microseconds, or None without samples
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(max(1, math.ceil(percent * len(ordered) / 100)), len(ordered))
+    return round(ordered[rank - 1], 3)
+
+def latency_summary(latencies_ms: List[float]) -> Dict[str, Optional[float]]:
+    """Summarize latencies as min, mean, common percentiles and max."""
+    if not latencies_ms:
+        return {key: None for key in ('min', 'mean', 'p50', 'p90', 'p99', 'p999', 'max')}
+    return {
+        'min': round(min(latencies_ms), 3),
+        'mean': round(sum(latencies_ms) / len(latencies_ms), 3),
+        'p50': percentile(latencies_ms, 50),
+        'p90': percentile(latencies_ms, 90),
+        'p99': percentile(latencies_ms, 99),
+        'p999': percentile(latencies_ms, 99.9),
+        'max': round(max(latencies_ms), 3),
+    }
+
+def latency_histogram(latencies_ms: List[float]) -> List[Dict[str, Any]]:
+    """
+    Bucket latencies on logarithmic boundaries.
+
+    Returns:
+        list: Non-empty buckets as {'le_ms': upper bound or None for overflow, 'count'}
+    """
+    counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for latency in latencies_ms:
+        counts[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, latency)] += 1
+
+    bounds = HISTOGRAM_BOUNDS_MS + [None]
+    return [{'le_ms': bound, 'count': count} for bound, count in zip(bounds, counts) if count]
+
+class LoadGenerator:
+    """
+    HTTP load generator driving a weighted mix of paths against one server.
+
+    In closed-loop mode a fixed number of workers send requests back to
+    back. In open-loop mode requests are started at a fixed arrival rate
+    regardless of how fast the server answers, and latency is measured from
+    each request's scheduled start, so queueing delay is not hidden.
+    """
+
+    def __init__(self, base_url: str, mix: List[Tuple[float, str]], concurrency: int = 8,
+                 rate: Optional[float] = None, timeout: float = 10.0, seed: Optional[int] = None):
+        """
+        Initialize the generator.
+
+        Args:
+            base_url: Server URL, e.g. "http://127.0.0.1:5000"
+            mix: (weight, path) pairs
+            concurrency: Workers in closed-loop mode, or the maximum number of
+                requests in flight in open-loop mode
+            rate: Requests per second for open-loop mode; None for closed loop
+            timeout: Socket timeout per request in seconds
+            seed: Optional seed for a reproducible request sequence
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme != 'http' or not parts.hostname:
+            raise ValueError(f"Only http:// URLs are supported: {base_url}")
+
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.mix = mix
+        self.concurrency = concurrency
+        self.rate = rate
+        self.timeout = timeout
+        self._random = random.Random(seed)
+        self._local = threading.local()
+
+    def run_phase(self, duration_s: float) -> Dict[str, Any]:
+        """
+        Generate load for a duration and summarize it.
+
+        Args:
+            duration_s: Seconds to generate load for
+
+        Returns:
+            dict: Summary from LatencyRecorder.summary
+        """
+        recorder = LatencyRecorder()
+        started = time.perf_counter()
+        deadline = started + duration_s
+
+        if self.rate:
+            self._run_open_loop(recorder, deadline)
+        else:
+            self._run_closed_loop(recorder, deadline)
+
+        return recorder.summary(time.perf_counter() - started)
+
+    def _run_closed_loop(self, recorder: LatencyRecorder, deadline: float):
+        """Keep every worker busy until the deadline."""
+        def worker():
+            while time.perf_counter() < deadline:
+                self._request(self._choose_path(), time.perf_counter(), recorder)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _run_open_loop(self, recorder: LatencyRecorder, deadline: float):
+        """Start requests on a fixed schedule until the deadline."""
+        interval = 1.0 / self.rate
+        scheduled = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while scheduled < deadline:
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._request, self._choose_path(), scheduled, recorder)
+                scheduled += interval
+
+    def _choose_path(self) -> str:
+        """Pick a path according to the mix weights."""
+        weights, paths = zip(*self.mix)
+        return self._random.choices(paths, weights=weights)[0]
+
+    def _request(self, path: str, scheduled: float, recorder: LatencyRecorder):
+        """Send one GET on this thread's keep-alive connection and record it."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+
+        status = None
+        degraded = False
+        try:
+            connection.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+            degraded = response.getheader('X-Moon-Degraded') == '1'
+        except (OSError, http.client.HTTPException):
+            # Reconnect on the next request
+            connection.close()
+            self._local.connection = None
+
+        recorder.record(path, status, (time.perf_counter() - scheduled) * 1000.0, degraded)
+
+def run_load_test(base_url: str, mix: List[Tuple[float, str]], duration_s: float,
+                  cold_duration_s: float = 0.0, **generator_options) -> Dict[str, Any]:
+    """
+    Run a cold phase (optional) and a warm phase and report both.
+
+    Args:
+        base_url: Server URL
+        mix: (weight, path) pairs
+        duration_s: Length of the warm phase in seconds
+        cold_duration_s: Length of the phase run first against a fresh server
+        **generator_options: Passed to LoadGenerator
+
+    Returns:
+        dict: The configuration and a summary per phase
+    """
+    generator = LoadGenerator(base_url, mix, **generator_options)
+    phases = {}
+    if cold_duration_s > 0:
+        phases['cold'] = generator.run_phase(cold_duration_s)
+    phases['warm'] = generator.run_phase(duration_s)
+
+    return {
+        'config': {
+            'base_url': base_url,
+            'mode': 'open' if generator.rate else 'closed',
+            'concurrency': generator.concurrency,
+            'rate': generator.rate,
+            'mix': [{'weight': weight, 'path': path} for weight, path in mix],
+        },
+        'phases': phases,
+    }
+
+class LocalServer:
+    """
+    The application served by Werkzeug in a separate process.
+
+    Running the server in its own process keeps the load generator's
+    threads from competing with it for the GIL.
+    """
+
+    def __init__(self, test_config: Optional[Dict[str, Any]] = None, host: str = '127.0.0.1'):
+        """
+        Initialize the server without starting it.
+
+        Args:
+            test_config: Configuration overrides passed to create_app
+            host: Interface to bind; the port is chosen by the OS
+        """
+        self.test_config = test_config or {}
+        self.host = host
+        self.url: Optional[str] = None
+        self._process = None
+
+    def start(self) -> str:
+        """
+        Start the server and wait until it is listening.
+
+        Returns:
+            str: The server's base URL
+        """
+        context = multiprocessing.get_context('spawn')
+        ready = context.Queue()
+        self._process = context.Process(target=_serve, args=(self.host, self.test_config, ready), daemon=True)
+        self._process.start()
+        self.url = f"http://{self.host}:{ready.get(timeout=60)}"
+        return self.url
+
+    def stop(self):
+        """Stop the server process."""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+def _serve(host: str, test_config: Dict[str, Any], ready):
+    """Server process entry point: build the app and serve it on a free port."""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from app.app import create_app
+
+    class QuietRequestHandler(WSGIRequestHandler):
+        # Per-request access logging would cost the server more than some requests
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server(host, 0, create_app(test_config=test_config), threaded=True,
+                         request_handler=QuietRequestHandler)
+    ready.put(server.server_port)
+    server.serve_forever()
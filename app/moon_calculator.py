@@ -1,9 +1,12 @@
-from datetime import date
-from typing import Tuple, Optional
+from datetime import date, timedelta
+from typing import Iterator, Tuple, Optional
 
 from app.domain.moon_model import MoonPhaseData
 from app.adapters.astronomy_adapter import AstronomyAdapter
 
+# Bump when calculations change so cached results (e.g. cache snapshots) are discarded
+ENGINE_VERSION = "3"
+
 class MoonCalculator:
     """
     Calculator for moon phase information.
@@ -12,32 +15,36 @@ class MoonCalculator:
     and processes it into domain models with moon phase information.
     """
     
-    def __init__(self, astronomy_adapter: AstronomyAdapter):
+    def __init__(self, astronomy_adapter: AstronomyAdapter, default_time: str = '22:00:00'):
         """
         Initialize the Moon Calculator.
         
         Args:
             astronomy_adapter: The adapter for astronomical calculations
+            default_time: Time of day (UTC, "HH:MM:SS") a date's phase is
+                computed for, the DEFAULT_TIME setting
         """
         self.astronomy_adapter = astronomy_adapter
+        self.default_time = default_time
     
-    def calculate_moon_phase(self, date_obj: date, time_str: str = '22:00:00') -> MoonPhaseData:
+    def calculate_moon_phase(self, date_obj: date, time_str: Optional[str] = None) -> MoonPhaseData:
         """
         Calculate the moon phase for the given date and time.
         
         Args:
             date_obj: The date for which to calculate the moon phase
-            time_str: The time of day as a string in format "HH:MM:SS", defaults to 10 PM
+            time_str: The time of day as a string in format "HH:MM:SS", defaults to default_time
             
         Returns:
             MoonPhaseData: Domain model containing moon phase information
         """
         # Get raw astronomical data from the adapter
-        moon_data = self.astronomy_adapter.get_moon_data(date_obj, time_str)
+        moon_data = self.astronomy_adapter.get_moon_data(date_obj, time_str or self.default_time)
         
         # Process the raw data
         illumination_percent = self.astronomy_adapter.calculate_illumination(moon_data)
         phase_angle = self.astronomy_adapter.calculate_phase_angle(moon_data)
+        distance_km = self.astronomy_adapter.calculate_distance_km(moon_data)
         
         # Determine if the moon is waxing or waning based on phase angle
         # Waxing: 0 to 180 degrees, Waning: 180 to 360 degrees
@@ -56,9 +63,35 @@ class MoonCalculator:
             phase_name=phase_name,
             phase_angle=phase_angle,
             next_phase_date=next_phase_date,
-            next_phase_name=next_phase_name
+            next_phase_name=next_phase_name,
+            distance_km=distance_km
         )
     
+    def iter_phase_series(self, start_date: date, days: int,
+                          time_str: Optional[str] = None) -> Iterator[Tuple[date, float, float]]:
+        """
+        Lazily compute illumination and phase angle for consecutive days.
+        
+        Only the moon's position is computed for each day; the next-phase
+        search of calculate_moon_phase is skipped.
+        
+        Args:
+            start_date: The first date of the series
+            days: Number of consecutive days
+            time_str: The time of day as a string in format "HH:MM:SS", defaults to default_time
+            
+        Yields:
+            tuple: (date, illumination_percent, phase_angle) for each day
+        """
+        for offset in range(days):
+            date_obj = start_date + timedelta(days=offset)
+            phase_state = self.astronomy_adapter.get_phase_state(date_obj, time_str or self.default_time)
+            yield (
+                date_obj,
+                self.astronomy_adapter.calculate_illumination(phase_state),
+                self.astronomy_adapter.calculate_phase_angle(phase_state)
+            )
+    
     def get_phase_name(self, illumination_percent: float, waning: bool = False) -> str:
         """
         Determine the name of the moon phase based on illumination percentage.
@@ -93,7 +126,7 @@ class MoonCalculator:
             tuple: (next_phase_date, next_phase_name) - the date and name of the next phase
         """
         # Get moon data which contains next phase dates
-        moon_data = self.astronomy_adapter.get_moon_data(current_date)
+        moon_data = self.astronomy_adapter.get_moon_data(current_date, self.default_time)
         
         # Find the next closest phase date
         phase_dates = [
@@ -0,0 +1,154 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.utils.cache_utils import LRUCache
+
+# Local start hour and length in hours of each kind of curve
+CURVE_SPANS = {
+    'night': (18, 12),  # 6 PM to 6 AM the next morning
+    'day': (0, 24),
+}
+
+# Timezone offsets are rounded to this many minutes, which keeps every real
+# timezone exact while bounding the number of cached curves
+TZ_BUCKET_MINUTES = 15
+MAX_TZ_OFFSET_MINUTES = 14 * 60
+
+CURVE_MIN_POINTS = 2
+CURVE_MAX_POINTS = 288
+
+# Sparkline drawing size in pixels
+SPARKLINE_WIDTH = 240
+SPARKLINE_HEIGHT = 60
+
+class MoonCurveService:
+    """
+    Service computing how the Moon changes over one night or day.
+
+    Each curve comes from a single batched adapter call, see
+    AstronomyAdapter.get_phase_curve, and is cached by date, timezone
+    bucket, span and resolution.
+    """
+
+    def __init__(self, astronomy_adapter: AstronomyAdapter, cache: Optional[LRUCache] = None,
+                 location: Optional[Dict[str, float]] = None):
+        """
+        Initialize the MoonCurveService.
+
+        Args:
+            astronomy_adapter: Adapter computing the curves
+            cache: Cache of computed curves (defaults to 256 entries)
+            location: Optional observer location for altitudes, as for
+                AstronomyAdapter.get_moon_data
+        """
+        self.astronomy_adapter = astronomy_adapter
+        self.cache = cache if cache is not None else LRUCache(max_entries=256)
+        self.location = location
+
+    @staticmethod
+    def timezone_bucket(offset_minutes: int) -> int:
+        """
+        Round a timezone offset to its bucket.
+
+        Args:
+            offset_minutes: Minutes east of UTC
+
+        Returns:
+            int: Offset rounded to TZ_BUCKET_MINUTES and clamped to +-14 hours
+        """
+        bucket = round(offset_minutes / TZ_BUCKET_MINUTES) * TZ_BUCKET_MINUTES
+        return max(-MAX_TZ_OFFSET_MINUTES, min(MAX_TZ_OFFSET_MINUTES, bucket))
+
+    def get_curve(self, date_obj: date, offset_minutes: int = 0, points: int = 48,
+                  span: str = 'night') -> Dict[str, Any]:
+        """
+        Get illumination, phase angle and altitude across a night or a day.
+
+        The returned dictionary is shared with the cache and must not be changed.
+
+        Args:
+            date_obj: Local date the night or day starts on
+            offset_minutes: Timezone as minutes east of UTC
+            points: Number of evenly spaced instants, CURVE_MIN_POINTS to CURVE_MAX_POINTS
+            span: One of CURVE_SPANS
+
+        Returns:
+            dict: 'date', 'span', 'tz_offset_minutes' (the bucket) and 'points',
+                each with a local ISO 'time', 'illumination_percent',
+                'phase_angle' and 'altitude' in degrees
+
+        Raises:
+            ValueError: If the span or the number of points is invalid
+        """
+        if span not in CURVE_SPANS:
+            raise ValueError(f"Unknown span: {span}")
+        if not CURVE_MIN_POINTS <= points <= CURVE_MAX_POINTS:
+            raise ValueError(f"points must be between {CURVE_MIN_POINTS} and {CURVE_MAX_POINTS}")
+
+        bucket = self.timezone_bucket(offset_minutes)
+        key = (date_obj.isoformat(), bucket, span, points)
+        return self.cache.get_or_create(key, lambda: self._compute_curve(date_obj, bucket, points, span))
+
+    def _compute_curve(self, date_obj: date, bucket: int, points: int, span: str) -> Dict[str, Any]:
+        """Compute a curve for a timezone bucket without caching."""
+        start_hour, hours = CURVE_SPANS[span]
+        local_zone = timezone(timedelta(minutes=bucket))
+        local_start = datetime(date_obj.year, date_obj.month, date_obj.day, start_hour, tzinfo=local_zone)
+        utc_start = local_start.astimezone(timezone.utc).replace(tzinfo=None)
+
+        curve = self.astronomy_adapter.get_phase_curve(utc_start, hours, points, self.location)
+        return {
+            'date': date_obj.isoformat(),
+            'span': span,
+            'tz_offset_minutes': bucket,
+            'points': [
+                {
+                    'time': instant.replace(tzinfo=timezone.utc).astimezone(local_zone).isoformat(timespec='minutes'),
+                    'illumination_percent': round(illumination, 3),
+                    'phase_angle': round(phase_angle, 3),
+                    'altitude': round(altitude, 3),
+                }
+                for instant, illumination, phase_angle, altitude in zip(
+                    curve['times'], curve['illumination_percent'], curve['phase_angle'], curve['altitude'])
+            ],
+        }
+
+def render_curve_svg(curve: Dict[str, Any], width: int = SPARKLINE_WIDTH, height: int = SPARKLINE_HEIGHT) -> str:
+    """
+    Render a curve as a small inline SVG sparkline.
+
+    The Moon's altitude is drawn from -90 to 90 degrees with the horizon as
+    a dashed line, and the illumination from 0 to 100% as a fainter line.
+
+    Args:
+        curve: Curve as returned by MoonCurveService.get_curve
+        width: Width of the SVG in pixels
+        height: Height of the SVG in pixels
+
+    Returns:
+        str: SVG markup
+    """
+    samples = curve['points']
+    step = width / (len(samples) - 1)
+
+    def polyline(values, low, high):
+        return " ".join(f"{index * step:.1f},{height - (value - low) / (high - low) * height:.1f}"
+                        for index, value in enumerate(values))
+
+    altitudes = polyline([sample['altitude'] for sample in samples], -90.0, 90.0)
+    illumination = polyline([sample['illumination_percent'] for sample in samples], 0.0, 100.0)
+    highest = max(samples, key=lambda sample: sample['altitude'])
+    label = (f"Moon from {samples[0]['time']} to {samples[-1]['time']}: highest at "
+             f"{highest['altitude']:.0f} degrees at {highest['time'][11:16]}, "
+             f"{samples[0]['illumination_percent']:.0f}% to {samples[-1]['illumination_percent']:.0f}% illuminated")
+
+    return (
+        f"<svg xmlns='http://www.w3.org/2000/svg' class='moon-curve' width='{width}' height='{height}' "
+        f"viewBox='0 0 {width} {height}' role='img' aria-label='{label}'>"
+        f"<title>{label}</title>"
+        f"<line x1='0' y1='{height / 2:g}' x2='{width}' y2='{height / 2:g}' stroke='gray' stroke-dasharray='3 3'/>"
+        f"<polyline points='{illumination}' fill='none' stroke='lightgray' stroke-width='1'/>"
+        f"<polyline points='{altitudes}' fill='none' stroke='white' stroke-width='1.5'/>"
+        "</svg>"
+    )
@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Iterator
+
+from app.adapters.phase_events import iter_phase_events
+from app.ephemeris_feed import feed_version
+
+# Bump when the generated calendar text changes, so clients refetch it
+CALENDAR_FORMAT = 1
+
+CALENDAR_HEADER = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Moon Phase//Phase Calendar//EN\r\n"
+    "CALSCALE:GREGORIAN\r\n"
+    "METHOD:PUBLISH\r\n"
+    "X-WR-CALNAME:Moon Phases\r\n"
+    "REFRESH-INTERVAL;VALUE=DURATION:P1D\r\n"
+    "X-PUBLISHED-TTL:P1D\r\n"
+)
+CALENDAR_FOOTER = "END:VCALENDAR\r\n"
+
+def calendar_etag(first_year: int, last_year: int) -> str:
+    """
+    Get the entity tag of the calendar for a range of years.
+
+    The events depend only on the years and on the engine and ephem
+    versions, so the tag is known without generating anything.
+
+    Args:
+        first_year: First calendar year (UTC) covered
+        last_year: Last calendar year (UTC) covered
+
+    Returns:
+        str: The entity tag
+    """
+    return f"phases-{CALENDAR_FORMAT}.{feed_version()}-{first_year}-{last_year}"
+
+def iter_phase_calendar(first_year: int, last_year: int) -> Iterator[str]:
+    """
+    Generate an iCalendar document of the major phases, one event at a time.
+
+    Events are instantaneous (a DTSTART without an end) at the UTC instant
+    of the phase. DTSTAMP is the event's own instant rather than the time
+    of the request, so the document is identical for every request and
+    matches its entity tag.
+
+    Args:
+        first_year: First calendar year (UTC) covered
+        last_year: Last calendar year (UTC) covered
+
+    Yields:
+        str: The header, one VEVENT per phase, then the footer, with CRLF line endings
+    """
+    yield CALENDAR_HEADER
+    for instant, phase_name in iter_phase_events(datetime(first_year, 1, 1), datetime(last_year + 1, 1, 1)):
+        yield format_phase_event(instant, phase_name)
+    yield CALENDAR_FOOTER
+
+def format_phase_event(instant: datetime, phase_name: str) -> str:
+    """
+    Format one phase as a VEVENT.
+
+    Args:
+        instant: When the phase occurs, as a naive UTC datetime
+        phase_name: Name of the phase, e.g. "Full Moon"
+
+    Returns:
+        str: The VEVENT with CRLF line endings
+    """
+    stamp = instant.strftime('%Y%m%dT%H%M%SZ')
+    slug = phase_name.lower().replace(' ', '-')
+    return (
+        "BEGIN:VEVENT\r\n"
+        f"UID:{slug}-{stamp}@moon-phase\r\n"
+        f"DTSTAMP:{stamp}\r\n"
+        f"DTSTART:{stamp}\r\n"
+        f"SUMMARY:{phase_name}\r\n"
+        "TRANSP:TRANSPARENT\r\n"
+        "END:VEVENT\r\n"
+    )
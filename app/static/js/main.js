@@ -3,22 +3,265 @@
  * Provides minimal client-side functionality
  */
 
-document.addEventListener('DOMContentLoaded', function() {
-  // Get the current date and set up auto-refresh for the next day
+// Updates are spread over this many milliseconds after midnight UTC so that
+// open tabs do not all ask the server at the same moment
+const UPDATE_JITTER_MS = 5 * 60 * 1000;
+
+// Delay before asking again while the server still reports the old version
+const RETRY_DELAY_MS = 60 * 1000;
+
+// Time (UTC) of the day at which the server computes each day's phase,
+// unless the page gives its DEFAULT_TIME in data-phase-time
+const DEFAULT_PHASE_TIME = '22:00:00';
+
+// Phase names of the event kinds in the ephemeris feed
+const FEED_EVENT_NAMES = ['New Moon', 'First Quarter', 'Full Moon', 'Last Quarter'];
+
+// Parsed ephemeris feeds by year
+const ephemerisFeeds = {};
+
+/**
+ * Decode a binary ephemeris feed, see app/ephemeris_feed.py for the layout.
+ */
+function parseEphemerisFeed(buffer) {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode.apply(null, new Uint8Array(buffer, 0, 8));
+  if (magic !== 'MOONFED1' || view.getUint16(8, true) !== 1) {
+    throw new Error('Not an ephemeris feed');
+  }
+
+  const count = view.getUint32(12, true);
+  const events = [{ time: Number(view.getBigInt64(16, true)), kind: view.getUint16(10, true) }];
+  const bends = [];
+  for (let i = 0; i < count - 1; i++) {
+    const previous = events[events.length - 1];
+    events.push({ time: previous.time + view.getUint32(24 + 4 * i, true), kind: (previous.kind + 1) % 4 });
+    bends.push(view.getInt16(24 + 4 * (count - 1) + 2 * i, true) / 100);
+  }
+  return { events: events, bends: bends };
+}
+
+/**
+ * Load the ephemeris feed for a year; the browser caches it for a year.
+ */
+function loadEphemerisFeed(container, year) {
+  if (!ephemerisFeeds[year]) {
+    const url = container.dataset.ephemerisUrl.replace(
+      new RegExp(container.dataset.ephemerisYear + '\\.bin$'), year + '.bin');
+    ephemerisFeeds[year] = fetch(url).then(function(response) {
+      if (!response.ok) {
+        throw new Error('Unexpected status ' + response.status);
+      }
+      return response.arrayBuffer();
+    }).then(parseEphemerisFeed);
+  }
+  return ephemerisFeeds[year];
+}
+
+/**
+ * Name of the phase for an illumination, as in MoonCalculator.get_phase_name.
+ */
+function phaseName(illumination, waning) {
+  if (illumination <= 1.0) {
+    return 'New Moon';
+  } else if (illumination <= 45.0) {
+    return waning ? 'Waning Crescent' : 'Waxing Crescent';
+  } else if (illumination <= 55.0) {
+    return waning ? 'Last Quarter' : 'First Quarter';
+  } else if (illumination < 99.0) {
+    return waning ? 'Waning Gibbous' : 'Waxing Gibbous';
+  }
+  return 'Full Moon';
+}
+
+/**
+ * Compute the moon data for a UTC date from a feed, like the server would.
+ *
+ * Returns null if the feed does not cover the date.
+ */
+function moonDataFromFeed(feed, dateStr, phaseImages, phaseTime) {
+  const seconds = Date.parse(dateStr + 'T' + (phaseTime || DEFAULT_PHASE_TIME) + 'Z') / 1000;
+  const events = feed.events;
+
+  for (let i = 0; i < events.length - 1; i++) {
+    if (events[i].time <= seconds && seconds < events[i + 1].time) {
+      // Elongation between two quarters, bent to match the server at the midpoint
+      const u = (seconds - events[i].time) / (events[i + 1].time - events[i].time);
+      const angle = (90 * events[i].kind + 90 * u + 4 * feed.bends[i] * u * (1 - u)) % 360;
+      const illumination = (1 - Math.cos(angle * Math.PI / 180)) / 2 * 100;
+      const name = phaseName(illumination, angle > 180);
+      const nextDate = new Date(events[i + 1].time * 1000).toISOString().slice(0, 10);
+
+      return {
+        date: dateStr,
+        phase_name: name,
+        illumination_percent: illumination,
+        image_url: phaseImages[name],
+        next_phase_name: FEED_EVENT_NAMES[events[i + 1].kind],
+        next_phase_date: nextDate,
+        days_until_next_phase: Math.round((Date.parse(nextDate) - Date.parse(dateStr)) / 86400000)
+      };
+    }
+  }
+  return null;
+}
+
+/**
+ * Format an element holding a YYYY-MM-DD date to be more readable.
+ */
+function formatDateElement(element, dateStr) {
+  if (dateStr) {
+    try {
+      const date = new Date(dateStr);
+      const options = { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' };
+      element.textContent = date.toLocaleDateString(undefined, options);
+    } catch (e) {
+      console.error('Error formatting date:', e);
+    }
+  }
+}
+
+/**
+ * Show new moon data from /api/moon without reloading the page.
+ */
+function applyMoonUpdate(container, data) {
+  const field = function(name) {
+    return document.querySelector('[data-field="' + name + '"]');
+  };
+  const illumination = Math.round(data.illumination_percent).toFixed(1) + '%';
+
+  const image = field('image');
+  if (image) {
+    image.src = data.image_url;
+    image.alt = data.phase_name + ' - ' + illumination + ' illuminated';
+  }
+  if (field('phase_name')) {
+    field('phase_name').textContent = data.phase_name;
+  }
+  if (field('illumination_percent')) {
+    field('illumination_percent').textContent = illumination;
+  }
+  if (field('illumination_bar')) {
+    field('illumination_bar').style.width = data.illumination_percent + '%';
+  }
+  if (field('date')) {
+    formatDateElement(field('date'), data.date);
+  }
+  if (field('next_phase') && data.next_phase_name) {
+    field('next_phase').textContent = data.next_phase_name + ' (in ' + data.days_until_next_phase + ' days)';
+  }
+  if (field('next_phase_date') && data.next_phase_date) {
+    formatDateElement(field('next_phase_date'), data.next_phase_date);
+  }
+
+  if (field('curve') && container.dataset.curveUrl) {
+    updateCurve(field('curve'), container.dataset.curveUrl, data.date);
+  }
+
+  if (data.version) {
+    container.dataset.version = data.version;
+  }
+}
+
+/**
+ * Replace the overnight sparkline with the one for another date.
+ */
+function updateCurve(element, curveUrl, dateStr) {
+  const url = new URL(curveUrl, window.location.href);
+  url.searchParams.set('date', dateStr);
+
+  fetch(url).then(function(response) {
+    if (!response.ok) {
+      throw new Error('Unexpected status ' + response.status);
+    }
+    return response.text();
+  }).then(function(svg) {
+    element.innerHTML = svg;
+  }).catch(function(e) {
+    console.error('Error updating the overnight curve:', e);
+  });
+}
+
+/**
+ * Compute the new day's moon data in the browser after the given delay.
+ *
+ * Falls back to asking the server when the page cannot pick images itself
+ * or the feed is unavailable.
+ */
+function scheduleLocalMoonUpdate(container, delayMs) {
+  const jitter = Math.random() * UPDATE_JITTER_MS;
+
+  setTimeout(function() {
+    const today = new Date().toISOString().slice(0, 10);
+    const phaseImages = JSON.parse(container.dataset.phaseImages);
+
+    loadEphemerisFeed(container, Number(today.slice(0, 4))).then(function(feed) {
+      const data = moonDataFromFeed(feed, today, phaseImages, container.dataset.phaseTime);
+      if (!data) {
+        throw new Error('Ephemeris feed does not cover ' + today);
+      }
+      applyMoonUpdate(container, data);
+      scheduleLocalMoonUpdate(container, millisUntilNextMidnightUTC());
+    }).catch(function(e) {
+      console.error('Error computing moon data locally:', e);
+      scheduleMoonUpdate(container, 0);
+    });
+  }, Math.max(delayMs, 0) + jitter);
+}
+
+/**
+ * Milliseconds until the server's date changes.
+ */
+function millisUntilNextMidnightUTC() {
   const now = new Date();
-  const tomorrow = new Date(now);
-  tomorrow.setDate(tomorrow.getDate() + 1);
-  tomorrow.setHours(0, 0, 30, 0); // Set to 12:00:30 AM
-  
-  // Calculate milliseconds until next refresh
-  const millisUntilRefresh = tomorrow - now;
-  
-  // Set up a refresh timer for the next day
-  if (millisUntilRefresh > 0) {
-    setTimeout(function() {
-      // Reload the page to get the new moon phase for today
+  return Date.UTC(now.getUTCFullYear(), now.getUTCMonth(), now.getUTCDate() + 1) - now.getTime();
+}
+
+/**
+ * Ask the server for new moon data after the given delay.
+ *
+ * The request carries the shown version, so until the server's date changes
+ * the answer is an empty 304. If the update channel is unavailable (e.g. on a
+ * static export) the page falls back to reloading itself.
+ */
+function scheduleMoonUpdate(container, delayMs) {
+  const jitter = Math.random() * UPDATE_JITTER_MS;
+
+  setTimeout(function() {
+    fetch(container.dataset.apiUrl, {
+      headers: { 'If-None-Match': '"' + container.dataset.version + '"' },
+      cache: 'no-cache'
+    }).then(function(response) {
+      if (response.status === 304) {
+        scheduleMoonUpdate(container, RETRY_DELAY_MS);
+        return;
+      }
+      if (!response.ok) {
+        throw new Error('Unexpected status ' + response.status);
+      }
+      return response.json().then(function(data) {
+        applyMoonUpdate(container, data);
+        if (container.dataset.phaseImages) {
+          scheduleLocalMoonUpdate(container, millisUntilNextMidnightUTC());
+        } else {
+          scheduleMoonUpdate(container, new Date(data.next_update) - new Date());
+        }
+      });
+    }).catch(function(e) {
+      console.error('Error updating moon data:', e);
       window.location.reload();
-    }, millisUntilRefresh);
+    });
+  }, Math.max(delayMs, 0) + jitter);
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+  // Update the page in place once the date changes at midnight UTC, computing
+  // the phase from the ephemeris feed when the page can pick images itself
+  const container = document.querySelector('.moon-data[data-api-url]');
+  if (container && container.dataset.phaseImages) {
+    scheduleLocalMoonUpdate(container, millisUntilNextMidnightUTC());
+  } else if (container) {
+    scheduleMoonUpdate(container, millisUntilNextMidnightUTC());
   }
   
   // Add animation class to the moon image after a short delay
@@ -32,15 +275,6 @@ document.addEventListener('DOMContentLoaded', function() {
   // Format dates to be more readable
   const dateElements = document.querySelectorAll('.format-date');
   dateElements.forEach(function(element) {
-    const dateStr = element.textContent;
-    if (dateStr) {
-      try {
-        const date = new Date(dateStr);
-        const options = { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' };
-        element.textContent = date.toLocaleDateString(undefined, options);
-      } catch (e) {
-        console.error('Error formatting date:', e);
-      }
-    }
+    formatDateElement(element, element.textContent);
   });
-});
\ No newline at end of file
+});
@@ -0,0 +1,188 @@
+import json
+import os
+import shutil
+from datetime import date, timedelta
+from typing import Iterator, List, Optional
+
+from flask import Flask
+
+from app.app import render_moon_page
+from app.compression import PRECOMPRESS_EXTENSIONS
+from app.utils.date_utils import get_current_date
+from app.utils.file_utils import atomic_write_bytes, write_gzip_sibling, atomic_symlink
+from app.utils.json_utils import moon_data_to_json
+
+class StaticSiteExporter:
+    """
+    Exporter that renders the moon phase pages for a date range to disk.
+
+    The output tree can be served by a CDN or nginx without Python:
+
+        <output>/static/...                 CSS and JavaScript
+        <output>/images/<file>              Moon images referenced by the pages
+        <output>/YYYY/MM/DD/index.html      Page for one date
+        <output>/YYYY/MM/DD/moon.json       Moon data for one date
+        <output>/today -> YYYY/MM/DD        Pointer to the current date
+
+    Text files get a ``.gz`` sibling for ``gzip_static``-style serving.
+    """
+
+    def __init__(self, app: Flask, output_dir: str):
+        """
+        Initialize the exporter.
+
+        Args:
+            app: Application created by create_app, used for rendering
+            output_dir: Directory to write the static site into
+        """
+        self.app = app
+        self.app_service = app.extensions['app_service']
+        self.output_dir = output_dir
+
+    def export_range(self, start: date, end: date) -> List[str]:
+        """
+        Export the pages for every date from start to end inclusive.
+
+        Args:
+            start: First date to export
+            end: Last date to export
+
+        Returns:
+            list: Paths of the exported page directories
+        """
+        if end < start:
+            raise ValueError("end date must not be before start date")
+
+        self.export_static_assets()
+        return [self.export_date(date_obj) for date_obj in self._iter_dates(start, end)]
+
+    def export_date(self, date_obj: date) -> str:
+        """
+        Export the page, JSON and image for a single date.
+
+        Args:
+            date_obj: The date to export
+
+        Returns:
+            str: Path of the directory holding the date's files
+        """
+        moon_data = self.app_service.get_complete_moon_data(date_obj)
+
+        # Render with a request context so url_for works as it does when serving;
+        # exported pages stay on their date and link into the exported tree
+        with self.app.test_request_context('/'):
+            html = render_moon_page(moon_data, live=False, date_url=self.date_url)
+
+        page_dir = os.path.join(self.output_dir, self.date_path(date_obj))
+        self._write(os.path.join(page_dir, 'index.html'), html.encode('utf-8'))
+        self._write(
+            os.path.join(page_dir, 'moon.json'),
+            json.dumps(moon_data_to_json(moon_data), sort_keys=True).encode('utf-8')
+        )
+
+        self._copy_image(moon_data.get('visualization_path', ''))
+
+        return page_dir
+
+    def export_static_assets(self):
+        """Copy the application's static CSS and JavaScript into the output tree."""
+        static_root = self.app.static_folder
+        for directory, _, filenames in os.walk(static_root):
+            relative_dir = os.path.relpath(directory, static_root)
+
+            # Images are exported on demand by the pages that reference them
+            if relative_dir.split(os.sep)[0] == 'images':
+                continue
+
+            for filename in filenames:
+                if filename.endswith('.gz'):
+                    continue
+                with open(os.path.join(directory, filename), 'rb') as source:
+                    data = source.read()
+                self._write(os.path.join(self.output_dir, 'static', relative_dir, filename), data)
+
+    def update_today_pointer(self, date_obj: Optional[date] = None) -> str:
+        """
+        Atomically point ``<output>/today`` at the page for a date.
+
+        Intended to be run at rollover, e.g. from cron shortly after midnight.
+
+        Args:
+            date_obj: The date to point at (defaults to the current date)
+
+        Returns:
+            str: Path of the ``today`` symlink
+        """
+        if date_obj is None:
+            date_obj = get_current_date()
+
+        target = self.date_path(date_obj)
+        if not os.path.isdir(os.path.join(self.output_dir, target)):
+            raise FileNotFoundError(f"No exported page for {date_obj.isoformat()}")
+
+        return atomic_symlink(target, os.path.join(self.output_dir, 'today'))
+
+    @staticmethod
+    def date_path(date_obj: date) -> str:
+        """
+        Get the date-addressed relative path for a date.
+
+        Args:
+            date_obj: The date
+
+        Returns:
+            str: Relative path in the form YYYY/MM/DD
+        """
+        return os.path.join(date_obj.strftime('%Y'), date_obj.strftime('%m'), date_obj.strftime('%d'))
+
+    @staticmethod
+    def date_url(date_obj: date) -> str:
+        """
+        Get the URL of the exported page for a date, relative to the site root.
+
+        Args:
+            date_obj: The date
+
+        Returns:
+            str: URL in the form /YYYY/MM/DD/
+        """
+        return date_obj.strftime('/%Y/%m/%d/')
+
+    def _copy_image(self, image_path: str):
+        """
+        Copy a moon image into the output tree unless an identical copy exists.
+
+        Images served from the packed archive have no file at image_path and
+        are written from the archive instead.
+        """
+        if not image_path:
+            return
+
+        filename = os.path.basename(image_path)
+        destination = os.path.join(self.output_dir, 'images', filename)
+        archived = None if os.path.exists(image_path) else \
+            self.app_service.image_provider.get_archived_image(filename)
+        size = len(archived[0]) if archived is not None else os.path.getsize(image_path)
+        if os.path.exists(destination) and os.path.getsize(destination) == size:
+            return
+
+        if archived is not None:
+            self._write(destination, bytes(archived[0]))
+            return
+
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copyfile(image_path, destination)
+        if destination.endswith(PRECOMPRESS_EXTENSIONS):
+            write_gzip_sibling(destination)
+
+    def _write(self, path: str, data: bytes):
+        """Write a file atomically along with its pre-compressed sibling."""
+        atomic_write_bytes(path, data)
+        if path.endswith(PRECOMPRESS_EXTENSIONS):
+            write_gzip_sibling(path)
+
+    @staticmethod
+    def _iter_dates(start: date, end: date) -> Iterator[date]:
+        """Yield each date from start to end inclusive."""
+        for offset in range((end - start).days + 1):
+            yield start + timedelta(days=offset)
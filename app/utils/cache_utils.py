@@ -0,0 +1,246 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.utils.file_utils import create_file_once
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded least-recently-used cache.
+
+    The cache is bounded by entry count and, optionally, by the total size of
+    its values as reported by ``sizeof``, so it can hold byte payloads without
+    growing without limit.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = len):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of entries kept
+            max_bytes: Maximum total size of the values, or None for no limit
+            sizeof: Function returning the size of a value, used with max_bytes
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing
+
+        Returns:
+            The cached value or default
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entries if needed.
+
+        Values larger than max_bytes on their own are not stored.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = value
+            self._total_bytes += size
+
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self._total_bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Get a value, computing and storing it on a miss.
+
+        The factory runs outside the lock, so two threads may occasionally
+        compute the same value; the last one stored wins.
+
+        Args:
+            key: Cache key
+            factory: Callable producing the value on a miss
+
+        Returns:
+            The cached or newly created value
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """
+        Get a snapshot of the entries from least to most recently used.
+
+        Returns:
+            list: (key, value) pairs
+        """
+        with self._lock:
+            return list(self._entries.items())
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache usage statistics.
+
+        Returns:
+            dict: Entry count, total value size, hits and misses
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _remove(self, key: Hashable):
+        """Remove an entry; the caller must hold the lock."""
+        value = self._entries.pop(key)
+        if self.max_bytes is not None:
+            self._total_bytes -= self._sizeof(value)
+
+class DiskLRUCache:
+    """
+    Directory of generated files bounded by total size, evicting the least recently used.
+
+    Files are created once with create_file_once, so concurrent processes
+    produce each file a single time. Recency is kept in the files'
+    modification times, so the eviction order survives restarts; each
+    process keeps its own index, and a file evicted by another process is
+    simply produced again.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Initialize a cache over a directory; the directory is scanned on first use.
+
+        Args:
+            directory: Directory holding the cached files
+            max_bytes: Maximum total size of the files
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: Optional[OrderedDict] = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_create(self, name: str, produce: Callable[[], bytes]) -> str:
+        """
+        Get the path of a cached file, producing it on a miss.
+
+        Args:
+            name: File name inside the directory
+            produce: Callable returning the file content
+
+        Returns:
+            str: Path of the file
+        """
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            self._load()
+            if name in self._entries and os.path.exists(path):
+                self._entries.move_to_end(name)
+                _touch(path)
+                return path
+
+        create_file_once(path, produce)
+
+        with self._lock:
+            if name in self._entries:
+                self._total_bytes -= self._entries.pop(name)
+            self._entries[name] = os.path.getsize(path)
+            self._total_bytes += self._entries[name]
+
+            # Keep the newest file even if it alone is over budget
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                try:
+                    os.remove(os.path.join(self.directory, oldest))
+                except FileNotFoundError:
+                    pass
+
+        return path
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache usage statistics.
+
+        Returns:
+            dict: File count and total size
+        """
+        with self._lock:
+            self._load()
+            return {'entries': len(self._entries), 'bytes': self._total_bytes}
+
+    def _load(self):
+        """Index the files already in the directory, oldest first; the caller must hold the lock."""
+        if self._entries is not None:
+            return
+
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        if not os.path.isdir(self.directory):
+            return
+
+        # Hidden names are lock and temporary files of create_file_once
+        files = [entry for entry in os.scandir(self.directory)
+                 if entry.is_file() and not entry.name.startswith('.')]
+        for entry in sorted(files, key=lambda entry: entry.stat().st_mtime):
+            self._entries[entry.name] = entry.stat().st_size
+            self._total_bytes += entry.stat().st_size
+
+def _touch(path: str):
+    """Mark a file as recently used; it may have just been evicted by another process."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
@@ -22,4 +22,25 @@ def format_date(date_obj: date, format_str: str = '%Y-%m-%d') -> str:
     Returns:
         str: The formatted date string
     """
-    return date_obj.strftime(format_str)
\ No newline at end of file
+    return date_obj.strftime(format_str)
+
+def timezone_offset_minutes(timezone_name: str, date_obj: date) -> int:
+    """
+    Get a timezone's offset from UTC on a date.
+    
+    Args:
+        timezone_name: IANA timezone name, e.g. "Europe/London"
+        date_obj: The date, which decides whether daylight saving time applies
+        
+    Returns:
+        int: Minutes east of UTC at noon on the date
+        
+    Raises:
+        ValueError: If the timezone is unknown
+    """
+    try:
+        timezone = pytz.timezone(timezone_name)
+    except pytz.UnknownTimeZoneError:
+        raise ValueError(f"Unknown timezone: {timezone_name}")
+    noon = timezone.localize(datetime(date_obj.year, date_obj.month, date_obj.day, 12))
+    return int(noon.utcoffset().total_seconds() // 60)
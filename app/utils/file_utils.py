@@ -0,0 +1,154 @@
+import gzip
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+def atomic_write_bytes(path: str, data: bytes) -> str:
+    """
+    Write bytes to a file so that readers never see a partial file.
+
+    The data is written to a temporary file in the same directory and then
+    renamed over the destination, which is atomic on POSIX and Windows.
+
+    Args:
+        path: Destination file path
+        data: Bytes to write
+
+    Returns:
+        str: The destination path
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(data)
+        # mkstemp creates owner-only files; published files must be readable by servers
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        # Never leave stray temporary files behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return path
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a lock file, across threads and processes.
+
+    The lock file is created if needed and left in place afterwards;
+    removing it could let two processes lock different files.
+
+    Args:
+        path: Path of the lock file
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def create_file_once(path: str, produce: Callable[[], bytes]) -> bool:
+    """
+    Create a file from produced bytes unless it already exists.
+
+    Concurrent callers for the same path, in any process, wait on a lock
+    file next to it, so only one of them produces the content and the
+    others reuse it. The file is written atomically, so readers never see
+    it partially written.
+
+    Args:
+        path: Destination file path
+        produce: Callable returning the file content, called at most once
+            per path across all callers
+
+    Returns:
+        bool: True if this call created the file
+    """
+    if os.path.exists(path):
+        return False
+
+    directory, filename = os.path.split(path)
+    with file_lock(os.path.join(directory, f".{filename}.lock")):
+        # Another caller may have created it while we waited
+        if os.path.exists(path):
+            return False
+        atomic_write_bytes(path, produce())
+
+    return True
+
+def gzip_bytes(data: bytes, compress_level: int = 9) -> bytes:
+    """
+    Gzip-compress bytes deterministically.
+
+    The gzip header timestamp is fixed so the same input always produces
+    the same output, which keeps ETags and CDN caches stable.
+
+    Args:
+        data: Bytes to compress
+        compress_level: zlib compression level (1-9)
+
+    Returns:
+        bytes: The gzip-compressed data
+    """
+    return gzip.compress(data, compresslevel=compress_level, mtime=0)
+
+def write_gzip_sibling(path: str, compress_level: int = 9) -> str:
+    """
+    Write a pre-compressed ``.gz`` copy next to an existing file.
+
+    Args:
+        path: Path of the file to compress
+        compress_level: zlib compression level (1-9)
+
+    Returns:
+        str: Path of the ``.gz`` file
+    """
+    with open(path, 'rb') as source:
+        data = source.read()
+
+    return atomic_write_bytes(path + '.gz', gzip_bytes(data, compress_level))
+
+def atomic_symlink(target: str, link_path: str) -> str:
+    """
+    Point a symlink at a new target without a moment where it is missing.
+
+    A new link is created under a temporary name and renamed over the
+    existing one, so concurrent readers see either the old or the new target.
+
+    Args:
+        target: What the link should point to (may be relative to the link)
+        link_path: Path of the symlink to create or replace
+
+    Returns:
+        str: The link path
+    """
+    temp_link = f"{link_path}.tmp-{os.getpid()}"
+    if os.path.lexists(temp_link):
+        os.remove(temp_link)
+
+    os.symlink(target, temp_link)
+    os.replace(temp_link, link_path)
+
+    return link_path
@@ -1,6 +1,29 @@
+import functools
+import io
+import time
 import numpy as np
+from urllib.parse import quote
 from PIL import Image, ImageDraw
-from typing import Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Encoder profiles for rendered moon images. The moon is grey on transparency,
+# so grayscale+alpha (LA) or a small palette carries the same picture in far
+# fewer bytes than RGBA. "default" keeps Pillow's defaults for comparison.
+ENCODING_PROFILES: Dict[str, Dict[str, Any]] = {
+    'default': {'format': 'PNG', 'mode': 'RGBA'},
+    'png-fast': {'format': 'PNG', 'mode': 'LA', 'compress_level': 1},
+    'png-la': {'format': 'PNG', 'mode': 'LA', 'compress_level': 9, 'optimize': True},
+    'png-palette': {'format': 'PNG', 'mode': 'P', 'colors': 16, 'compress_level': 9, 'optimize': True},
+    'webp-lossless': {'format': 'WEBP', 'mode': 'RGBA', 'lossless': True, 'quality': 80, 'method': 4},
+    'webp-lossy': {'format': 'WEBP', 'mode': 'RGBA', 'quality': 80, 'method': 4},
+}
+
+# File extension for each encoder format
+FORMAT_EXTENSIONS = {'PNG': 'png', 'WEBP': 'webp'}
+
+# SVG drawing constants, in viewBox units (the viewBox is 100 x 100)
+SVG_CENTER = 50.0
+SVG_RADIUS = 49.5
 
 def create_circular_mask(h: int, w: int, center: Optional[Tuple[int, int]] = None, 
                          radius: Optional[int] = None) -> np.ndarray:
@@ -86,4 +109,239 @@ def apply_phase_to_image(image: Image.Image, illumination_percent: float,
     if illumination_percent <= 1.0:
         draw.ellipse((0, 0, width, height), fill='black')
     
-    return result
\ No newline at end of file
+    return result
+
+def quantize_illumination(illumination_percent: float, step: float = 1.0) -> float:
+    """
+    Round an illumination percentage to a fixed step so renders can be cached.
+    
+    Args:
+        illumination_percent: Percentage of the moon that is illuminated (0-100)
+        step: Quantization step in percent
+        
+    Returns:
+        float: Illumination clamped to 0-100 and rounded to the step
+    """
+    clamped = min(100.0, max(0.0, illumination_percent))
+    return round(round(clamped / step) * step, 6)
+
+def render_phase_svg(illumination_percent: float, phase_angle: float, size: int = 400,
+                     step: float = 1.0) -> str:
+    """
+    Render a moon phase as a small, resolution-independent SVG document.
+    
+    The lit part is drawn as one path made of the limb semicircle and the
+    terminator, which is the semi-ellipse an orthographic view of the lit
+    hemisphere projects to. Its half-width is r * |1 - 2k| for an
+    illuminated fraction k, so the shape is exact for any phase.
+    
+    Args:
+        illumination_percent: Percentage of the moon that is illuminated (0-100)
+        phase_angle: The phase angle in degrees (0-360), used for waxing/waning
+        size: Width and height attributes of the SVG element in pixels
+        step: Illumination quantization step, which bounds the number of
+            distinct documents that are cached
+        
+    Returns:
+        str: SVG markup
+    """
+    waning = phase_angle > 180.0
+    return _render_phase_svg(quantize_illumination(illumination_percent, step), waning, size)
+
+@functools.lru_cache(maxsize=512)
+def _render_phase_svg(illumination_percent: float, waning: bool, size: int) -> str:
+    """Render the SVG for an already quantized illumination."""
+    cx, r = SVG_CENTER, SVG_RADIUS
+    top, bottom = cx - r, cx + r
+    fraction = illumination_percent / 100.0
+    
+    parts = [
+        f"<svg xmlns='http://www.w3.org/2000/svg' width='{size}' height='{size}' viewBox='0 0 100 100'>",
+        f"<circle cx='{cx:g}' cy='{cx:g}' r='{r:g}' fill='black' stroke='lightgray' stroke-width='0.5'/>",
+    ]
+    
+    if fraction >= 0.995:
+        parts.append(f"<circle cx='{cx:g}' cy='{cx:g}' r='{r:g}' fill='white' stroke='lightgray' stroke-width='0.5'/>")
+    elif fraction > 0.005:
+        # Signed offset of the terminator from the centre line, towards the lit limb
+        offset = r * (1.0 - 2.0 * fraction)
+        
+        # The lit limb is on the right while waxing and on the left while waning.
+        # Sweep flags pick the side each arc bulges towards (1 = clockwise on screen).
+        limb_sweep = 0 if waning else 1
+        terminator_sweep = limb_sweep if offset <= 0 else 1 - limb_sweep
+        
+        path = (f"M{cx:g} {top:g}"
+                f"A{r:g} {r:g} 0 0 {limb_sweep} {cx:g} {bottom:g}"
+                f"A{abs(offset):.2f} {r:g} 0 0 {terminator_sweep} {cx:g} {top:g}Z")
+        parts.append(f"<path d='{path}' fill='white'/>")
+    
+    parts.append("</svg>")
+    return "".join(parts)
+
+def render_phase_tile(illumination_percent: float, phase_angle: float, full_size: int,
+                      left: int, top: int, tile_size: int = 256) -> Image.Image:
+    """
+    Render one square tile of a moon image of any resolution.
+    
+    Each pixel is shaded from the analytic terminator used by
+    render_phase_svg: on a disc of radius r the lit part is bounded by the
+    limb and by the semi-ellipse of half-width r * |1 - 2k| for an
+    illuminated fraction k. Only the tile is computed, so memory depends on
+    tile_size and not on full_size. Edges are antialiased over one pixel.
+    
+    Args:
+        illumination_percent: Percentage of the moon that is illuminated (0-100)
+        phase_angle: The phase angle in degrees (0-360), used for waxing/waning
+        full_size: Width and height of the whole moon image in pixels
+        left: Horizontal position of the tile in the whole image, in pixels
+        top: Vertical position of the tile in the whole image, in pixels
+        tile_size: Width and height of the tile in pixels
+        
+    Returns:
+        Image: The RGBA tile, transparent outside the disc
+    """
+    radius = full_size / 2.0
+    fraction = illumination_percent / 100.0
+    
+    # Pixel centres in units of the radius, relative to the centre of the disc
+    u = (np.arange(left, left + tile_size, dtype=np.float32) + 0.5 - radius) / radius
+    v = (np.arange(top, top + tile_size, dtype=np.float32) + 0.5 - radius) / radius
+    if phase_angle > 180.0:
+        u = -u  # The lit limb is on the left while waning
+    
+    # Distances in pixels inside the limb and on the lit side of the terminator
+    chord = np.sqrt(np.clip(1.0 - v * v, 0.0, None))[:, np.newaxis]
+    inside_limb = (1.0 - np.sqrt(u[np.newaxis, :] ** 2 + (v * v)[:, np.newaxis])) * radius
+    lit_side = (u[np.newaxis, :] - (1.0 - 2.0 * fraction) * chord) * radius
+    
+    alpha = np.clip(inside_limb + 0.5, 0.0, 1.0)
+    light = np.clip(lit_side + 0.5, 0.0, 1.0)
+    if fraction >= 0.995:
+        light = np.ones_like(light)
+    elif fraction <= 0.005:
+        light = np.zeros_like(light)
+    
+    grey = (light * 255.0 + 0.5).astype(np.uint8)
+    pixels = np.dstack((grey, grey, grey, (alpha * 255.0 + 0.5).astype(np.uint8)))
+    return Image.fromarray(pixels, 'RGBA')
+
+def svg_to_data_uri(svg: str) -> str:
+    """
+    Encode SVG markup as a data URI for use in an img src attribute.
+    
+    Percent-encoding keeps the URI smaller than base64 for SVG text.
+    
+    Args:
+        svg: SVG markup
+        
+    Returns:
+        str: data:image/svg+xml URI
+    """
+    return "data:image/svg+xml;charset=utf-8," + quote(svg, safe=" =':/.,-")
+
+@functools.lru_cache(maxsize=512)
+def svg_file_to_data_uri(path: str) -> str:
+    """
+    Read an SVG file and encode it as a data URI.
+    
+    Rendered SVG files are named after their quantized phase and never
+    change, so the result is cached by path.
+    
+    Args:
+        path: Path to the SVG file
+        
+    Returns:
+        str: data:image/svg+xml URI
+    """
+    with open(path, encoding='utf-8') as svg_file:
+        return svg_to_data_uri(svg_file.read())
+
+def get_encoding_profile(name: str) -> Dict[str, Any]:
+    """
+    Look up an encoder profile by name.
+    
+    Args:
+        name: Profile name, one of ENCODING_PROFILES
+        
+    Returns:
+        dict: The profile settings
+        
+    Raises:
+        ValueError: If the profile does not exist
+    """
+    if name not in ENCODING_PROFILES:
+        raise ValueError(f"Unknown image encoding profile: {name}")
+    return ENCODING_PROFILES[name]
+
+def profile_extension(name: str) -> str:
+    """
+    Get the file extension produced by an encoder profile.
+    
+    Args:
+        name: Profile name
+        
+    Returns:
+        str: Extension without the dot, e.g. "png"
+    """
+    return FORMAT_EXTENSIONS[get_encoding_profile(name)['format']]
+
+def encode_image(image: Image.Image, profile: str = 'default') -> bytes:
+    """
+    Encode an image with the settings of an encoder profile.
+    
+    Args:
+        image: The image to encode (typically RGBA)
+        profile: Profile name, one of ENCODING_PROFILES
+        
+    Returns:
+        bytes: The encoded image
+    """
+    settings = dict(get_encoding_profile(profile))
+    image_format = settings.pop('format')
+    mode = settings.pop('mode')
+    colors = settings.pop('colors', 256)
+    
+    if mode == 'P':
+        # Fast octree quantization keeps the alpha channel as palette transparency
+        converted = image.convert('RGBA').quantize(colors=colors, method=Image.Quantize.FASTOCTREE)
+    else:
+        converted = image.convert(mode)
+    
+    buffer = io.BytesIO()
+    converted.save(buffer, format=image_format, **settings)
+    return buffer.getvalue()
+
+def measure_encoding_profiles(images: Iterable[Image.Image],
+                              profiles: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Measure encoded size and encode time of each profile over a set of images.
+    
+    Args:
+        images: Images to encode, e.g. one per phase
+        profiles: Profile names to measure (defaults to all profiles)
+        
+    Returns:
+        list: One dict per profile with total and mean bytes and milliseconds
+    """
+    images = list(images)
+    profiles = list(profiles or ENCODING_PROFILES)
+    results = []
+    
+    for profile in profiles:
+        total_bytes = 0
+        start = time.perf_counter()
+        for image in images:
+            total_bytes += len(encode_image(image, profile))
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        
+        results.append({
+            'profile': profile,
+            'images': len(images),
+            'total_bytes': total_bytes,
+            'mean_bytes': total_bytes / len(images) if images else 0.0,
+            'total_ms': elapsed_ms,
+            'mean_ms': elapsed_ms / len(images) if images else 0.0,
+        })
+    
+    return results
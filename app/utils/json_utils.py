@@ -0,0 +1,27 @@
+import os
+from datetime import date
+from typing import Dict, Any
+
+def moon_data_to_json(moon_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert complete moon data into a JSON-serializable dictionary.
+
+    Dates become ISO 8601 strings and the server-side visualization path
+    is reduced to the image filename, which is all a client can use.
+
+    Args:
+        moon_data: Complete moon data as returned by AppService.get_complete_moon_data
+
+    Returns:
+        dict: Dictionary safe to pass to json.dumps or flask.jsonify
+    """
+    result = {}
+    for key, value in moon_data.items():
+        if key == 'visualization_path':
+            result['image_filename'] = os.path.basename(value) if value else None
+        elif isinstance(value, date):
+            result[key] = value.isoformat()
+        else:
+            result[key] = value
+
+    return result
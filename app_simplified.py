@@ -3,10 +3,12 @@ Simplified Moon Phase App that doesn't require complex dependencies.
 This standalone script shows the current moon phase using pre-calculated data.
 """
 
-from flask import Flask, render_template_string
+from flask import Flask
 from datetime import datetime, timedelta
 import math
 
+from kiosk_page import DailyPageCache
+
 app = Flask(__name__)
 
 # HTML template for the app
@@ -239,11 +241,13 @@ def calculate_moon_phase():
         'current_year': current_date.year
     }
 
+# The page only changes with the date: compile the template once and cache the HTML per day
+page_cache = DailyPageCache(app, TEMPLATE, calculate_moon_phase)
+
 @app.route('/')
 def index():
     """Render the main page with moon phase visualization."""
-    moon_data = calculate_moon_phase()
-    return render_template_string(TEMPLATE, **moon_data)
+    return page_cache.make_response()
 
 if __name__ == '__main__':
     print("Starting Moon Phase Visualization App...")
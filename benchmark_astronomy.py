@@ -0,0 +1,93 @@
+"""
+Script to benchmark the per-call cost of AstronomyAdapter.get_phase_state.
+Compares the adapter against the previous approach of building a fresh
+Observer, Moon and three Sun objects per call.
+
+Example:
+    python benchmark_astronomy.py --calls 2000 --json
+"""
+
+import argparse
+import json
+import math
+import time
+from datetime import date, timedelta
+
+import ephem
+
+from app.adapters.astronomy_adapter import AstronomyAdapter
+
+def fresh_objects_phase_state(date_obj: date, time_str: str = '22:00:00') -> float:
+    """
+    Compute the phase the way the adapter used to, for comparison.
+
+    A new Observer and Moon are built per call, the Sun is constructed three
+    times, and the angle comes from the law of cosines plus an RA comparison.
+
+    Args:
+        date_obj: The date to compute
+        time_str: The time of day as "HH:MM:SS"
+
+    Returns:
+        float: Phase angle in degrees
+    """
+    observer = ephem.Observer()
+    observer.date = ephem.Date(f"{date_obj.strftime('%Y/%m/%d')} {time_str}")
+    observer.pressure = 0
+    moon = ephem.Moon(observer)
+
+    earth_to_moon = moon.earth_distance
+    earth_to_sun = ephem.Sun(observer).earth_distance
+    moon_to_sun = ephem.separation(moon, ephem.Sun(observer))
+    try:
+        cos_angle = (earth_to_moon ** 2 + earth_to_sun ** 2 - 2 * earth_to_moon * earth_to_sun
+                     * math.cos(moon_to_sun)) / (2 * earth_to_moon * earth_to_sun)
+        angle = math.degrees(math.acos(cos_angle))
+        waxing = (ephem.Sun(observer).ra - moon.ra) % (2 * math.pi) < math.pi
+        return angle if waxing else 360.0 - angle
+    except ValueError:
+        return moon.phase * 3.6
+
+def time_per_call(function, dates, repeats: int = 3) -> float:
+    """Return the best mean wall time per call over several runs, in microseconds."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for date_obj in dates:
+            function(date_obj)
+        best = min(best, time.perf_counter() - start)
+    return best / len(dates) * 1e6
+
+def main(argv=None):
+    """Time both approaches over consecutive days."""
+    parser = argparse.ArgumentParser(description="Benchmark moon phase calculations.")
+    parser.add_argument('--calls', type=int, default=2000, help="Number of calls per approach")
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    dates = [date(2024, 1, 1) + timedelta(days=i) for i in range(args.calls)]
+    adapter = AstronomyAdapter()
+
+    # Warm up both paths so one-time allocations are not measured
+    fresh_objects_phase_state(dates[0])
+    adapter.get_phase_state(dates[0])
+
+    fresh_us = time_per_call(fresh_objects_phase_state, dates)
+    adapter_us = time_per_call(adapter.get_phase_state, dates)
+    results = {
+        'calls': args.calls,
+        'fresh_objects_us': round(fresh_us, 2),
+        'adapter_us': round(adapter_us, 2),
+        'speedup': round(fresh_us / adapter_us, 2),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"fresh objects per call: {results['fresh_objects_us']:>8.2f} us")
+    print(f"reused observer/bodies: {results['adapter_us']:>8.2f} us")
+    print(f"speedup:                {results['speedup']:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
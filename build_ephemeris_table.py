@@ -0,0 +1,29 @@
+"""
+Script to precompute moon positions and phase dates into a shared table.
+Run it once per host and point EPHEMERIS_TABLE_PATH at the output file; every
+worker process maps the same file read-only.
+
+Example:
+    python build_ephemeris_table.py --output /dev/shm/moon_ephemeris.tbl --days 400
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from app.ephemeris_table import build_ephemeris_table
+
+def main(argv=None):
+    """Build the ephemeris table for the requested date range."""
+    parser = argparse.ArgumentParser(description="Precompute a shared moon ephemeris table.")
+    parser.add_argument('--output', default='/dev/shm/moon_ephemeris.tbl', help="Table file to write")
+    parser.add_argument('--start', type=date.fromisoformat,
+                        default=date.today() - timedelta(days=31), help="First day (YYYY-MM-DD)")
+    parser.add_argument('--days', type=int, default=400, help="Number of days to sample")
+    parser.add_argument('--step-hours', type=float, default=1.0, help="Hours between samples")
+    args = parser.parse_args(argv)
+
+    count = build_ephemeris_table(args.output, args.start, args.days, args.step_hours)
+    print(f"Wrote {count} samples to {args.output}")
+
+if __name__ == "__main__":
+    main()
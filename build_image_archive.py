@@ -0,0 +1,60 @@
+"""
+Script to pack moon images into a single memory-mapped archive.
+Serve it by pointing IMAGE_ARCHIVE_PATH at the output file.
+
+Example:
+    python build_image_archive.py --output moon_images.pak --render-phases
+"""
+
+import argparse
+import os
+
+from app.image_archive import build_image_archive, iter_directory_images
+from app.image_provider import ImageProvider
+from app.utils.image_utils import render_phase_svg, encode_image, profile_extension, ENCODING_PROFILES
+
+def iter_rendered_phases(provider: ImageProvider, include_svg: bool):
+    """
+    Render every quantized phase in memory, without writing loose files.
+
+    Args:
+        provider: Image provider used for rendering, with its encoding profile
+        include_svg: Whether to include SVG renderings as well
+
+    Yields:
+        tuple: (entry name, encoded bytes)
+    """
+    for illumination in range(0, 101):
+        for phase_angle in (90.0, 270.0):  # waxing and waning
+            image = provider.render_moon_image(illumination, phase_angle)
+            extension = profile_extension(provider.encoding_profile)
+            yield (provider.phase_image_name(illumination, phase_angle, extension),
+                   encode_image(image, provider.encoding_profile))
+
+            if include_svg:
+                svg = render_phase_svg(illumination, phase_angle)
+                yield provider.phase_image_name(illumination, phase_angle, "svg"), svg.encode('utf-8')
+
+def main(argv=None):
+    """Build the archive from the images directory and optional phase renderings."""
+    parser = argparse.ArgumentParser(description="Pack moon images into an archive.")
+    parser.add_argument('--output', default='moon_images.pak', help="Archive file to write")
+    parser.add_argument('--source', default=os.path.join('app', 'static', 'images'),
+                        help="Directory of images to include")
+    parser.add_argument('--render-phases', action='store_true',
+                        help="Also render an image for every whole-percent phase")
+    parser.add_argument('--profile', default='default', choices=sorted(ENCODING_PROFILES),
+                        help="Encoder profile for rendered phases")
+    parser.add_argument('--svg', action='store_true', help="Include SVG renderings with --render-phases")
+    args = parser.parse_args(argv)
+
+    def entries():
+        yield from iter_directory_images(args.source)
+        if args.render_phases:
+            yield from iter_rendered_phases(ImageProvider(base_path=args.source, encoding_profile=args.profile), args.svg)
+
+    count = build_image_archive(args.output, entries())
+    print(f"Packed {count} images into {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Script to precompute the level 0 overview tile of every moon phase.
+Run it once per deployment so the first view of any phase is served from disk.
+
+Example:
+    python build_moon_tiles.py --profile png-la
+"""
+
+import argparse
+import os
+
+from app.image_provider import ImageProvider
+from app.utils.image_utils import ENCODING_PROFILES
+
+def main(argv=None):
+    """Render the missing overview tiles."""
+    parser = argparse.ArgumentParser(description="Precompute deep-zoom overview tiles.")
+    parser.add_argument('--images-dir', default=os.path.join('app', 'static', 'images'),
+                        help="Images directory of the app")
+    parser.add_argument('--profile', default='default', choices=sorted(ENCODING_PROFILES),
+                        help="Encoder profile, matching IMAGE_ENCODING_PROFILE")
+    args = parser.parse_args(argv)
+
+    provider = ImageProvider(base_path=args.images_dir, encoding_profile=args.profile)
+    count = provider.precompute_tile_overviews()
+    print(f"{count} overview tiles in {os.path.join(args.images_dir, 'tiles', 'overview')}")
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,22 @@ Script to generate sample moon phase images.
 This helps ensure we have images for all phases even if the app hasn't generated them yet.
 """
 
+import argparse
 import os
 from PIL import Image, ImageDraw
-from app.utils.image_utils import apply_phase_to_image
+from app.utils.image_utils import apply_phase_to_image, encode_image, profile_extension, ENCODING_PROFILES
 
-def create_sample_moon_images():
-    """Create sample moon images for all phases."""
+def create_sample_moon_images(profile: str = 'default'):
+    """
+    Create sample moon images for all phases.
+    
+    Args:
+        profile: PNG encoder profile from ENCODING_PROFILES
+    """
+    # The phase image names are fixed, so only PNG profiles can be used here
+    if profile_extension(profile) != 'png':
+        raise ValueError(f"Sample images must be PNG; profile {profile} is not")
+    
     # Ensure the images directory exists
     images_dir = os.path.join('app', 'static', 'images')
     os.makedirs(images_dir, exist_ok=True)
@@ -40,10 +50,15 @@ def create_sample_moon_images():
         # Apply phase effects
         result = apply_phase_to_image(image, illumination, phase_angle)
         
-        # Save the result
+        # Save the result with the chosen encoder settings
         output_path = os.path.join(images_dir, filename)
-        result.save(output_path)
+        with open(output_path, 'wb') as output_file:
+            output_file.write(encode_image(result, profile))
         print(f"Created {output_path}")
 
 if __name__ == "__main__":
-    create_sample_moon_images()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate sample moon phase images.")
+    png_profiles = sorted(name for name in ENCODING_PROFILES if profile_extension(name) == 'png')
+    parser.add_argument('--profile', default='default', choices=png_profiles,
+                        help="Encoder profile (see measure_image_profiles.py)")
+    create_sample_moon_images(parser.parse_args().profile)
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+Script to export the moon phase pages for a date range as a static site.
+The output can be served by a CDN or nginx without running Python.
+
+Examples:
+    python export_static_site.py --output site --days 30
+    python export_static_site.py --output site --update-today
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from app.app import create_app
+from app.static_export import StaticSiteExporter
+from app.utils.date_utils import get_current_date
+
+def parse_args(argv=None):
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description="Export moon phase pages as a static site.")
+    parser.add_argument('--output', required=True, help="Directory to write the site into")
+    parser.add_argument('--start', type=date.fromisoformat, default=None,
+                        help="First date to export (YYYY-MM-DD, defaults to today)")
+    parser.add_argument('--days', type=int, default=7, help="Number of dates to export")
+    parser.add_argument('--update-today', action='store_true',
+                        help="Only swap the 'today' pointer to the current date")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Export the requested date range and point 'today' at the current date."""
+    args = parse_args(argv)
+    exporter = StaticSiteExporter(create_app(), args.output)
+    today = get_current_date()
+
+    if not args.update_today:
+        start = args.start or today
+        for page_dir in exporter.export_range(start, start + timedelta(days=args.days - 1)):
+            print(f"Exported {page_dir}")
+
+    link = exporter.update_today_pointer(today)
+    print(f"Pointed {link} at {today.isoformat()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Shared page caching for the standalone moon pages (moon_simple.py and app_simplified.py).
+The template is compiled once, and the rendered page is kept until the local date changes.
+"""
+
+import hashlib
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Flask, Response, request
+
+class DailyPageCache:
+    """
+    Cache of a page whose content only changes when the date changes.
+
+    The Jinja template is compiled once at startup. The full HTML and its
+    ETag are cached for the current date, so repeated requests from
+    always-on displays cost a date comparison, and revalidations are
+    answered with 304 Not Modified.
+    """
+
+    def __init__(self, app: Flask, template_source: str,
+                 context_factory: Callable[[], Dict[str, Any]],
+                 today: Callable[[], date] = date.today):
+        """
+        Compile the template and prepare an empty cache.
+
+        Args:
+            app: Flask application whose Jinja environment compiles the template
+            template_source: Jinja template source
+            context_factory: Callable returning the template variables for today
+            today: Callable returning the current local date
+        """
+        self.template = app.jinja_env.from_string(template_source)
+        self.context_factory = context_factory
+        self.today = today
+        self._page: Optional[Tuple[date, bytes, str]] = None
+        self._lock = threading.Lock()
+
+    def get_page(self) -> Tuple[bytes, str]:
+        """
+        Get today's page, rendering it only on the first request of the day.
+
+        Returns:
+            tuple: (HTML as UTF-8 bytes, ETag)
+        """
+        current_date = self.today()
+        page = self._page
+        if page is not None and page[0] == current_date:
+            return page[1], page[2]
+
+        with self._lock:
+            # Another thread may have rendered the page while we waited
+            page = self._page
+            if page is None or page[0] != current_date:
+                html = self.template.render(**self.context_factory()).encode('utf-8')
+                etag = hashlib.sha1(html).hexdigest()
+                page = (current_date, html, etag)
+                self._page = page
+
+        return page[1], page[2]
+
+    def make_response(self) -> Response:
+        """
+        Build the response for the current request.
+
+        Returns:
+            Response: 200 with the cached page, or 304 if the client's copy is current
+        """
+        html, etag = self.get_page()
+
+        response = Response(html, mimetype='text/html')
+        response.set_etag(etag)
+
+        # Let browsers reuse the page until midnight, then revalidate
+        response.cache_control.public = True
+        response.cache_control.max_age = seconds_until_midnight()
+
+        return response.make_conditional(request)
+
+def seconds_until_midnight(now: Optional[datetime] = None) -> int:
+    """
+    Get the number of seconds until the next local midnight.
+
+    Args:
+        now: The current local time (defaults to datetime.now())
+
+    Returns:
+        int: Seconds until midnight, at least 1
+    """
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max(1, int((midnight - now).total_seconds()))
@@ -0,0 +1,50 @@
+"""
+Script to load-test the application and report latency percentiles as JSON.
+By default the app is started in a local server process; use --url to test
+a running deployment instead.
+
+Example:
+    python load_test.py --duration 30 --cold-duration 5 --concurrency 16
+    python load_test.py --rate 200 --mix 8:/ 2:/images/full_moon.png --output report.json
+"""
+
+import argparse
+import json
+
+from app.load_testing import DEFAULT_MIX, LocalServer, parse_mix, run_load_test
+
+def main(argv=None):
+    """Run the load test and print or save the JSON report."""
+    parser = argparse.ArgumentParser(description="Load-test the moon phase application.")
+    parser.add_argument('--url', help="Base URL of a running server (default: start one locally)")
+    parser.add_argument('--mix', nargs='+', metavar='WEIGHT:PATH',
+                        help="Weighted paths to request, e.g. 6:/ 3:/images/full_moon.png")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds of warm load")
+    parser.add_argument('--cold-duration', type=float, default=0.0,
+                        help="Seconds of load measured first, while caches are cold")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="Workers (closed loop) or maximum requests in flight (open loop)")
+    parser.add_argument('--rate', type=float, help="Fixed arrival rate in requests per second")
+    parser.add_argument('--seed', type=int, help="Seed for a reproducible request sequence")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    options = dict(mix=mix, duration_s=args.duration, cold_duration_s=args.cold_duration,
+                   concurrency=args.concurrency, rate=args.rate, seed=args.seed)
+
+    if args.url:
+        report = run_load_test(args.url, **options)
+    else:
+        with LocalServer(test_config={'DEBUG': False}) as server:
+            report = run_load_test(server.url, **options)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            report_file.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Script to compare image encoder profiles across the phase set.
+Reports bytes and encode time per profile so each deployment can pick its
+trade-off and set IMAGE_ENCODING_PROFILE accordingly.
+
+Example:
+    python measure_image_profiles.py --step 5 --json
+"""
+
+import argparse
+import json
+import tempfile
+
+from app.image_provider import ImageProvider
+from app.utils.image_utils import measure_encoding_profiles, ENCODING_PROFILES
+
+def main(argv=None):
+    """Render the phase set once and measure every requested profile on it."""
+    parser = argparse.ArgumentParser(description="Measure image encoder profiles.")
+    parser.add_argument('--step', type=int, default=5, help="Illumination step between phases, in percent")
+    parser.add_argument('--size', type=int, default=400, help="Image size in pixels")
+    parser.add_argument('--profiles', nargs='+', default=sorted(ENCODING_PROFILES),
+                        choices=sorted(ENCODING_PROFILES), help="Profiles to measure")
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        provider = ImageProvider(base_path=scratch)
+        images = [provider.render_moon_image(illumination, phase_angle, args.size)
+                  for illumination in range(0, 101, args.step)
+                  for phase_angle in (90.0, 270.0)]
+
+    results = measure_encoding_profiles(images, args.profiles)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'profile':<16}{'mean bytes':>12}{'total bytes':>14}{'mean ms':>10}")
+    for result in sorted(results, key=lambda r: r['total_bytes']):
+        print(f"{result['profile']:<16}{result['mean_bytes']:>12.0f}"
+              f"{result['total_bytes']:>14}{result['mean_ms']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,12 @@ Minimalist Moon Phase Visualization
 Shows only the moon on a black background as it appears in the night sky
 """
 
-from flask import Flask, render_template_string
+from flask import Flask
 from datetime import datetime
 import math
 
+from kiosk_page import DailyPageCache
+
 app = Flask(__name__)
 
 # Minimalist HTML template
@@ -128,11 +130,13 @@ def calculate_moon_phase():
         'shadow_style': shadow_style
     }
 
+# The page only changes with the date: compile the template once and cache the HTML per day
+page_cache = DailyPageCache(app, TEMPLATE, calculate_moon_phase)
+
 @app.route('/')
 def index():
     """Render the moon visualization."""
-    moon_data = calculate_moon_phase()
-    return render_template_string(TEMPLATE, **moon_data)
+    return page_cache.make_response()
 
 if __name__ == '__main__':
     print("Starting Minimalist Moon Visualization...")
@@ -0,0 +1,24 @@
+"""
+Script to build pre-compressed .gz siblings of the static assets.
+Run it as part of a deploy so compressed files are served without gzipping per request.
+"""
+
+import argparse
+import os
+
+from app.compression import precompress_directory, PRECOMPRESS_EXTENSIONS
+
+def main(argv=None):
+    """Write .gz siblings for every compressible file in the static folder."""
+    parser = argparse.ArgumentParser(description="Pre-compress static assets.")
+    parser.add_argument('--directory', default=os.path.join('app', 'static'),
+                        help="Directory to walk (defaults to app/static)")
+    parser.add_argument('--min-size', type=int, default=256,
+                        help="Skip files smaller than this many bytes")
+    args = parser.parse_args(argv)
+
+    for path in precompress_directory(args.directory, PRECOMPRESS_EXTENSIONS, args.min_size):
+        print(f"Created {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Script to profile the memory used by each stage of computing moon data.
+Computes complete moon data for consecutive days without caching, traced by
+tracemalloc, and prints the per-stage peaks and the top allocation sites.
+
+Example:
+    python profile_memory.py --days 365 --limit 15 --json
+"""
+
+import argparse
+import json
+import os
+from datetime import date, timedelta
+
+from app.app_service import AppService
+from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.image_provider import ImageProvider
+from app.memory_profiler import MemoryProfiler
+from app.moon_calculator import MoonCalculator
+
+def main(argv=None):
+    """Profile complete moon data for a range of days."""
+    parser = argparse.ArgumentParser(description="Profile memory per moon data stage.")
+    parser.add_argument('--start', type=date.fromisoformat, default=date(2024, 1, 1),
+                        help="First date (YYYY-MM-DD)")
+    parser.add_argument('--days', type=int, default=100, help="Number of consecutive days")
+    parser.add_argument('--images-dir', default=os.path.join('app', 'static', 'images'),
+                        help="Directory of moon images used and written by the image provider")
+    parser.add_argument('--image-format', default='png', choices=ImageProvider.IMAGE_FORMATS)
+    parser.add_argument('--limit', type=int, default=10, help="Number of allocation sites to list")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    profiler = MemoryProfiler()
+    service = AppService(
+        moon_calculator=MoonCalculator(astronomy_adapter=AstronomyAdapter()),
+        image_provider=ImageProvider(base_path=args.images_dir, image_format=args.image_format),
+        profiler=profiler
+    )
+
+    profiler.start()
+    try:
+        for offset in range(args.days):
+            service.get_complete_moon_data(args.start + timedelta(days=offset))
+        report = profiler.report(args.limit)
+    finally:
+        profiler.stop()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"traced: {report['traced']['current_bytes']} bytes now, {report['traced']['peak_bytes']} peak")
+    print(f"{'stage':<12}{'calls':>8}{'net bytes':>14}{'peak bytes':>14}")
+    for name, stats in report['stages'].items():
+        print(f"{name:<12}{stats['calls']:>8}{stats['net_bytes']:>14}{stats['peak_bytes']:>14}")
+    print()
+    print("top allocation sites:")
+    for site in report['top_allocations']:
+        print(f"{site['size_bytes']:>12} bytes {site['count']:>7} blocks  {site['site']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import pytest
+import io
+import numpy as np
+from datetime import date
+from unittest.mock import patch
+from PIL import Image
+from app.app import create_app
+from app.animation import AnimationService, ANIMATION_MIMETYPES
+from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.image_provider import ImageProvider
+from app.moon_calculator import MoonCalculator
+from app.utils.cache_utils import LRUCache
+
+@pytest.fixture
+def service(tmp_path):
+    """Create an animation service rendering into a temporary directory."""
+    return AnimationService(
+        moon_calculator=MoonCalculator(astronomy_adapter=AstronomyAdapter()),
+        image_provider=ImageProvider(base_path=str(tmp_path))
+    )
+
+@pytest.fixture
+def client():
+    """Create a test client for the Flask app."""
+    app = create_app(test_config={'TESTING': True})
+    with app.test_client() as client:
+        yield client
+
+class TestAnimationService:
+    """Tests for the streaming animation encoders and their cache."""
+
+    @pytest.mark.parametrize('image_format', sorted(ANIMATION_MIMETYPES))
+    def test_animation_decodes_with_one_frame_per_day(self, service, image_format):
+        """Test that every format produces a valid animation with all frames."""
+        # Act
+        cached, chunks = service.get_animation(date(2024, 1, 1), 8, 64, image_format)
+        data = b''.join(chunks)
+
+        # Assert
+        assert cached is None
+        image = Image.open(io.BytesIO(data))
+        assert image.n_frames == 8
+        assert image.size == (64, 64)
+        image.seek(7)
+        image.load()
+
+    def test_frames_follow_the_phase(self, service):
+        """Test that a full moon frame is brighter than a new moon frame."""
+        # Arrange: 2024-01-11 is a new moon, 2024-01-25 a full moon
+        data = b''.join(service.get_animation(date(2024, 1, 11), 15, 64, 'apng')[1])
+        image = Image.open(io.BytesIO(data))
+
+        # Act
+        new_moon = int(np.asarray(image.convert('L')).sum())
+        image.seek(14)
+        full_moon = int(np.asarray(image.convert('L')).sum())
+
+        # Assert
+        assert full_moon > new_moon * 2
+
+    def test_completed_stream_is_cached(self, service):
+        """Test that a fully consumed stream is served from the cache next time."""
+        # Arrange
+        data = b''.join(service.get_animation(date(2024, 1, 1), 3, 64, 'gif')[1])
+
+        # Act
+        cached, chunks = service.get_animation(date(2024, 1, 1), 3, 70, 'gif')
+
+        # Assert
+        assert cached == data
+        assert chunks is None
+
+    def test_oversized_animation_is_not_cached(self, tmp_path):
+        """Test that animations larger than the cache budget are only streamed."""
+        # Arrange
+        service = AnimationService(
+            moon_calculator=MoonCalculator(astronomy_adapter=AstronomyAdapter()),
+            image_provider=ImageProvider(base_path=str(tmp_path)),
+            cache=LRUCache(max_bytes=100)
+        )
+
+        # Act
+        b''.join(service.get_animation(date(2024, 1, 1), 3, 64, 'gif')[1])
+
+        # Assert
+        assert len(service.cache) == 0
+
+    def test_sizes_are_quantized(self, service):
+        """Test that requested sizes snap to the supported sizes."""
+        assert service.quantize_size(10) == 64
+        assert service.quantize_size(150) == 128
+        assert service.quantize_size(1000) == 256
+
+    def test_etag_changes_with_engine_and_renderer(self, service):
+        """Test that animations are revalidated after an engine or renderer change."""
+        # Arrange
+        etag = service.etag(date(2024, 1, 1), 2, 64, 'gif')
+
+        # Act
+        with patch('app.animation.ENGINE_VERSION', 'next'):
+            engine_etag = service.etag(date(2024, 1, 1), 2, 64, 'gif')
+        with patch('app.animation.RENDERER_VERSION', 'next'):
+            renderer_etag = service.etag(date(2024, 1, 1), 2, 64, 'gif')
+
+        # Assert
+        assert len({etag, engine_etag, renderer_etag}) == 3
+
+class TestAnimationRoute:
+    """Tests for the /animation endpoint."""
+
+    def test_animation_route_streams_image(self, client):
+        """Test that the endpoint returns an animation with an ETag."""
+        # Act
+        response = client.get('/animation?start=2024-01-01&days=4&size=64&format=webp')
+
+        # Assert
+        assert response.status_code == 200
+        assert response.mimetype == 'image/webp'
+        assert response.headers['ETag']
+        assert Image.open(io.BytesIO(response.data)).n_frames == 4
+
+    def test_animation_route_revalidates(self, client):
+        """Test that a matching If-None-Match is answered with 304."""
+        # Arrange
+        url = '/animation?start=2024-01-01&days=2&size=64'
+        etag = client.get(url).headers['ETag']
+
+        # Act
+        response = client.get(url, headers={'If-None-Match': etag})
+
+        # Assert
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_animation_route_starts_on_current_date(self, client):
+        """Test that the default start follows get_current_date."""
+        # Arrange
+        etag = client.get('/animation?start=2024-01-01&days=2&size=64').headers['ETag']
+
+        # Act
+        with patch('app.app.get_current_date', return_value=date(2024, 1, 1)):
+            response = client.get('/animation?days=2&size=64', headers={'If-None-Match': etag})
+
+        # Assert
+        assert response.status_code == 304
+
+    @pytest.mark.parametrize('query', [
+        'start=yesterday', 'days=0', 'days=10000', 'size=big', 'format=mp4',
+        'start=9999-12-20&days=30', 'start=1899-12-31&days=2', 'start=2100-12-30&days=3',
+    ])
+    def test_animation_route_rejects_bad_parameters(self, client, query):
+        """Test that invalid parameters are rejected with 400."""
+        assert client.get(f'/animation?{query}').status_code == 400
@@ -1,6 +1,9 @@
+import io
+import zipfile
 import pytest
 from unittest.mock import patch, MagicMock
 from datetime import date
+from flask import Response
 from app.app import create_app
 from app.domain.moon_model import MoonPhaseData
 
@@ -54,11 +57,11 @@ class TestFlaskApp:
         # Verify that the app service was called
         mock_app_service.get_complete_moon_data.assert_called_once()
     
-    @patch('app.app.send_from_directory')
+    @patch('app.compression.send_from_directory')
     def test_serve_image_route(self, mock_send_from_directory, client):
         """Test that the serve_image route serves images correctly."""
         # Set up the mock return value
-        mock_send_from_directory.return_value = 'mocked image response'
+        mock_send_from_directory.return_value = Response('mocked image response')
         
         # Make a request to the serve_image route
         response = client.get('/images/test_image.png')
@@ -83,4 +86,223 @@ class TestFlaskApp:
             # Check that the response contains the error message
             html = response.data.decode('utf-8')
             assert 'Something went wrong' in html
-            assert 'Test error' in html
\ No newline at end of file
+            assert 'Test error' in html
+    
+    def test_index_inlines_svg_images(self):
+        """Test that SVG images can be inlined into the page as data URIs."""
+        # Arrange
+        app = create_app(test_config={
+            'TESTING': True,
+            'MOON_IMAGE_FORMAT': 'svg',
+            'INLINE_SVG_IMAGES': True
+        })
+        
+        # Act
+        response = app.test_client().get('/', headers={'Accept-Encoding': 'identity'})
+        
+        # Assert
+        html = response.data.decode('utf-8')
+        assert response.status_code == 200
+        assert 'src="data:image/svg+xml;charset=utf-8,' in html
+        assert '/images/' not in html
+    
+    def test_moon_api_revalidates_with_304(self):
+        """Test that /api/moon returns the update document and 304s for the same version."""
+        # Arrange
+        app = create_app(test_config={'TESTING': True})
+        test_client = app.test_client()
+        
+        # Act
+        response = test_client.get('/api/moon')
+        data = response.get_json()
+        with patch.object(app.extensions['app_service'], 'get_complete_moon_data') as mock_get:
+            revalidated = test_client.get('/api/moon', headers={'If-None-Match': response.headers['ETag']})
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.headers['ETag'] == f'"{data["version"]}"'
+        assert 'no-cache' in response.headers['Cache-Control']
+        assert data['image_url'].startswith('/images/')
+        assert data['next_update'].endswith('T00:00:00Z')
+        assert revalidated.status_code == 304
+        assert revalidated.data == b''
+        mock_get.assert_not_called()
+    
+    def test_index_carries_update_version(self):
+        """Test that the page tells main.js where to poll and which version it shows."""
+        # Arrange
+        app = create_app(test_config={'TESTING': True})
+        
+        # Act
+        response = app.test_client().get('/', headers={'Accept-Encoding': 'identity'})
+        version = app.test_client().get('/api/moon').get_json()['version']
+        
+        # Assert
+        html = response.data.decode('utf-8')
+        assert 'data-api-url="/api/moon"' in html
+        assert f'data-version="{version}"' in html
+    
+    def test_index_shows_requested_date(self):
+        """Test that /?date= shows that night with links to its neighbours and prefetches them."""
+        # Arrange
+        app = create_app(test_config={'TESTING': True, 'PREFETCH_DAYS': 2})
+        app_service = app.extensions['app_service']
+        
+        # Act
+        with patch.object(app_service, 'prefetch_complete_moon_data') as mock_prefetch:
+            response = app.test_client().get('/?date=2024-03-10', headers={'Accept-Encoding': 'identity'})
+        
+        # Assert
+        html = response.data.decode('utf-8')
+        assert response.status_code == 200
+        assert 'March 10, 2024' in html
+        assert 'href="/?date=2024-03-09"' in html
+        assert 'href="/?date=2024-03-11"' in html
+        assert 'data-api-url' not in html
+        assert set(mock_prefetch.call_args[0][0]) == {
+            date(2024, 3, 8), date(2024, 3, 9), date(2024, 3, 11), date(2024, 3, 12)
+        }
+    
+    def test_index_rejects_invalid_date(self):
+        """Test that malformed or out-of-range dates are a bad request."""
+        # Arrange
+        test_client = create_app(test_config={'TESTING': True}).test_client()
+        
+        # Act / Assert
+        assert test_client.get('/?date=2024-13-01').status_code == 400
+        assert test_client.get('/?date=1066-10-14').status_code == 400
+    
+    def test_degraded_page_is_marked_and_not_cached(self):
+        """Test that pages served under load carry X-Moon-Degraded and full pages follow recovery."""
+        # Arrange
+        app = create_app(test_config={'TESTING': True, 'PREFETCH_DAYS': 0})
+        test_client = app.test_client()
+        monitor = app.extensions['app_service'].load_monitor
+        
+        # Act
+        with patch.object(monitor, 'overloaded', return_value=True):
+            degraded = test_client.get('/?date=2024-03-10', headers={'Accept-Encoding': 'identity'})
+        recovered = test_client.get('/?date=2024-03-10', headers={'Accept-Encoding': 'identity'})
+        
+        # Assert
+        assert degraded.status_code == 200
+        assert degraded.headers['X-Moon-Degraded'] == '1'
+        assert 'no-store' in degraded.headers['Cache-Control']
+        assert 'March 10, 2024' in degraded.data.decode('utf-8')
+        assert recovered.status_code == 200
+        assert 'X-Moon-Degraded' not in recovered.headers
+    
+    def test_phase_calendar_streams_events_and_revalidates(self):
+        """Test that /phases.ics streams a VEVENT per phase and 304s for the same ETag."""
+        # Arrange
+        test_client = create_app(test_config={'TESTING': True}).test_client()
+        
+        # Act
+        response = test_client.get('/phases.ics?years=2024', headers={'Accept-Encoding': 'identity'})
+        with patch('app.app.iter_phase_calendar') as mock_calendar:
+            revalidated = test_client.get('/phases.ics?years=2024',
+                                          headers={'If-None-Match': response.headers['ETag']})
+        
+        # Assert
+        text = response.data.decode('utf-8')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/calendar'
+        assert 'Content-Length' not in response.headers  # streamed
+        assert text.count('BEGIN:VEVENT') == 50
+        assert 'DTSTART:20241017T112621Z' in text  # Full Moon of 2024-10-17 11:26 UTC
+        assert revalidated.status_code == 304
+        mock_calendar.assert_not_called()
+    
+    def test_phase_calendar_rejects_invalid_years(self):
+        """Test that malformed, reversed or too long ranges are a bad request."""
+        # Arrange
+        test_client = create_app(test_config={'TESTING': True, 'PHASE_CALENDAR_MAX_YEARS': 5}).test_client()
+        
+        # Act / Assert
+        assert test_client.get('/phases.ics?years=soon').status_code == 400
+        assert test_client.get('/phases.ics?years=2030-2024').status_code == 400
+        assert test_client.get('/phases.ics?years=2024-2030').status_code == 400
+        assert test_client.get('/phases.ics?years=1066').status_code == 400
+    
+    def test_moon_tiles_are_served_and_described(self):
+        """Test that /api/moon describes the tile pyramid and tiles are served within it."""
+        # Arrange
+        test_client = create_app(test_config={'TESTING': True}).test_client()
+        
+        # Act
+        tiles = test_client.get('/api/moon').get_json()['tiles']
+        tile = test_client.get(tiles['url'].format(z=1, x=1, y=0))
+        
+        # Assert
+        assert tiles['tile_size'] == 256
+        assert tiles['levels'] == 6
+        assert tile.status_code == 200
+        assert tile.mimetype == 'image/png'
+        assert 'max-age=86400' in tile.headers['Cache-Control']
+        assert test_client.get(tiles['url'].format(z=1, x=2, y=0)).status_code == 404
+        assert test_client.get('/tiles/50/sideways/0/0/0').status_code == 404
+    
+    def test_export_images_streams_zip(self):
+        """Test that POST /export/images returns a ZIP of the requested dates and rejects bad input."""
+        # Arrange
+        test_client = create_app(test_config={'TESTING': True, 'EXPORT_MAX_DATES': 100}).test_client()
+        
+        # Act
+        response = test_client.post('/export/images', json={
+            'start': '2024-01-01', 'days': 10, 'sizes': [64], 'formats': ['png', 'webp']
+        })
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.mimetype == 'application/zip'
+        assert 'attachment' in response.headers['Content-Disposition']
+        archive = zipfile.ZipFile(io.BytesIO(response.data))
+        assert archive.namelist()[0] == 'manifest.csv'
+        assert archive.read('manifest.csv').decode('utf-8').count('\n') == 11
+        assert test_client.post('/export/images', json={'dates': ['not a date']}).status_code == 400
+        assert test_client.post('/export/images', json={'dates': ['2024-01-01'], 'formats': ['bmp']}).status_code == 400
+        assert test_client.post('/export/images', json={'start': '2024-01-01', 'days': 101}).status_code == 400
+        assert test_client.post('/export/images', json={'start': '2000-01-01', 'days': 3000000}).status_code == 400
+        assert test_client.post('/export/images', json={'start': '9999-12-31', 'days': 2}).status_code == 400
+        assert test_client.post('/export/images', json={'dates': ['2024-01-01'] * 101}).status_code == 400
+    
+    def test_distance_events_endpoint(self):
+        """Test that the index built at startup answers the next perigee and supermoon."""
+        # Arrange
+        with patch('app.app.get_current_date', return_value=date(2024, 6, 1)):
+            test_client = create_app(test_config={'TESTING': True}).test_client()
+        
+        # Act
+        response = test_client.get('/api/moon/distance-events?date=2024-10-10')
+        uncovered = test_client.get('/api/moon/distance-events?date=2030-01-01').get_json()
+        
+        # Assert
+        assert response.status_code == 200
+        events = response.get_json()['next']
+        assert events['perigee']['datetime'].startswith('2024-10-17')
+        assert events['supermoon']['datetime'].startswith('2024-10-17')
+        assert set(events) == {'perigee', 'apogee', 'supermoon', 'micromoon'}
+        assert uncovered['next']['perigee'] is None
+        assert test_client.get('/api/moon/distance-events?date=soon').status_code == 400
+    
+    def test_moon_curve_endpoints(self):
+        """Test the curve JSON, its sparkline and the sparkline on the page."""
+        # Arrange
+        test_client = create_app(test_config={'TESTING': True, 'TIMEZONE': 'Europe/Berlin'}).test_client()
+        
+        # Act
+        curve = test_client.get('/api/moon/curve?date=2024-07-01&points=6&span=day')
+        svg = test_client.get('/moon/curve.svg?date=2024-07-01&tz=-300')
+        page = test_client.get('/?date=2024-07-01', headers={'Accept-Encoding': 'identity'})
+        
+        # Assert
+        data = curve.get_json()
+        assert curve.status_code == 200
+        assert data['tz_offset_minutes'] == 120  # Summer time
+        assert data['points'][0]['time'] == '2024-07-01T00:00+02:00'
+        assert len(data['points']) == 6
+        assert svg.mimetype == 'image/svg+xml'
+        assert '2024-07-01T18:00-05:00' in svg.data.decode('utf-8')
+        assert "<svg xmlns='http://www.w3.org/2000/svg' class='moon-curve'" in page.data.decode('utf-8')
+        assert test_client.get('/api/moon/curve?points=1').status_code == 400
+        assert test_client.get('/api/moon/curve?span=week').status_code == 400
@@ -1,9 +1,11 @@
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from unittest.mock import patch, MagicMock
 
 from app.app_service import AppService
 from app.domain.moon_model import MoonPhaseData
+from app.utils.cache_utils import LRUCache
 
 class TestAppService:
     """Tests for the AppService component."""
@@ -135,4 +137,103 @@ class TestAppService:
             mock_get_date.assert_called_once()
             
             # Verify the calculator was called with the current date
-            mock_calculator.calculate_moon_phase.assert_called_once_with(date.today())
\ No newline at end of file
+            mock_calculator.calculate_moon_phase.assert_called_once_with(date.today())
+    
+    def test_prefetch_complete_moon_data(self):
+        """Test that prefetched dates are computed once in the background and then hit the cache."""
+        # Arrange
+        mock_calculator = MagicMock()
+        mock_calculator.calculate_moon_phase.side_effect = lambda date_obj: MoonPhaseData(
+            date=date_obj,
+            illumination_percent=65.0,
+            phase_name="Waxing Gibbous",
+            phase_angle=120.0
+        )
+        mock_image_provider = MagicMock()
+        mock_image_provider.get_moon_image.return_value = "/path/to/image.png"
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            service = AppService(
+                moon_calculator=mock_calculator,
+                image_provider=mock_image_provider,
+                cache=LRUCache(max_entries=8),
+                prefetch_executor=executor
+            )
+            dates = [date(2024, 3, 1), date(2024, 3, 2)]
+            
+            # Act
+            submitted = service.prefetch_complete_moon_data(dates)
+            result = service.get_complete_moon_data(date(2024, 3, 2))
+            executor.shutdown(wait=True)
+            resubmitted = service.prefetch_complete_moon_data(dates)
+        
+        # Assert
+        assert submitted == 2
+        assert resubmitted == 0
+        assert result["date"] == date(2024, 3, 2)
+        assert mock_calculator.calculate_moon_phase.call_count == 2
+    
+    def test_prefetch_needs_cache(self):
+        """Test that nothing is prefetched without a cache to keep the results."""
+        # Arrange
+        executor = MagicMock()
+        service = AppService(moon_calculator=MagicMock(), image_provider=MagicMock(),
+                             prefetch_executor=executor)
+        
+        # Act
+        submitted = service.prefetch_complete_moon_data([date(2024, 3, 1)])
+        
+        # Assert
+        assert submitted == 0
+        executor.submit.assert_not_called()
+    
+    def test_degraded_moon_data_under_load(self):
+        """Test that overload serves uncached dates cheaply from static images and cached next phases."""
+        # Arrange
+        mock_calculator = MagicMock()
+        mock_calculator.iter_phase_series.return_value = iter([(date(2024, 3, 2), 60.0, 100.0)])
+        mock_calculator.get_phase_name.return_value = "Waxing Gibbous"
+        mock_image_provider = MagicMock()
+        mock_image_provider.get_static_moon_image.return_value = "/images/waxing_gibbous.png"
+        mock_monitor = MagicMock()
+        mock_monitor.overloaded.return_value = True
+        
+        cache = LRUCache(max_entries=8)
+        cache.set(date(2024, 3, 1), {'next_phase_date': date(2024, 3, 4), 'next_phase_name': "Full Moon"})
+        service = AppService(
+            moon_calculator=mock_calculator,
+            image_provider=mock_image_provider,
+            cache=cache,
+            prefetch_executor=MagicMock(),
+            load_monitor=mock_monitor
+        )
+        
+        # Act
+        result = service.get_complete_moon_data(date(2024, 3, 2))
+        prefetched = service.prefetch_complete_moon_data([date(2024, 3, 3)])
+        
+        # Assert
+        assert result["degraded"] is True
+        assert result["visualization_path"] == "/images/waxing_gibbous.png"
+        assert result["next_phase_date"] == date(2024, 3, 4)
+        assert result["next_phase_name"] == "Full Moon"
+        assert date(2024, 3, 2) not in cache
+        assert prefetched == 0
+        mock_calculator.calculate_moon_phase.assert_not_called()
+        mock_image_provider.get_moon_image.assert_not_called()
+    
+    def test_cached_data_is_served_in_full_under_load(self):
+        """Test that cached dates are still served in full while degraded."""
+        # Arrange
+        mock_monitor = MagicMock()
+        mock_monitor.overloaded.return_value = True
+        cache = LRUCache(max_entries=8)
+        cache.set(date(2024, 3, 2), {'phase_name': "Waxing Gibbous", 'visualization_path': "/a.png"})
+        service = AppService(moon_calculator=MagicMock(), image_provider=MagicMock(),
+                             cache=cache, load_monitor=mock_monitor)
+        
+        # Act
+        result = service.get_complete_moon_data(date(2024, 3, 2))
+        
+        # Assert
+        assert result == {'phase_name': "Waxing Gibbous", 'visualization_path': "/a.png"}
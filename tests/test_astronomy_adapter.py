@@ -1,5 +1,8 @@
+import math
+import ephem
 import pytest
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from app.adapters.astronomy_adapter import AstronomyAdapter
 
 class TestAstronomyAdapter:
@@ -55,4 +58,67 @@ class TestAstronomyAdapter:
         result = adapter.calculate_phase_angle(moon_data)
         
         # Assert
-        assert result == 135.5
\ No newline at end of file
+        assert result == 135.5
+    
+    def test_phase_angle_follows_lunation(self):
+        """Test that the phase angle is the Moon's elongation through the lunation."""
+        # Arrange: January 2024 had a new moon on the 11th and a full moon on the 25th
+        adapter = AstronomyAdapter()
+        
+        # Act
+        new_moon = adapter.get_phase_state(date(2024, 1, 11), '12:00:00')['phase_angle']
+        first_quarter = adapter.get_phase_state(date(2024, 1, 18), '04:00:00')['phase_angle']
+        full_moon = adapter.get_phase_state(date(2024, 1, 25), '18:00:00')['phase_angle']
+        last_quarter = adapter.get_phase_state(date(2024, 2, 2), '23:00:00')['phase_angle']
+        
+        # Assert
+        assert new_moon < 5 or new_moon > 355
+        assert 85 < first_quarter < 95
+        assert 175 < full_moon < 185
+        assert 265 < last_quarter < 275
+    
+    def test_shared_adapter_is_thread_safe(self):
+        """Test that threads sharing one adapter get the same results as serial calls."""
+        # Arrange
+        adapter = AstronomyAdapter()
+        requests = [(date(2024, 1, 1) + timedelta(days=i), '22:00:00',
+                     {'latitude': 51.5, 'longitude': -0.1} if i % 2 else None) for i in range(40)]
+        expected = [AstronomyAdapter().get_phase_state(*request) for request in requests]
+        
+        # Act
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            result = list(pool.map(lambda request: adapter.get_phase_state(*request), requests))
+        
+        # Assert
+        assert result == expected
+    
+    def test_phase_curve_matches_per_point_computation(self):
+        """Test that the batched curve agrees with computing every point with ephem."""
+        # Arrange
+        adapter = AstronomyAdapter()
+        location = {'latitude': 51.5, 'longitude': -0.1}
+        
+        # Act
+        curve = adapter.get_phase_curve(datetime(2024, 3, 24, 18), 12.0, 25, location)
+        
+        # Assert
+        assert len(curve['times']) == 25
+        assert curve['times'][0] == datetime(2024, 3, 24, 18)
+        assert curve['times'][-1] == datetime(2024, 3, 25, 6)
+        observer = ephem.Observer()
+        observer.pressure = 0
+        observer.lat, observer.lon = math.radians(51.5), math.radians(-0.1)
+        moon = ephem.Moon()
+        for instant, illumination, phase_angle, altitude in zip(
+                curve['times'], curve['illumination_percent'], curve['phase_angle'], curve['altitude']):
+            observer.date = instant
+            moon.compute(observer)
+            state = adapter.get_phase_state(instant.date(), instant.strftime('%H:%M:%S'), location)
+            assert altitude == pytest.approx(math.degrees(moon.alt), abs=0.05)
+            assert illumination == pytest.approx(state['illumination'] * 100.0, abs=0.01)
+            assert phase_angle == pytest.approx(state['phase_angle'], abs=0.01)
+    
+    def test_phase_curve_needs_two_points(self):
+        """Test that a curve of fewer than two points is rejected."""
+        with pytest.raises(ValueError):
+            AstronomyAdapter().get_phase_curve(datetime(2024, 1, 1), 12.0, 1)
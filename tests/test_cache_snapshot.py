@@ -0,0 +1,132 @@
+import os
+import pytest
+from datetime import date
+from unittest.mock import patch
+from app.app import create_app
+from app.cache_snapshot import CacheSnapshot, snapshot_version
+from app.utils.cache_utils import LRUCache
+from app.utils.date_utils import get_current_date
+
+@pytest.fixture
+def caches():
+    """Create caches holding a date-keyed entry and a page."""
+    data = LRUCache()
+    data.set(date(2024, 1, 25), {'date': date(2024, 1, 25), 'illumination_percent': 99.9})
+    pages = LRUCache()
+    pages.set('2024-01-25', '<html>Full Moon</html>')
+    return {'moon_data': data, 'pages': pages}
+
+class TestCacheSnapshot:
+    """Tests for persisted cache snapshots."""
+
+    def test_round_trip(self, tmp_path, caches):
+        """Test that saved entries, including dates, are restored."""
+        # Arrange
+        snapshot = CacheSnapshot(str(tmp_path / 'caches.snap'), 'secret', snapshot_version())
+        snapshot.save(caches)
+        restored = {'moon_data': LRUCache(), 'pages': LRUCache()}
+
+        # Act
+        count = snapshot.restore(restored)
+
+        # Assert
+        assert count == 2
+        assert restored['moon_data'].get(date(2024, 1, 25)) == {
+            'date': date(2024, 1, 25), 'illumination_percent': 99.9}
+        assert restored['pages'].get('2024-01-25') == '<html>Full Moon</html>'
+
+    def test_tampered_snapshot_is_ignored(self, tmp_path, caches):
+        """Test that a modified or foreign-key snapshot fails the integrity check."""
+        # Arrange
+        path = tmp_path / 'caches.snap'
+        CacheSnapshot(str(path), 'secret', 'v1').save(caches)
+        path.write_bytes(path.read_bytes().replace(b'Full Moon', b'New Moon!'))
+
+        # Act & Assert
+        assert CacheSnapshot(str(path), 'secret', 'v1').load() is None
+        CacheSnapshot(str(path), 'secret', 'v1').save(caches)
+        assert CacheSnapshot(str(path), 'other secret', 'v1').load() is None
+
+    def test_other_version_is_ignored(self, tmp_path, caches):
+        """Test that an engine or renderer upgrade invalidates the snapshot."""
+        # Arrange
+        path = str(tmp_path / 'caches.snap')
+        CacheSnapshot(path, 'secret', snapshot_version()).save(caches)
+
+        # Act
+        with patch('app.cache_snapshot.RENDERER_VERSION', 'next'):
+            loaded = CacheSnapshot(path, 'secret', snapshot_version()).load()
+
+        # Assert
+        assert loaded is None
+
+    def test_restore_skips_rejected_entries(self, tmp_path, caches):
+        """Test that entries rejected by the keep check are not restored."""
+        # Arrange
+        snapshot = CacheSnapshot(str(tmp_path / 'caches.snap'), 'secret', snapshot_version())
+        snapshot.save(caches)
+        restored = {'moon_data': LRUCache(), 'pages': LRUCache()}
+
+        # Act
+        count = snapshot.restore(restored, keep=lambda name, key, value: name == 'pages')
+
+        # Assert
+        assert count == 1
+        assert date(2024, 1, 25) not in restored['moon_data']
+        assert '2024-01-25' in restored['pages']
+
+    def test_missing_snapshot(self, tmp_path):
+        """Test that a missing file restores nothing."""
+        assert CacheSnapshot(str(tmp_path / 'none.snap'), 'secret', 'v1').restore({'pages': LRUCache()}) == 0
+
+    def test_restarted_app_serves_restored_page(self, tmp_path):
+        """Test that a new app instance answers from the previous instance's snapshot."""
+        # Arrange
+        config = {'TESTING': True, 'CACHE_SNAPSHOT_PATH': str(tmp_path / 'caches.snap'),
+                  'CACHE_SNAPSHOT_INTERVAL': 0, 'PREFETCH_DAYS': 0}
+        first = create_app(test_config=config)
+        page = first.test_client().get('/').data
+        first.extensions['cache_snapshot'].save({
+            'moon_data': first.extensions['app_service'].cache,
+            'pages': LRUCache(),
+        })
+        restarted = create_app(test_config=config)
+
+        # Act
+        with patch('app.moon_calculator.MoonCalculator.calculate_moon_phase') as calculate:
+            response = restarted.test_client().get('/')
+
+        # Assert
+        calculate.assert_not_called()
+        assert response.data == page
+
+    def test_restore_into_empty_images_directory(self, tmp_path):
+        """Test that entries whose generated image is gone are computed again."""
+        # Arrange
+        config = {'TESTING': True, 'CACHE_SNAPSHOT_PATH': str(tmp_path / 'caches.snap'),
+                  'CACHE_SNAPSHOT_INTERVAL': 0, 'PREFETCH_DAYS': 0}
+        first = create_app(test_config=config)
+        first.test_client().get('/')
+        today = get_current_date()
+        moon_data = first.extensions['app_service'].cache.get(today)
+
+        # The snapshot was taken on a host whose images directory is now empty
+        images_dir = tmp_path / 'images'
+        images_dir.mkdir()
+        stale_path = str(images_dir / os.path.basename(moon_data['visualization_path']))
+        stale_data = LRUCache()
+        stale_data.set(today, dict(moon_data, visualization_path=stale_path))
+        first.extensions['cache_snapshot'].save({
+            'moon_data': stale_data,
+            'pages': first.extensions['page_cache'],
+        })
+        restarted = create_app(test_config=config)
+
+        # Act
+        response = restarted.test_client().get('/')
+
+        # Assert
+        restored = restarted.extensions['app_service'].cache.get(today)
+        assert response.status_code == 200
+        assert restored['visualization_path'] != stale_path
+        assert os.path.exists(restored['visualization_path'])
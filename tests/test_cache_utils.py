@@ -0,0 +1,93 @@
+import os
+import pytest
+from unittest.mock import MagicMock
+from app.utils.cache_utils import DiskLRUCache, LRUCache
+
+class TestLRUCache:
+    """Tests for the LRUCache utility."""
+
+    def test_evicts_least_recently_used_entry(self):
+        """Test that the oldest unused entry is evicted at capacity."""
+        # Arrange
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # Act
+        cache.get("a")
+        cache.set("c", 3)
+
+        # Assert
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_bounded_by_total_bytes(self):
+        """Test that the total size of values stays under max_bytes."""
+        # Arrange
+        cache = LRUCache(max_entries=10, max_bytes=10)
+
+        # Act
+        cache.set("a", b"12345")
+        cache.set("b", b"12345")
+        cache.set("c", b"123")
+        cache.set("huge", b"x" * 11)
+
+        # Assert
+        assert cache.stats()['bytes'] <= 10
+        assert "a" not in cache
+        assert "huge" not in cache
+
+    def test_get_or_create(self):
+        """Test that the factory only runs on a miss."""
+        # Arrange
+        cache = LRUCache()
+        calls = []
+
+        # Act
+        first = cache.get_or_create("key", lambda: calls.append(1) or "value")
+        second = cache.get_or_create("key", lambda: calls.append(1) or "other")
+
+        # Assert
+        assert first == second == "value"
+        assert len(calls) == 1
+        assert cache.stats()['hits'] == 1
+
+    def test_invalid_size(self):
+        """Test that a cache must hold at least one entry."""
+        with pytest.raises(ValueError):
+            LRUCache(max_entries=0)
+
+class TestDiskLRUCache:
+    """Tests for the DiskLRUCache utility."""
+
+    def test_produces_once_and_evicts_least_recently_used(self, tmp_path):
+        """Test that files are produced on a miss and the oldest unused file is evicted."""
+        # Arrange
+        cache = DiskLRUCache(str(tmp_path), max_bytes=20)
+        produce = MagicMock(return_value=b'x' * 8)
+
+        # Act
+        first = cache.get_or_create('a.bin', produce)
+        cache.get_or_create('b.bin', produce)
+        cache.get_or_create('a.bin', produce)  # Hit, makes b the oldest
+        cache.get_or_create('c.bin', produce)
+
+        # Assert
+        assert produce.call_count == 3
+        assert os.path.exists(first)
+        assert not os.path.exists(tmp_path / 'b.bin')
+        assert cache.stats() == {'entries': 2, 'bytes': 16}
+
+    def test_reloads_index_from_directory(self, tmp_path):
+        """Test that a new cache over the same directory counts and evicts existing files."""
+        # Arrange
+        DiskLRUCache(str(tmp_path), max_bytes=100).get_or_create('old.bin', lambda: b'x' * 60)
+        cache = DiskLRUCache(str(tmp_path), max_bytes=100)
+
+        # Act
+        cache.get_or_create('new.bin', lambda: b'y' * 60)
+
+        # Assert
+        assert not os.path.exists(tmp_path / 'old.bin')
+        assert cache.stats() == {'entries': 1, 'bytes': 60}
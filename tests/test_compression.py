@@ -0,0 +1,102 @@
+import pytest
+import gzip
+import os
+from unittest.mock import patch, MagicMock
+from datetime import date
+from app.app import create_app
+from app.compression import send_asset, precompress_directory
+
+@pytest.fixture
+def app():
+    """Create the Flask app with a low compression threshold."""
+    return create_app(test_config={'TESTING': True, 'COMPRESS_MIN_SIZE': 100})
+
+class TestCompression:
+    """Tests for response compression and pre-compressed static assets."""
+
+    def test_dynamic_response_is_compressed_and_cached(self, app):
+        """Test that the page is gzipped once and reused from the cache."""
+        # Arrange
+        client = app.test_client()
+
+        # Act
+        first = client.get('/', headers={'Accept-Encoding': 'gzip'})
+        second = client.get('/', headers={'Accept-Encoding': 'gzip'})
+
+        # Assert
+        assert first.status_code == 200
+        assert first.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in first.headers['Vary']
+        assert b'Moon Phase Visualization' in gzip.decompress(first.data)
+        assert second.data == first.data
+        assert app.extensions['compressed_cache'].stats()['hits'] >= 1
+
+    def test_dynamic_response_without_gzip_support(self, app):
+        """Test that clients without gzip support get the plain page."""
+        # Act
+        response = app.test_client().get('/', headers={'Accept-Encoding': 'identity'})
+
+        # Assert
+        assert 'Content-Encoding' not in response.headers
+        assert b'Moon Phase Visualization' in response.data
+
+    def test_small_responses_are_not_compressed(self):
+        """Test that bodies under the size threshold are sent as-is."""
+        # Arrange
+        app = create_app(test_config={'TESTING': True, 'COMPRESS_MIN_SIZE': 10 ** 7})
+
+        # Act
+        response = app.test_client().get('/', headers={'Accept-Encoding': 'gzip'})
+
+        # Assert
+        assert 'Content-Encoding' not in response.headers
+
+    def test_send_asset_prefers_fresh_gzip_sibling(self, app, tmp_path):
+        """Test that a pre-compressed sibling is negotiated via Accept-Encoding."""
+        # Arrange
+        (tmp_path / "site.css").write_text("body { color: white; }" * 20)
+        precompress_directory(str(tmp_path))
+
+        # Act
+        with app.test_request_context('/', headers={'Accept-Encoding': 'gzip, deflate'}):
+            compressed = send_asset(str(tmp_path), "site.css")
+        with app.test_request_context('/'):
+            plain = send_asset(str(tmp_path), "site.css")
+
+        # Assert
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert compressed.mimetype == 'text/css'
+        assert 'Content-Encoding' not in plain.headers
+
+    def test_send_asset_ignores_stale_gzip_sibling(self, app, tmp_path):
+        """Test that a sibling older than its source is not served."""
+        # Arrange
+        (tmp_path / "main.js").write_text("console.log('old');")
+        precompress_directory(str(tmp_path))
+        os.utime(tmp_path / "main.js.gz", (0, 0))
+
+        # Act
+        with app.test_request_context('/', headers={'Accept-Encoding': 'gzip'}):
+            response = send_asset(str(tmp_path), "main.js")
+
+        # Assert
+        assert 'Content-Encoding' not in response.headers
+
+    def test_x_accel_redirect_mode(self):
+        """Test that files are handed off to nginx without a body."""
+        # Arrange
+        app = create_app(test_config={
+            'TESTING': True,
+            'SENDFILE_MODE': 'x-accel-redirect',
+            'X_ACCEL_REDIRECT_PREFIX': '/internal/'
+        })
+
+        # Act
+        response = app.test_client().get('/images/full_moon.png')
+        missing = app.test_client().get('/images/missing.png')
+
+        # Assert
+        assert response.headers['X-Accel-Redirect'] == '/internal/images/full_moon.png'
+        assert response.mimetype == 'image/png'
+        assert response.data == b''
+        assert missing.status_code == 404
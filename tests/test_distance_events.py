@@ -0,0 +1,61 @@
+import pytest
+from datetime import date, datetime
+from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.adapters.distance_events import DistanceEventIndex
+
+@pytest.fixture(scope='module')
+def index():
+    """Build an index covering 2024."""
+    return DistanceEventIndex.build(date(2024, 1, 1), 366)
+
+class TestDistanceEventIndex:
+    """Tests for the perigee, apogee and supermoon index."""
+
+    def test_perigee_matches_published_time(self, index):
+        """Test that a perigee is found to within minutes of its published time."""
+        # Act
+        perigee = index.next_event('perigee', datetime(2024, 10, 10))
+
+        # Assert
+        # Perigee of 2024-10-17 00:51 UTC at 357,173 km
+        assert abs((perigee.when - datetime(2024, 10, 17, 0, 51)).total_seconds()) < 600
+        assert perigee.distance_km == pytest.approx(357173, abs=50)
+
+    def test_perigees_and_apogees_alternate(self, index):
+        """Test that every lunation has one perigee and one apogee, alternating."""
+        # Act
+        events = [event for event in index.events_between(datetime(2024, 1, 1), datetime(2025, 1, 1))
+                  if event.kind in ('perigee', 'apogee')]
+
+        # Assert
+        assert 26 <= len(events) <= 28
+        assert all(first.kind != second.kind for first, second in zip(events, events[1:]))
+        assert all(event.distance_km < 371000 for event in events if event.kind == 'perigee')
+        assert all(event.distance_km > 404000 for event in events if event.kind == 'apogee')
+
+    def test_supermoons_and_micromoons(self, index):
+        """Test the classification of full moons by distance."""
+        # Act
+        supermoons = [event.when.date() for event in index.events['supermoon']]
+        micromoon = index.next_event('micromoon', datetime(2024, 1, 1))
+
+        # Assert
+        assert supermoons == [date(2024, 9, 18), date(2024, 10, 17)]
+        assert micromoon.when.date() == date(2024, 2, 24)
+
+    def test_next_event_outside_index(self, index):
+        """Test that instants the index does not cover give no event."""
+        assert index.next_event('perigee', datetime(2023, 12, 1)) is None
+        assert index.next_event('perigee', datetime(2025, 6, 1)) is None
+
+    def test_adapter_reports_distance(self):
+        """Test that moon data includes the observer's distance in kilometres."""
+        # Arrange
+        adapter = AstronomyAdapter()
+
+        # Act
+        distance = adapter.calculate_distance_km(adapter.get_moon_data(date(2024, 10, 17), '00:51:00'))
+
+        # Assert
+        # Within an Earth radius of the geocentric perigee distance
+        assert distance == pytest.approx(357173, abs=6400)
@@ -0,0 +1,95 @@
+import pytest
+from datetime import date, datetime, timedelta
+from app.app import create_app
+from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.ephemeris_feed import build_ephemeris_feed, feed_version, parse_ephemeris_feed, phase_from_feed
+
+@pytest.fixture(scope='module')
+def feed_data():
+    """Build the feed for 2024."""
+    return build_ephemeris_feed(2024)
+
+class TestEphemerisFeed:
+    """Tests for the binary phase-event feed."""
+
+    def test_feed_is_compact_and_covers_the_year(self, feed_data):
+        """Test that a year fits in well under a kilobyte with events on both sides."""
+        # Act
+        feed = parse_ephemeris_feed(feed_data)
+
+        # Assert
+        first, last = feed['events'][0][0], feed['events'][-1][0]
+        assert len(feed_data) < 1024
+        assert first < (datetime(2024, 1, 1) - datetime(1970, 1, 1)).total_seconds()
+        assert last > (datetime(2025, 1, 1) - datetime(1970, 1, 1)).total_seconds()
+
+    def test_events_match_ephem(self, feed_data):
+        """Test that decoded events are the adapter's phase dates."""
+        # Arrange
+        adapter = AstronomyAdapter()
+        moon_data = adapter.get_moon_data(date(2024, 6, 1), '22:00:00')
+
+        # Act
+        result = phase_from_feed(parse_ephemeris_feed(feed_data), datetime(2024, 6, 1, 22))
+
+        # Assert
+        next_time, next_kind = result['next_event']
+        next_date = (datetime(1970, 1, 1) + timedelta(seconds=next_time)).date()
+        assert next_kind == 0
+        assert next_date == moon_data['next_new_moon']
+
+    def test_phase_matches_adapter(self, feed_data):
+        """Test that phases computed from the feed stay close to the adapter's."""
+        # Arrange
+        adapter = AstronomyAdapter()
+        feed = parse_ephemeris_feed(feed_data)
+        moments = [datetime(2024, 1, 1) + timedelta(hours=hours) for hours in range(0, 366 * 24, 37)]
+
+        # Act
+        errors = []
+        for moment in moments:
+            state = adapter.get_phase_state(moment.date(), moment.strftime('%H:%M:%S'))
+            result = phase_from_feed(feed, moment)
+            errors.append(abs(result['illumination_percent'] - state['illumination'] * 100))
+
+        # Assert
+        assert max(errors) < 1.0
+
+    def test_invalid_feed(self, feed_data):
+        """Test that other or truncated data is rejected."""
+        with pytest.raises(ValueError):
+            parse_ephemeris_feed(b'MOONEPH1' + feed_data[8:])
+        with pytest.raises(ValueError):
+            parse_ephemeris_feed(feed_data[:-2])
+
+    def test_route_serves_immutable_feed(self):
+        """Test that the feed is served with long-lived caching and only for the current version."""
+        # Arrange
+        test_client = create_app(test_config={'TESTING': True}).test_client()
+        url = f'/api/ephemeris/{feed_version()}/2024.bin'
+
+        # Act
+        response = test_client.get(url)
+        revalidated = test_client.get(url, headers={'If-None-Match': response.headers['ETag']})
+        stale = test_client.get('/api/ephemeris/0.0.0/2024.bin')
+
+        # Assert
+        assert response.status_code == 200
+        assert response.mimetype == 'application/octet-stream'
+        assert 'immutable' in response.headers['Cache-Control']
+        assert 'max-age=31536000' in response.headers['Cache-Control']
+        assert parse_ephemeris_feed(response.data)['events']
+        assert revalidated.status_code == 304
+        assert stale.status_code == 404
+
+    def test_index_links_feed_and_phase_images(self):
+        """Test that the page gives main.js the feed URL and the static phase images."""
+        # Arrange
+        test_client = create_app(test_config={'TESTING': True}).test_client()
+
+        # Act
+        html = test_client.get('/', headers={'Accept-Encoding': 'identity'}).data.decode('utf-8')
+
+        # Assert
+        assert f'data-ephemeris-url="/api/ephemeris/{feed_version()}/' in html
+        assert '"Full Moon": "/images/full_moon.png"' in html
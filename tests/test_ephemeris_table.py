@@ -0,0 +1,106 @@
+import pytest
+import struct
+from datetime import date, timedelta
+from unittest.mock import patch
+from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.adapters.process_pool_adapter import ProcessPoolAstronomyAdapter
+from app.ephemeris_table import TABLE_VERSION, EphemerisTable, build_ephemeris_table
+
+@pytest.fixture(scope='module')
+def table_path(tmp_path_factory):
+    """Build a small hourly table for January 2024."""
+    path = str(tmp_path_factory.mktemp('tables') / 'moon.tbl')
+    build_ephemeris_table(path, date(2024, 1, 1), 31)
+    return path
+
+class TestEphemerisTable:
+    """Tests for the shared, memory-mapped ephemeris table."""
+
+    def test_table_matches_ephem(self, table_path):
+        """Test that table lookups give the same moon data as ephem."""
+        # Arrange
+        dates = [date(2024, 1, 1), date(2024, 1, 11), date(2024, 1, 31)]
+
+        # Act
+        with EphemerisTable(table_path) as table:
+            result = [AstronomyAdapter(table=table).get_moon_data(d, '22:00:00') for d in dates]
+
+        # Assert
+        assert result == [AstronomyAdapter().get_moon_data(d, '22:00:00') for d in dates]
+
+    def test_sampled_instants_skip_ephem(self, table_path):
+        """Test that covered instants are answered without any ephem calculation."""
+        # Arrange
+        with EphemerisTable(table_path) as table:
+            adapter = AstronomyAdapter(table=table)
+
+            # Act
+            with patch('app.adapters.astronomy_adapter.ephem.Moon') as moon:
+                state = adapter.get_phase_state(date(2024, 1, 15), '13:00:00')
+
+            # Assert
+            moon.assert_not_called()
+            assert 0.0 <= state['illumination'] <= 1.0
+
+    def test_uncovered_requests_fall_back_to_ephem(self, table_path):
+        """Test that off-grid times, other dates and locations are computed normally."""
+        # Arrange
+        requests = [
+            (date(2024, 1, 15), '13:30:00', None),
+            (date(2024, 6, 1), '22:00:00', None),
+            (date(2024, 1, 15), '22:00:00', {'latitude': 51.5, 'longitude': -0.1}),
+        ]
+
+        # Act
+        with EphemerisTable(table_path) as table:
+            result = [AstronomyAdapter(table=table).get_moon_data(*request) for request in requests]
+
+        # Assert
+        assert result == [AstronomyAdapter().get_moon_data(*request) for request in requests]
+
+    def test_columns_are_read_only(self, table_path):
+        """Test that the mapped arrays cannot be modified by a worker."""
+        with EphemerisTable(table_path) as table:
+            assert not table.illumination.flags.writeable
+            with pytest.raises(ValueError):
+                table.phase_angle[0] = 0.0
+
+    def test_rejects_invalid_files(self, tmp_path):
+        """Test that files that are not tables are rejected."""
+        # Arrange
+        bogus = tmp_path / 'bogus.tbl'
+        bogus.write_bytes(b'not an ephemeris table, clearly not one at all')
+        empty = tmp_path / 'empty.tbl'
+        empty.write_bytes(b'')
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            EphemerisTable(str(bogus))
+        with pytest.raises(ValueError):
+            EphemerisTable(str(empty))
+
+    def test_rejects_tables_of_older_versions(self, table_path, tmp_path):
+        """Test that tables built by an older version are not served."""
+        # Arrange
+        with open(table_path, 'rb') as table_file:
+            data = bytearray(table_file.read())
+        struct.pack_into('<H', data, 8, TABLE_VERSION - 1)
+        stale = tmp_path / 'stale.tbl'
+        stale.write_bytes(bytes(data))
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            EphemerisTable(str(stale))
+
+    def test_worker_processes_attach_to_table(self, table_path):
+        """Test that pool workers map the table and return the same results."""
+        # Arrange
+        requests = [(date(2024, 1, 1) + timedelta(days=i), '22:00:00', None) for i in range(6)]
+        expected = [AstronomyAdapter().get_moon_data(*request) for request in requests]
+
+        # Act
+        with ProcessPoolAstronomyAdapter(max_workers=2, chunk_size=2, table_path=table_path) as adapter:
+            result = list(adapter.get_moon_data_batch(requests))
+
+        # Assert
+        assert result == expected
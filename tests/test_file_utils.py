@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+import time
+import pytest
+from app.utils.file_utils import atomic_write_bytes, create_file_once
+
+PAYLOAD_SIZE = 1024 * 1024
+
+def _create_when_started(path, log_path, started, results):
+    """Process body: create the file once, logging every call to produce."""
+    def produce():
+        with open(log_path, 'a') as log:
+            log.write('render\n')
+        time.sleep(0.05)  # Widen the window for a second render
+        return b'content'
+
+    started.wait()
+    results.put(create_file_once(path, produce))
+
+def _rewrite(path, marker, count):
+    """Process body: replace the file with uniform payloads many times."""
+    for _ in range(count):
+        atomic_write_bytes(path, bytes([marker]) * PAYLOAD_SIZE)
+
+class TestFileUtils:
+    """Tests for atomic, single-producer file creation."""
+
+    def test_create_file_once_across_processes(self, tmp_path):
+        """Test that processes racing for the same file produce it exactly once."""
+        # Arrange
+        context = multiprocessing.get_context('spawn')
+        path = str(tmp_path / 'image.png')
+        log_path = str(tmp_path / 'renders.log')
+        started = context.Event()
+        results = context.Queue()
+        processes = [context.Process(target=_create_when_started, args=(path, log_path, started, results))
+                     for _ in range(6)]
+        for process in processes:
+            process.start()
+
+        # Act
+        started.set()
+        created = [results.get(timeout=60) for _ in processes]
+        for process in processes:
+            process.join()
+
+        # Assert
+        with open(log_path) as log:
+            assert log.read().count('render') == 1
+        assert sorted(created) == [False] * 5 + [True]
+        with open(path, 'rb') as created_file:
+            assert created_file.read() == b'content'
+
+    def test_readers_never_see_partial_files(self, tmp_path):
+        """Test that concurrent replacements are always read whole."""
+        # Arrange
+        context = multiprocessing.get_context('spawn')
+        path = str(tmp_path / 'image.png')
+        atomic_write_bytes(path, bytes([0]) * PAYLOAD_SIZE)
+        writers = [context.Process(target=_rewrite, args=(path, marker, 30)) for marker in (1, 2)]
+
+        # Act
+        for writer in writers:
+            writer.start()
+        reads = []
+        while any(writer.is_alive() for writer in writers):
+            with open(path, 'rb') as image_file:
+                reads.append(image_file.read())
+        for writer in writers:
+            writer.join()
+
+        # Assert
+        assert reads
+        assert all(len(data) == PAYLOAD_SIZE and data.count(data[:1]) == PAYLOAD_SIZE for data in reads)
+        assert not [name for name in os.listdir(tmp_path) if name.startswith('.tmp-')]
+
+    def test_failed_produce_leaves_no_file(self, tmp_path):
+        """Test that an error while producing creates nothing and a retry succeeds."""
+        # Arrange
+        path = str(tmp_path / 'image.png')
+
+        def fail():
+            raise RuntimeError('render failed')
+
+        # Act
+        with pytest.raises(RuntimeError):
+            create_file_once(path, fail)
+        created = create_file_once(path, lambda: b'content')
+
+        # Assert
+        assert created is True
@@ -0,0 +1,83 @@
+import pytest
+from datetime import date
+from app.app import create_app
+from app.image_archive import ImageArchive, build_image_archive
+
+@pytest.fixture
+def archive_path(tmp_path):
+    """Build a small archive in a temporary directory."""
+    path = str(tmp_path / "images.pak")
+    build_image_archive(path, [
+        ("b.png", b"\x89PNG second"),
+        ("a.svg", b"<svg/>"),
+        ("b.png", b"\x89PNG replaced"),
+    ])
+    return path
+
+class TestImageArchive:
+    """Tests for the packed image archive."""
+
+    def test_entries_are_memoryview_slices(self, archive_path):
+        """Test that entries are returned as zero-copy slices with ETags."""
+        # Act
+        with ImageArchive(archive_path) as archive:
+            data, etag = archive.get("b.png")
+
+            # Assert
+            assert isinstance(data, memoryview)
+            assert data.tobytes() == b"\x89PNG replaced"
+            assert len(etag) == 32
+            assert list(archive.names()) == ["a.svg", "b.png"]
+            assert archive.get("missing.png") is None
+            data.release()
+
+    def test_rejects_invalid_files(self, tmp_path):
+        """Test that files that are not archives are rejected."""
+        # Arrange
+        bogus = tmp_path / "bogus.pak"
+        bogus.write_bytes(b"not an archive at all")
+        empty = tmp_path / "empty.pak"
+        empty.write_bytes(b"")
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            ImageArchive(str(bogus))
+        with pytest.raises(ValueError):
+            ImageArchive(str(empty))
+
+    def test_rejects_long_names(self, tmp_path):
+        """Test that names wider than the index field are rejected."""
+        with pytest.raises(ValueError):
+            build_image_archive(str(tmp_path / "x.pak"), [("n" * 65 + ".png", b"")])
+
+    def test_served_from_archive(self, archive_path):
+        """Test that the image route serves archived entries with ETag support."""
+        # Arrange
+        app = create_app(test_config={'TESTING': True, 'IMAGE_ARCHIVE_PATH': archive_path})
+        client = app.test_client()
+
+        # Act
+        response = client.get('/images/b.png')
+        cached = client.get('/images/b.png', headers={'If-None-Match': response.headers['ETag']})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.mimetype == 'image/png'
+        assert response.data == b"\x89PNG replaced"
+        assert cached.status_code == 304
+
+    def test_zero_copy_responses(self, archive_path):
+        """Test that the memoryview can be handed to the server directly."""
+        # Arrange
+        app = create_app(test_config={
+            'TESTING': True,
+            'IMAGE_ARCHIVE_PATH': archive_path,
+            'ARCHIVE_ZERO_COPY_RESPONSES': True
+        })
+
+        # Act
+        response = app.test_client().get('/images/a.svg')
+
+        # Assert
+        assert response.data == b"<svg/>"
+        assert response.headers['Content-Length'] == '6'
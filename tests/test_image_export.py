@@ -0,0 +1,99 @@
+import csv
+import io
+import os
+import tracemalloc
+import zipfile
+import pytest
+from datetime import date, timedelta
+from unittest.mock import patch
+from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.image_export import ImageExportService
+from app.image_provider import ImageProvider
+from app.moon_calculator import MoonCalculator
+
+@pytest.fixture
+def service(tmp_path):
+    """An export service over an empty images directory."""
+    return ImageExportService(
+        moon_calculator=MoonCalculator(astronomy_adapter=AstronomyAdapter()),
+        image_provider=ImageProvider(base_path=str(tmp_path))
+    )
+
+def read_zip(chunks):
+    """Join streamed chunks into an open ZIP archive."""
+    return zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+class TestImageExportService:
+    """Tests for the streaming ZIP export."""
+
+    def test_archive_has_manifest_and_deduplicated_images(self, service, tmp_path):
+        """Test that every date is in the manifest and each phase image is stored once."""
+        # Arrange
+        dates = [date(2024, 1, 1) + timedelta(days=offset) for offset in range(60)]
+
+        # Act
+        archive = read_zip(service.iter_zip(dates, [64, 128], ['png', 'svg']))
+
+        # Assert
+        assert archive.testzip() is None
+        rows = list(csv.DictReader(io.StringIO(archive.read('manifest.csv').decode('utf-8'))))
+        assert [row['date'] for row in rows] == [date_obj.isoformat() for date_obj in dates]
+        referenced = {row[column] for row in rows for column in ('png_64', 'svg_64', 'png_128', 'svg_128')}
+        images = [name for name in archive.namelist() if name != 'manifest.csv']
+        assert sorted(images) == sorted(referenced)
+        assert len(images) < 4 * len(dates)
+        assert os.listdir(tmp_path) == []  # Nothing written to disk
+
+    def test_reuses_cached_render(self, service, tmp_path):
+        """Test that an image the provider already generated is copied rather than rendered."""
+        # Arrange
+        _, illumination, phase_angle = next(service.moon_calculator.iter_phase_series(date(2024, 3, 10), 1))
+        cached_path = service.image_provider.generate_moon_image(illumination, phase_angle)
+
+        # Act
+        with patch.object(service.image_provider, 'render_moon_image') as mock_render:
+            archive = read_zip(service.iter_zip([date(2024, 3, 10)], [400], ['png']))
+
+        # Assert
+        mock_render.assert_not_called()
+        with open(cached_path, 'rb') as cached_file:
+            assert archive.read(f"images/400/{os.path.basename(cached_path)}") == cached_file.read()
+
+    def test_chunks_stream_per_entry(self, service):
+        """Test that the archive arrives in many chunks, none holding all images."""
+        # Arrange
+        dates = [date(2024, 1, 1) + timedelta(days=offset) for offset in range(30)]
+
+        # Act
+        chunks = list(service.iter_zip(dates, [256], ['png']))
+
+        # Assert
+        assert len(chunks) > 30
+        assert max(len(chunk) for chunk in chunks) < sum(len(chunk) for chunk in chunks) / 5
+
+    def test_memory_does_not_grow_with_dates(self, service):
+        """Test that ten times the dates need about the same peak memory."""
+        # Arrange
+        def peak_bytes(days):
+            dates = [date(2024, 1, 1) + timedelta(days=offset) for offset in range(days)]
+            tracemalloc.start()
+            try:
+                for _ in service.iter_zip(dates, [64], ['png']):
+                    pass
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        # Act
+        few, many = peak_bytes(60), peak_bytes(600)
+
+        # Assert
+        assert many < few * 1.5 + 256 * 1024
+
+    def test_rejects_unknown_format_and_size(self, service):
+        """Test that invalid formats and sizes fail before anything is streamed."""
+        # Act / Assert
+        with pytest.raises(ValueError):
+            next(service.iter_zip([date(2024, 1, 1)], [64], ['bmp']))
+        with pytest.raises(ValueError):
+            next(service.iter_zip([date(2024, 1, 1)], [4096], ['png']))
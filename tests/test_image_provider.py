@@ -1,8 +1,11 @@
 import pytest
+import multiprocessing
 import os
 from datetime import date
 from unittest.mock import patch, MagicMock
+from PIL import Image
 from app.image_provider import ImageProvider
+from app.image_archive import ImageArchive, build_image_archive
 from app.domain.moon_model import MoonPhaseData
 
 class TestImageProvider:
@@ -70,4 +73,194 @@ class TestImageProvider:
             
             # Verify that methods were called with expected arguments
             mock_image.new.assert_called_once()
-            mock_image.new.return_value.save.assert_called_once()
\ No newline at end of file
+            mock_image.new.return_value.save.assert_called_once()
+    
+    def test_get_moon_image_svg_format(self, tmp_path):
+        """Test that the SVG format renders one file per quantized phase."""
+        # Arrange
+        provider = ImageProvider(base_path=str(tmp_path), image_format="svg")
+        moon_data = MoonPhaseData(
+            date=date.today(),
+            illumination_percent=75.2,
+            phase_name="Waxing Gibbous",
+            phase_angle=135.0
+        )
+        
+        # Act
+        result = provider.get_moon_image(moon_data)
+        
+        # Assert
+        assert result == os.path.join(str(tmp_path), "moon_75_waxing.svg")
+        assert provider.get_moon_svg_path(74.9, 130.0) == result
+        # Hidden lock files aside
+        assert [name for name in os.listdir(str(tmp_path)) if not name.startswith(".")] == ["moon_75_waxing.svg"]
+    
+    def test_invalid_image_format(self, tmp_path):
+        """Test that unknown image formats are rejected."""
+        with pytest.raises(ValueError):
+            ImageProvider(base_path=str(tmp_path), image_format="bmp")
+    
+    def test_get_moon_image_prefers_archived_phase(self, tmp_path):
+        """Test that an exact phase rendering in the archive is used."""
+        # Arrange
+        archive_path = str(tmp_path / "images.pak")
+        build_image_archive(archive_path, [("moon_40_waning.png", b"\x89PNG")])
+        provider = ImageProvider(base_path=str(tmp_path), archive=ImageArchive(archive_path))
+        moon_data = MoonPhaseData(
+            date=date.today(),
+            illumination_percent=40.3,
+            phase_name="Waning Crescent",
+            phase_angle=250.0
+        )
+        
+        # Act
+        result = provider.get_moon_image(moon_data)
+        archived = provider.get_archived_image("moon_40_waning.png")
+        
+        # Assert
+        assert result == os.path.join(str(tmp_path), "moon_40_waning.png")
+        assert bytes(archived[0]) == b"\x89PNG"
+        assert provider.get_archived_image("other.png") is None
+    
+    def test_get_moon_image_archive_with_profile(self, tmp_path):
+        """Test that archives built with a non-PNG profile are matched by extension."""
+        # Arrange
+        archive_path = str(tmp_path / "images.pak")
+        build_image_archive(archive_path, [("moon_40_waning.webp", b"RIFF")])
+        provider = ImageProvider(base_path=str(tmp_path), archive=ImageArchive(archive_path),
+                                 encoding_profile="webp-lossless")
+        moon_data = MoonPhaseData(
+            date=date.today(),
+            illumination_percent=40.3,
+            phase_name="Waning Crescent",
+            phase_angle=250.0
+        )
+        
+        # Act
+        result = provider.get_moon_image(moon_data)
+        
+        # Assert
+        assert result == os.path.join(str(tmp_path), "moon_40_waning.webp")
+        assert not os.path.exists(result)  # Served from the archive, not rendered
+    
+    def test_generate_moon_image_with_profile(self, tmp_path):
+        """Test that generated images use the configured encoder profile."""
+        # Arrange
+        provider = ImageProvider(base_path=str(tmp_path), encoding_profile="webp-lossless")
+        
+        # Act
+        result = provider.generate_moon_image(30.0, 60.0)
+        
+        # Assert
+        assert result.endswith(".webp")
+        with open(result, "rb") as image_file:
+            assert image_file.read(4) == b"RIFF"
+    
+    def test_invalid_encoding_profile(self, tmp_path):
+        """Test that unknown encoder profiles are rejected."""
+        with pytest.raises(ValueError):
+            ImageProvider(base_path=str(tmp_path), encoding_profile="gif")
+    
+    def test_get_moon_image_apparent_size(self, tmp_path):
+        """Test that apparent-size images are keyed on the quantized size."""
+        # Arrange
+        provider = ImageProvider(base_path=str(tmp_path), apparent_size=True)
+        near = MoonPhaseData(date=date.today(), illumination_percent=99.5, phase_name="Full Moon",
+                             phase_angle=180.0, distance_km=357000.0)
+        also_near = MoonPhaseData(date=date.today(), illumination_percent=99.6, phase_name="Full Moon",
+                                  phase_angle=180.0, distance_km=357400.0)
+        far = MoonPhaseData(date=date.today(), illumination_percent=99.5, phase_name="Full Moon",
+                            phase_angle=180.0, distance_km=406000.0)
+        
+        # Act
+        near_path = provider.get_moon_image(near)
+        also_near_path = provider.get_moon_image(also_near)
+        far_path = provider.get_moon_image(far)
+        
+        # Assert
+        assert near_path == also_near_path
+        assert os.path.basename(near_path) == "moon_100_waxing_s108.png"
+        assert os.path.basename(far_path) == "moon_100_waxing_s94.png"
+        with Image.open(near_path) as near_image, Image.open(far_path) as far_image:
+            near_width = near_image.getbbox()[2] - near_image.getbbox()[0]
+            far_width = far_image.getbbox()[2] - far_image.getbbox()[0]
+        assert near_width == 400
+        assert far_width < near_width
+    
+    def test_quantize_apparent_scale(self):
+        """Test that apparent scales are rounded and clamped."""
+        assert ImageProvider.quantize_apparent_scale(384400.0) == 1.0
+        assert ImageProvider.quantize_apparent_scale(370000.0) == 1.04
+        assert ImageProvider.quantize_apparent_scale(300000.0) == 1.08
+        assert ImageProvider.quantize_apparent_scale(500000.0) == 0.92
+    
+    def test_concurrent_generation_renders_once(self, tmp_path):
+        """Test that processes generating the same phase share one complete file."""
+        # Arrange
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(4) as pool:
+            
+            # Act
+            results = pool.starmap(_generate_and_stat, [(str(tmp_path), 75.3, 135.0)] * 8)
+        
+        # Assert
+        paths, inodes = zip(*results)
+        assert set(paths) == {os.path.join(str(tmp_path), "moon_75_waxing.png")}
+        assert len(set(inodes)) == 1
+        assert sorted(os.listdir(tmp_path)) == [".moon_75_waxing.png.lock", "moon_75_waxing.png"]
+        with Image.open(paths[0]) as image:
+            assert image.size == (400, 400)
+
+    def test_get_moon_tile_pyramid(self, tmp_path):
+        """Test that tiles are rendered per level and that deeper levels sharpen the same moon."""
+        # Arrange
+        provider = ImageProvider(base_path=str(tmp_path))
+        
+        # Act
+        overview = provider.get_moon_tile(50.2, 90.0, 0, 0, 0)
+        deep = provider.get_moon_tile(50.2, 90.0, 5, 31, 16)
+        
+        # Assert
+        assert overview == os.path.join(str(tmp_path), "tiles", "overview", "moon_50_waxing.png")
+        assert os.path.basename(deep) == "moon_50_waxing_z5_31_16.png"
+        with Image.open(overview) as image:
+            assert image.size == (256, 256)
+            assert image.getpixel((200, 128))[:3] == (255, 255, 255)  # lit right half
+            assert image.getpixel((56, 128))[:3] == (0, 0, 0)
+            assert image.getpixel((2, 2))[3] == 0  # outside the disc
+        with Image.open(deep) as image:
+            assert image.size == (256, 256)
+            assert image.getpixel((0, 0))[:3] == (255, 255, 255)  # right limb, lit
+            assert image.getpixel((255, 255))[3] == 0  # beyond the limb
+    
+    def test_get_moon_tile_outside_pyramid(self, tmp_path):
+        """Test that tiles beyond the pyramid are rejected."""
+        # Arrange
+        provider = ImageProvider(base_path=str(tmp_path))
+        
+        # Act / Assert
+        with pytest.raises(ValueError):
+            provider.get_moon_tile(50.0, 90.0, 1, 2, 0)
+        with pytest.raises(ValueError):
+            provider.get_moon_tile(50.0, 90.0, 6, 0, 0)
+    
+    def test_tile_cache_evicts_but_keeps_overviews(self, tmp_path):
+        """Test that deep tiles stay within their disk budget while overviews are kept."""
+        # Arrange
+        provider = ImageProvider(base_path=str(tmp_path), tile_cache_bytes=20000)
+        provider.precompute_tile_overviews()
+        
+        # Act
+        paths = [provider.get_moon_tile(30.0, 270.0, 3, x, y) for x in range(8) for y in range(8)]
+        
+        # Assert
+        assert provider.tile_cache.stats()['bytes'] <= 20000
+        assert os.path.exists(paths[-1])
+        assert not os.path.exists(paths[0])
+        overviews = [name for name in os.listdir(tmp_path / "tiles" / "overview") if not name.startswith('.')]
+        assert len(overviews) == 202
+
+def _generate_and_stat(base_path, illumination_percent, phase_angle):
+    """Pool worker: generate an image and report its path and inode."""
+    path = ImageProvider(base_path=base_path).generate_moon_image(illumination_percent, phase_angle)
+    return path, os.stat(path).st_ino
@@ -0,0 +1,136 @@
+import pytest
+import io
+import numpy as np
+from xml.etree import ElementTree
+from PIL import Image, ImageDraw
+from app.utils.image_utils import (
+    render_phase_svg, render_phase_tile, svg_to_data_uri, quantize_illumination,
+    encode_image, measure_encoding_profiles, profile_extension, ENCODING_PROFILES
+)
+
+def make_moon(size=64):
+    """Create a small grey moon on transparency."""
+    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    ImageDraw.Draw(image).ellipse((0, 0, size, size), fill='white', outline='lightgray')
+    return image
+
+class TestPhaseSvg:
+    """Tests for the SVG moon phase renderer."""
+
+    def test_svg_is_small_and_well_formed(self):
+        """Test that every quantized phase renders a compact, parseable document."""
+        for illumination in range(0, 101, 5):
+            for phase_angle in (90.0, 270.0):
+                # Act
+                svg = render_phase_svg(float(illumination), phase_angle)
+
+                # Assert
+                assert len(svg.encode('utf-8')) < 1024
+                root = ElementTree.fromstring(svg)
+                assert root.get('viewBox') == '0 0 100 100'
+
+    def test_terminator_geometry(self):
+        """Test the terminator width and which limb is lit."""
+        # Act
+        waxing_crescent = render_phase_svg(25.0, 45.0)
+        waning_crescent = render_phase_svg(25.0, 315.0)
+        waxing_gibbous = render_phase_svg(75.0, 135.0)
+
+        # Assert - the terminator half-width is r * |1 - 2k| = 49.5 * 0.5
+        assert "A24.75 49.5" in waxing_crescent
+        assert "A49.5 49.5 0 0 1 50 99.5" in waxing_crescent
+        assert "A49.5 49.5 0 0 0 50 99.5" in waning_crescent
+        assert "0 0 0 50 0.5Z" in waxing_crescent
+        assert "0 0 1 50 0.5Z" in waxing_gibbous
+
+    def test_new_and_full_moon(self):
+        """Test that new and full moons need no terminator path."""
+        assert "<path" not in render_phase_svg(0.0, 0.0)
+        assert "<path" not in render_phase_svg(100.0, 180.0)
+        assert "fill='white'" in render_phase_svg(100.0, 180.0)
+
+    def test_renders_are_cached_per_quantized_phase(self):
+        """Test that nearby illuminations share one cached document."""
+        assert render_phase_svg(40.2, 100.0) is render_phase_svg(39.8, 100.0)
+        assert quantize_illumination(120.0) == 100.0
+        assert quantize_illumination(12.26, step=0.5) == 12.5
+
+    def test_svg_to_data_uri(self):
+        """Test that the data URI keeps markup characters escaped."""
+        # Act
+        uri = svg_to_data_uri(render_phase_svg(50.0, 90.0))
+
+        # Assert
+        assert uri.startswith("data:image/svg+xml;charset=utf-8,")
+        assert "<" not in uri and '"' not in uri and "#" not in uri
+
+class TestPhaseTile:
+    """Tests for rendering tiles of high-resolution moon images."""
+
+    def test_tiles_stitch_into_the_whole_image(self):
+        """Test that four tiles are exactly the quadrants of the image rendered at once."""
+        # Arrange
+        whole = render_phase_tile(37.0, 300.0, 128, 0, 0, tile_size=128)
+
+        # Act
+        tiles = {(x, y): render_phase_tile(37.0, 300.0, 128, x * 64, y * 64, tile_size=64)
+                 for x in range(2) for y in range(2)}
+
+        # Assert
+        for (x, y), tile in tiles.items():
+            assert tile.tobytes() == whole.crop((x * 64, y * 64, x * 64 + 64, y * 64 + 64)).tobytes()
+
+    def test_lit_fraction_matches_illumination(self):
+        """Test that the lit share of the disc follows the illuminated fraction."""
+        for illumination in (10.0, 50.0, 80.0):
+            # Act
+            tile = render_phase_tile(illumination, 90.0, 256, 0, 0)
+
+            # Assert
+            pixels = np.asarray(tile, dtype=np.float64)
+            lit = (pixels[..., 0] * pixels[..., 3]).sum() / (255 * pixels[..., 3].sum())
+            assert lit == pytest.approx(illumination / 100.0, abs=0.01)
+
+class TestEncodingProfiles:
+    """Tests for the image encoder profiles."""
+
+    @pytest.mark.parametrize("profile", sorted(ENCODING_PROFILES))
+    def test_encode_image(self, profile):
+        """Test that every profile produces a decodable image of the right format."""
+        # Act
+        data = encode_image(make_moon(), profile)
+
+        # Assert
+        decoded = Image.open(io.BytesIO(data))
+        assert decoded.format.lower() == profile_extension(profile)
+        assert decoded.size == (64, 64)
+        assert decoded.mode == ENCODING_PROFILES[profile]['mode']
+
+    def test_reduced_modes_are_smaller(self):
+        """Test that grayscale and palette profiles beat the RGBA default."""
+        # Arrange
+        image = make_moon(256)
+
+        # Act
+        default_size = len(encode_image(image, 'default'))
+
+        # Assert
+        assert len(encode_image(image, 'png-la')) < default_size
+        assert len(encode_image(image, 'png-palette')) < default_size
+
+    def test_unknown_profile(self):
+        """Test that unknown profiles are rejected."""
+        with pytest.raises(ValueError):
+            encode_image(make_moon(), 'jpeg-max')
+
+    def test_measure_encoding_profiles(self):
+        """Test that measurements report bytes and time per profile."""
+        # Act
+        results = measure_encoding_profiles([make_moon(), make_moon(32)], ['default', 'png-la'])
+
+        # Assert
+        assert [result['profile'] for result in results] == ['default', 'png-la']
+        for result in results:
+            assert result['images'] == 2
+            assert result['total_bytes'] > 0
+            assert result['mean_ms'] >= 0.0
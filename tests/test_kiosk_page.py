@@ -0,0 +1,56 @@
+import pytest
+from datetime import date, datetime
+from flask import Flask
+from kiosk_page import DailyPageCache, seconds_until_midnight
+
+@pytest.fixture
+def kiosk():
+    """Create a tiny app backed by a DailyPageCache with a controllable date."""
+    app = Flask(__name__)
+    state = {'today': date(2024, 1, 1), 'renders': 0}
+
+    def context():
+        state['renders'] += 1
+        return {'day': state['today'].isoformat()}
+
+    cache = DailyPageCache(app, "<p>{{ day }}</p>", context, today=lambda: state['today'])
+    app.add_url_rule('/', 'index', cache.make_response)
+    return app.test_client(), state
+
+class TestDailyPageCache:
+    """Tests for the shared kiosk page cache."""
+
+    def test_page_rendered_once_per_day(self, kiosk):
+        """Test that the page is only regenerated when the date changes."""
+        # Arrange
+        client, state = kiosk
+
+        # Act
+        first = client.get('/')
+        second = client.get('/')
+        state['today'] = date(2024, 1, 2)
+        third = client.get('/')
+
+        # Assert
+        assert first.data == second.data == b"<p>2024-01-01</p>"
+        assert third.data == b"<p>2024-01-02</p>"
+        assert state['renders'] == 2
+        assert first.headers['ETag'] != third.headers['ETag']
+
+    def test_matching_etag_returns_not_modified(self, kiosk):
+        """Test that a kiosk revalidating its current page gets a 304."""
+        # Arrange
+        client, _ = kiosk
+        etag = client.get('/').headers['ETag']
+
+        # Act
+        response = client.get('/', headers={'If-None-Match': etag})
+
+        # Assert
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_seconds_until_midnight(self):
+        """Test the cache lifetime calculation."""
+        assert seconds_until_midnight(datetime(2024, 1, 1, 23, 59, 0)) == 60
+        assert seconds_until_midnight(datetime(2024, 1, 1, 0, 0, 0)) == 86400
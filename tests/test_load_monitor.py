@@ -0,0 +1,95 @@
+import pytest
+import time
+from unittest.mock import patch
+from flask import Flask, Response, stream_with_context
+from app.load_monitor import LoadMonitor, init_load_monitor
+
+class TestLoadMonitor:
+    """Tests for overload detection."""
+
+    def test_in_flight_budget_with_hysteresis(self):
+        """Test that overload starts above the budget and ends only well below it."""
+        # Arrange
+        monitor = LoadMonitor(max_in_flight=4, p95_budget_ms=0, recovery_ratio=0.5)
+
+        # Act / Assert
+        for _ in range(4):
+            monitor.request_started()
+        assert monitor.overloaded() is False
+
+        monitor.request_started()
+        assert monitor.overloaded() is True
+
+        monitor.request_finished(1.0)
+        monitor.request_finished(1.0)
+        assert monitor.overloaded() is True  # 3 in flight, recovery needs 2 or fewer
+
+        monitor.request_finished(1.0)
+        assert monitor.overloaded() is False
+
+    def test_p95_budget(self):
+        """Test that slow recent requests cause overload once there are enough samples."""
+        # Arrange
+        monitor = LoadMonitor(max_in_flight=0, p95_budget_ms=100.0, min_samples=20)
+
+        # Act
+        for latency in [10.0] * 10 + [500.0] * 9:
+            monitor.request_started()
+            monitor.request_finished(latency)
+        too_few = monitor.overloaded()
+        monitor.request_started()
+        monitor.request_finished(500.0)
+
+        # Assert
+        assert too_few is False
+        assert monitor.overloaded() is True
+        assert monitor.stats()['p95_ms'] == 500.0
+
+    def test_recovers_when_latencies_age_out(self):
+        """Test that old latencies stop counting after the window."""
+        # Arrange
+        monitor = LoadMonitor(max_in_flight=0, p95_budget_ms=100.0, window_seconds=30.0, min_samples=1)
+        with patch('app.load_monitor.time.monotonic', return_value=1000.0):
+            monitor.request_started()
+            monitor.request_finished(500.0)
+            degraded = monitor.overloaded()
+
+        # Act
+        with patch('app.load_monitor.time.monotonic', return_value=1031.0):
+            recovered = not monitor.overloaded()
+
+        # Assert
+        assert degraded is True
+        assert recovered is True
+        assert monitor.stats()['p95_ms'] is None
+
+    def test_streaming_routes_are_not_tracked(self):
+        """Test that a slow streaming download does not make the app overloaded."""
+        # Arrange
+        app = Flask(__name__)
+        monitor = LoadMonitor(max_in_flight=1, p95_budget_ms=10.0, min_samples=1)
+        init_load_monitor(app, monitor, endpoints=('page',))
+
+        @app.route('/page')
+        def page():
+            return 'moon'
+
+        @app.route('/download')
+        def download():
+            def chunks():
+                for _ in range(3):
+                    time.sleep(0.02)
+                    yield b'chunk'
+            return Response(stream_with_context(chunks()))
+
+        client = app.test_client()
+
+        # Act
+        client.get('/download').get_data()
+        client.get('/download').get_data()
+        client.get('/page')
+
+        # Assert
+        assert monitor.overloaded() is False
+        assert monitor.stats()['in_flight'] == 0
+        assert monitor.stats()['p95_ms'] < 10.0
@@ -0,0 +1,79 @@
+import pytest
+from app.load_testing import (
+    LatencyRecorder, LocalServer, latency_histogram, parse_mix, percentile, run_load_test
+)
+
+class TestLoadTesting:
+    """Tests for the load-test harness."""
+
+    def test_parse_mix(self):
+        """Test that weight:path entries are parsed, including query strings."""
+        assert parse_mix(['6:/', '1:/animation?days=7&size=64']) == [
+            (6.0, '/'), (1.0, '/animation?days=7&size=64')]
+
+    @pytest.mark.parametrize('spec', ['/', '0:/', 'x:/', '1:images'])
+    def test_parse_mix_rejects_bad_entries(self, spec):
+        """Test that malformed mix entries are rejected."""
+        with pytest.raises(ValueError):
+            parse_mix([spec])
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles."""
+        values = [float(value) for value in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile(values, 100) == 100.0
+        assert percentile([], 50) is None
+
+    def test_histogram_counts_every_sample(self):
+        """Test that every latency lands in exactly one bucket, including overflow."""
+        # Act
+        buckets = latency_histogram([0.1, 1.0, 1.0, 5.0, 10 ** 7])
+
+        # Assert
+        assert sum(bucket['count'] for bucket in buckets) == 5
+        assert buckets[-1] == {'le_ms': None, 'count': 1}
+
+    def test_recorder_summary(self):
+        """Test that errors and status codes are summarized per path."""
+        # Arrange
+        recorder = LatencyRecorder()
+        recorder.record('/', 200, 2.0, degraded=True)
+        recorder.record('/', 500, 4.0)
+        recorder.record('/missing', None, 1.0)
+
+        # Act
+        summary = recorder.summary(duration_s=1.0)
+
+        # Assert
+        assert summary['requests'] == 3
+        assert summary['errors'] == 2
+        assert summary['degraded'] == 1
+        assert summary['throughput_rps'] == 3.0
+        assert summary['status_codes'] == {'200': 1, '500': 1, 'connection_error': 1}
+        assert summary['paths']['/']['errors'] == 1
+
+    def test_load_test_against_local_server(self):
+        """Test a short closed-loop run with a cold and a warm phase."""
+        # Act
+        with LocalServer(test_config={'TESTING': True}) as server:
+            report = run_load_test(server.url, [(1.0, '/'), (1.0, '/missing.png')],
+                                   duration_s=0.5, cold_duration_s=0.2, concurrency=2, seed=1)
+
+        # Assert
+        assert set(report['phases']) == {'cold', 'warm'}
+        warm = report['phases']['warm']
+        assert warm['requests'] > 0
+        assert warm['status_codes'].get('200', 0) > 0
+        assert warm['paths']['/missing.png']['errors'] == warm['paths']['/missing.png']['requests']
+        assert warm['latency_ms']['p50'] <= warm['latency_ms']['p99']
+
+    def test_open_loop_run(self):
+        """Test that a fixed arrival rate produces roughly that many requests."""
+        # Act
+        with LocalServer(test_config={'TESTING': True}) as server:
+            report = run_load_test(server.url, [(1.0, '/')], duration_s=0.5, rate=40, concurrency=4)
+
+        # Assert
+        assert report['config']['mode'] == 'open'
+        assert 15 <= report['phases']['warm']['requests'] <= 25
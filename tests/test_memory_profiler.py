@@ -0,0 +1,89 @@
+import pytest
+from datetime import date
+from unittest.mock import MagicMock
+from app.app import create_app
+from app.app_service import AppService
+from app.domain.moon_model import MoonPhaseData
+from app.memory_profiler import MemoryProfiler
+
+@pytest.fixture
+def profiler():
+    """A started profiler, stopped after the test."""
+    profiler = MemoryProfiler()
+    profiler.start()
+    yield profiler
+    profiler.stop()
+
+class TestMemoryProfiler:
+    """Tests for the tracemalloc stage profiler."""
+
+    def test_stage_records_peak_and_net(self, profiler):
+        """Test that a stage is charged for what it allocates and what it keeps."""
+        # Arrange
+        kept = []
+
+        # Act
+        with profiler.stage('allocate'):
+            temporary = bytearray(1_000_000)
+            kept.append(bytearray(100_000))
+            del temporary
+        report = profiler.report()
+
+        # Assert
+        stats = report['stages']['allocate']
+        assert stats['calls'] == 1
+        assert stats['peak_bytes'] >= 1_100_000
+        assert 100_000 <= stats['net_bytes'] < 1_000_000
+        assert report['enabled'] is True
+        assert any(site['site'].startswith(__file__) for site in report['top_allocations'])
+
+    def test_stopped_profiler_records_nothing(self):
+        """Test that stages are free no-ops while the profiler is stopped."""
+        # Arrange
+        profiler = MemoryProfiler()
+
+        # Act
+        with profiler.stage('idle'):
+            bytearray(1000)
+
+        # Assert
+        assert profiler.report() == {'enabled': False, 'traced': None, 'stages': {}, 'top_allocations': []}
+
+    def test_app_service_stages(self, profiler):
+        """Test that complete moon data is profiled per stage."""
+        # Arrange
+        calculator = MagicMock()
+        calculator.calculate_moon_phase.return_value = MoonPhaseData(
+            date=date(2024, 3, 1), illumination_percent=65.0, phase_name="Waxing Gibbous", phase_angle=120.0)
+        service = AppService(moon_calculator=calculator, image_provider=MagicMock(), profiler=profiler)
+
+        # Act
+        service.get_complete_moon_data(date(2024, 3, 1))
+
+        # Assert
+        assert set(profiler.report()['stages']) == {'calculate', 'visualize', 'serialize'}
+
+    def test_admin_endpoint_requires_token(self):
+        """Test that the memory report is only served with the admin token."""
+        # Arrange
+        disabled = create_app(test_config={'TESTING': True}).test_client()
+        app = create_app(test_config={'TESTING': True, 'ADMIN_TOKEN': 'secret'})
+        test_client = app.test_client()
+
+        # Act
+        missing = disabled.get('/admin/memory', headers={'Authorization': 'Bearer secret'})
+        wrong = test_client.get('/admin/memory', headers={'Authorization': 'Bearer guess'})
+        app.extensions['memory_profiler'].start()
+        try:
+            test_client.get('/?date=2024-03-01')
+            allowed = test_client.get('/admin/memory?limit=3', headers={'Authorization': 'Bearer secret'})
+        finally:
+            app.extensions['memory_profiler'].stop()
+
+        # Assert
+        assert missing.status_code == 404
+        assert wrong.status_code == 403
+        assert allowed.status_code == 200
+        assert allowed.get_json()['enabled'] is True
+        assert 'calculate' in allowed.get_json()['stages']
+        assert len(allowed.get_json()['top_allocations']) <= 3
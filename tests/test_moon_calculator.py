@@ -76,4 +76,27 @@ class TestMoonCalculator:
         # Just make sure it's calling the adapter correctly and returning a date and name
         next_date, next_name = calculator.get_next_phase_date(today, "Waxing Crescent")
         assert isinstance(next_date, date)
-        assert isinstance(next_name, str)
\ No newline at end of file
+        assert isinstance(next_name, str)
+    
+    def test_default_time_is_used_for_dates(self):
+        """Test that phases are computed at the configured default time unless a time is given."""
+        # Arrange
+        mock_adapter = MagicMock()
+        mock_adapter.get_phase_state.return_value = {'illumination': 0.5, 'phase_angle': 90.0}
+        mock_adapter.calculate_illumination.return_value = 50.0
+        mock_adapter.calculate_phase_angle.return_value = 90.0
+        mock_adapter.calculate_distance_km.return_value = None
+        mock_adapter.get_moon_data.return_value = {
+            name: date(2024, 1, 8) for name in
+            ('next_full_moon', 'next_new_moon', 'next_first_quarter', 'next_last_quarter')
+        }
+        calculator = MoonCalculator(astronomy_adapter=mock_adapter, default_time='03:30:00')
+        
+        # Act
+        next(calculator.iter_phase_series(date(2024, 1, 1), 1))
+        next(calculator.iter_phase_series(date(2024, 1, 1), 1, '12:00:00'))
+        calculator.calculate_moon_phase(date(2024, 1, 1))
+        
+        # Assert
+        assert [call.args[1] for call in mock_adapter.get_phase_state.call_args_list] == ['03:30:00', '12:00:00']
+        assert {call.args[1] for call in mock_adapter.get_moon_data.call_args_list} == {'03:30:00'}
@@ -0,0 +1,71 @@
+import pytest
+from datetime import date
+from unittest.mock import MagicMock
+from xml.etree import ElementTree
+from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.moon_curve import MoonCurveService, render_curve_svg
+
+class TestMoonCurveService:
+    """Tests for the intraday moon curve."""
+
+    def test_night_curve_in_local_time(self):
+        """Test that a night runs from 6 PM to 6 AM local time."""
+        # Arrange
+        service = MoonCurveService(astronomy_adapter=AstronomyAdapter())
+
+        # Act
+        curve = service.get_curve(date(2024, 3, 24), offset_minutes=-300, points=13)
+
+        # Assert
+        assert curve['tz_offset_minutes'] == -300
+        assert curve['points'][0]['time'] == '2024-03-24T18:00-05:00'
+        assert curve['points'][-1]['time'] == '2024-03-25T06:00-05:00'
+        assert len(curve['points']) == 13
+        assert all(96.0 < point['illumination_percent'] <= 100.0 for point in curve['points'])  # full moon of 3/25
+
+    def test_curves_are_cached_per_bucket(self):
+        """Test that offsets in the same bucket share one batched computation."""
+        # Arrange
+        adapter = MagicMock(wraps=AstronomyAdapter())
+        service = MoonCurveService(astronomy_adapter=adapter)
+
+        # Act
+        first = service.get_curve(date(2024, 3, 24), offset_minutes=60, points=24)
+        second = service.get_curve(date(2024, 3, 24), offset_minutes=64, points=24)
+        service.get_curve(date(2024, 3, 24), offset_minutes=60, points=48)
+
+        # Assert
+        assert first is second
+        assert adapter.get_phase_curve.call_count == 2
+
+    def test_timezone_bucket(self):
+        """Test that offsets are rounded to 15 minutes and clamped."""
+        assert MoonCurveService.timezone_bucket(345) == 345  # Nepal
+        assert MoonCurveService.timezone_bucket(-301) == -300
+        assert MoonCurveService.timezone_bucket(2000) == 14 * 60
+
+    def test_rejects_invalid_span_and_points(self):
+        """Test that unknown spans and resolutions are rejected."""
+        # Arrange
+        service = MoonCurveService(astronomy_adapter=AstronomyAdapter())
+
+        # Act / Assert
+        with pytest.raises(ValueError):
+            service.get_curve(date(2024, 3, 24), span='week')
+        with pytest.raises(ValueError):
+            service.get_curve(date(2024, 3, 24), points=1000)
+
+    def test_sparkline_svg(self):
+        """Test that the sparkline is well-formed SVG with one point per sample."""
+        # Arrange
+        curve = MoonCurveService(astronomy_adapter=AstronomyAdapter()).get_curve(date(2024, 3, 24), points=20)
+
+        # Act
+        svg = render_curve_svg(curve)
+
+        # Assert
+        root = ElementTree.fromstring(svg)
+        polylines = root.findall('{http://www.w3.org/2000/svg}polyline')
+        assert len(polylines) == 2
+        assert all(len(polyline.get('points').split()) == 20 for polyline in polylines)
+        assert 'highest at' in root.get('aria-label')
@@ -108,7 +108,8 @@ class TestMoonPhaseData:
             phase_name="Waxing Gibbous",
             phase_angle=150.0,
             next_phase_date=next_phase_date,
-            next_phase_name="Full Moon"
+            next_phase_name="Full Moon",
+            distance_km=370000.0
         )
         
         # Act
@@ -121,4 +122,5 @@ class TestMoonPhaseData:
         assert result["phase_angle"] == 150.0
         assert result["next_phase_date"] == next_phase_date
         assert result["next_phase_name"] == "Full Moon"
-        assert result["days_until_next_phase"] == 2
\ No newline at end of file
+        assert result["days_until_next_phase"] == 2
+        assert result["distance_km"] == 370000.0
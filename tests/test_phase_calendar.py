@@ -0,0 +1,53 @@
+from datetime import datetime
+from unittest.mock import patch
+from app.phase_calendar import calendar_etag, format_phase_event, iter_phase_calendar
+
+class TestPhaseCalendar:
+    """Tests for the iCalendar phase subscription."""
+
+    def test_calendar_wraps_one_event_per_phase(self):
+        """Test that the document is a VCALENDAR with a VEVENT per phase and CRLF lines."""
+        # Act
+        text = ''.join(iter_phase_calendar(2024, 2024))
+
+        # Assert
+        assert text.startswith('BEGIN:VCALENDAR\r\nVERSION:2.0\r\n')
+        assert text.endswith('END:VCALENDAR\r\n')
+        assert text.count('BEGIN:VEVENT') == text.count('END:VEVENT') == 50
+        assert '\n' not in text.replace('\r\n', '')
+        assert all(len(line.encode('utf-8')) <= 75 for line in text.split('\r\n'))
+
+    def test_calendar_is_streamed_chunk_by_chunk(self):
+        """Test that the calendar is produced one event at a time."""
+        # Arrange
+        events = iter([(datetime(2024, 1, 4, 3, 30, 25), 'Last Quarter')])
+
+        # Act
+        with patch('app.phase_calendar.iter_phase_events', return_value=events):
+            chunks = list(iter_phase_calendar(2024, 2024))
+
+        # Assert
+        assert len(chunks) == 3
+        assert chunks[1] == format_phase_event(datetime(2024, 1, 4, 3, 30, 25), 'Last Quarter')
+
+    def test_event_format(self):
+        """Test the fields of one VEVENT."""
+        # Act
+        event = format_phase_event(datetime(2024, 10, 17, 11, 26, 21), 'Full Moon')
+
+        # Assert
+        assert event == (
+            'BEGIN:VEVENT\r\n'
+            'UID:full-moon-20241017T112621Z@moon-phase\r\n'
+            'DTSTAMP:20241017T112621Z\r\n'
+            'DTSTART:20241017T112621Z\r\n'
+            'SUMMARY:Full Moon\r\n'
+            'TRANSP:TRANSPARENT\r\n'
+            'END:VEVENT\r\n'
+        )
+
+    def test_etag_depends_on_years(self):
+        """Test that each range of years has its own entity tag."""
+        # Act / Assert
+        assert calendar_etag(2024, 2025) == calendar_etag(2024, 2025)
+        assert calendar_etag(2024, 2025) != calendar_etag(2024, 2026)
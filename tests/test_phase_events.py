@@ -0,0 +1,56 @@
+import pytest
+import ephem
+from datetime import datetime
+from unittest.mock import patch
+from app.adapters.phase_events import PHASE_EVENT_NAMES, iter_phase_events
+
+SEARCHES = {
+    'New Moon': ephem.next_new_moon,
+    'First Quarter': ephem.next_first_quarter_moon,
+    'Full Moon': ephem.next_full_moon,
+    'Last Quarter': ephem.next_last_quarter_moon,
+}
+
+class TestIterPhaseEvents:
+    """Tests for the phase event generator."""
+
+    def test_events_match_ephem_searches(self):
+        """Test that every event of two years is within a second of ephem's search."""
+        # Act
+        events = list(iter_phase_events(datetime(2024, 1, 1), datetime(2026, 1, 1)))
+
+        # Assert
+        assert len(events) == 99
+        for instant, phase_name in events:
+            expected = SEARCHES[phase_name](ephem.Date(instant) - 1).datetime()
+            assert abs((expected - instant).total_seconds()) <= 1
+
+    def test_events_are_ordered_quarters(self):
+        """Test that the events are ascending and cycle through the four phases."""
+        # Act
+        events = list(iter_phase_events(datetime(2024, 1, 1), datetime(2025, 1, 1)))
+
+        # Assert
+        names = [phase_name for _, phase_name in events]
+        assert names[0] == 'Last Quarter'  # 2024-01-04 03:30 UTC
+        assert all(PHASE_EVENT_NAMES[(PHASE_EVENT_NAMES.index(first) + 1) % 4] == second
+                   for first, second in zip(names, names[1:]))
+        assert all(first[0] < second[0] for first, second in zip(events, events[1:]))
+
+    def test_generator_is_lazy_and_does_not_search(self):
+        """Test that events are computed as consumed, without ephem.next_* calls."""
+        # Arrange
+        with patch('ephem.next_full_moon') as mock_search:
+            events = iter_phase_events(datetime(2024, 1, 1), datetime(2100, 1, 1))
+
+            # Act
+            first = next(events)
+
+        # Assert
+        assert first == (datetime(2024, 1, 4, 3, 30, 25), 'Last Quarter')
+        mock_search.assert_not_called()
+
+    def test_empty_range(self):
+        """Test that a range without a phase yields nothing."""
+        # Act / Assert
+        assert list(iter_phase_events(datetime(2024, 1, 5), datetime(2024, 1, 6))) == []
@@ -0,0 +1,56 @@
+import pytest
+from datetime import date, timedelta
+from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.adapters.process_pool_adapter import ProcessPoolAstronomyAdapter
+
+class TestProcessPoolAstronomyAdapter:
+    """Tests for the ProcessPoolAstronomyAdapter component."""
+
+    def test_get_moon_data_batch_matches_in_process_results(self):
+        """Test that batch results match the in-process adapter and keep request order."""
+        # Arrange
+        start = date(2024, 1, 1)
+        location = {'latitude': 51.5, 'longitude': -0.1, 'elevation': 10.0}
+        requests = [(start + timedelta(days=i), "22:00:00", location if i % 2 else None)
+                    for i in range(10)]
+        expected = [AstronomyAdapter().get_moon_data(*request) for request in requests]
+
+        # Act
+        with ProcessPoolAstronomyAdapter(max_workers=2, chunk_size=3) as adapter:
+            result = list(adapter.get_moon_data_batch(iter(requests)))
+
+        # Assert
+        assert result == expected
+
+    def test_get_moon_data_batch_can_stop_early(self):
+        """Test that a partially consumed stream can be abandoned and the pool shut down."""
+        # Arrange
+        adapter = ProcessPoolAstronomyAdapter(max_workers=1, chunk_size=2, max_pending_chunks=2)
+        requests = ((date(2024, 1, 1) + timedelta(days=i), "22:00:00", None) for i in range(1000))
+
+        # Act
+        stream = adapter.get_moon_data_batch(requests)
+        first = next(stream)
+        stream.close()
+        adapter.shutdown(cancel_pending=True)
+
+        # Assert
+        assert 'phase_angle' in first
+        assert adapter._executor is None
+
+    def test_get_moon_data_runs_in_process(self):
+        """Test that single calls behave like the base adapter."""
+        # Arrange
+        adapter = ProcessPoolAstronomyAdapter(max_workers=1)
+
+        # Act
+        result = adapter.get_moon_data(date(2024, 1, 1))
+
+        # Assert
+        assert result == AstronomyAdapter().get_moon_data(date(2024, 1, 1))
+        assert adapter._executor is None
+
+    def test_invalid_chunk_size(self):
+        """Test that a non-positive chunk size is rejected."""
+        with pytest.raises(ValueError):
+            ProcessPoolAstronomyAdapter(chunk_size=0)
@@ -0,0 +1,146 @@
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import pytest
+from hypothesis import HealthCheck, given, settings, strategies as st
+
+from app.app import create_app
+from app.app_service import AppService
+from app.adapters.astronomy_adapter import AstronomyAdapter
+from app.image_provider import ImageProvider
+from app.moon_calculator import MoonCalculator
+
+# Resource-bound regression tests; excluded by default, run with: pytest -m resource
+pytestmark = pytest.mark.resource
+
+RESOURCE_SETTINGS = settings(
+    max_examples=25,
+    deadline=None,
+    suppress_health_check=[HealthCheck.too_slow, HealthCheck.function_scoped_fixture],
+)
+
+# Generated images are keyed on the illumination rounded to 1% and on waxing
+# or waning, so no sequence of requests may create more files than this
+IMAGE_QUOTA = 101 * 2
+
+# Memory the app may keep after a warm-up, whatever it is asked for
+MEMORY_GROWTH_BUDGET_BYTES = 2 * 1024 * 1024
+
+# Uncached moon data may cost this many times one bare position computation
+# (about 50x today: two next-phase searches plus the image lookup)
+TIME_BUDGET_MULTIPLE = 150
+
+dates = st.dates(min_value=date(1950, 1, 1), max_value=date(2090, 12, 31))
+requests = st.lists(
+    st.one_of(
+        st.just('/'),
+        st.just('/api/moon'),
+        dates.map(lambda d: f'/?date={d.isoformat()}'),
+        st.integers(min_value=1990, max_value=2060).map(lambda year: f'/animation?start={year}-01-01&days=3&size=64'),
+    ),
+    min_size=1,
+    max_size=40,
+)
+
+@pytest.fixture(scope='module')
+def images_dir():
+    """One images directory shared by all examples, so growth accumulates."""
+    path = tempfile.mkdtemp(prefix='moon-images-')
+    yield path
+    shutil.rmtree(path)
+
+@pytest.fixture(scope='module')
+def bounded_app():
+    """An app with small caches, warmed up so one-time allocations are done."""
+    app = create_app(test_config={
+        'TESTING': True,
+        'MOON_DATA_CACHE_SIZE': 16,
+        'PAGE_CACHE_SIZE': 8,
+        'PREFETCH_DAYS': 0,
+    })
+    test_client = app.test_client()
+    for offset in range(40):
+        test_client.get(f'/?date={(date(2000, 1, 1) + timedelta(days=offset)).isoformat()}')
+        test_client.get(f'/animation?start={2000 + offset}-01-01&days=3&size=64')
+    return app
+
+def _image_files(path):
+    """Images in a directory, without hidden lock files."""
+    return [name for name in os.listdir(path) if not name.startswith('.')]
+
+class TestResourceBounds:
+    """Property-based tests that resource use stays bounded."""
+
+    @RESOURCE_SETTINGS
+    @given(phases=st.lists(st.tuples(st.floats(0.0, 100.0), st.floats(0.0, 360.0)), min_size=1, max_size=20))
+    def test_generated_images_stay_within_quota(self, images_dir, phases):
+        """Test that image generation never creates more files than there are quantized phases."""
+        # Arrange
+        provider = ImageProvider(base_path=images_dir)
+
+        # Act
+        paths = [provider.generate_moon_image(illumination, angle) for illumination, angle in phases]
+        files_before_repeat = len(_image_files(images_dir))
+        repeated = [provider.generate_moon_image(illumination, angle) for illumination, angle in phases]
+
+        # Assert
+        assert repeated == paths
+        assert len(_image_files(images_dir)) == files_before_repeat
+        assert files_before_repeat <= IMAGE_QUOTA
+
+    @RESOURCE_SETTINGS
+    @given(paths=requests)
+    def test_caches_and_memory_stay_bounded(self, bounded_app, paths):
+        """Test that random requests keep caches within their limits and memory flat."""
+        # Arrange
+        test_client = bounded_app.test_client()
+        app_service = bounded_app.extensions['app_service']
+        page_cache = bounded_app.extensions['page_cache']
+        tracemalloc.start()
+        try:
+            start, _ = tracemalloc.get_traced_memory()
+
+            # Act
+            for path in paths:
+                assert test_client.get(path).status_code == 200
+            end, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Assert
+        assert len(app_service.cache) <= app_service.cache.max_entries
+        assert len(page_cache) <= page_cache.max_entries
+        assert end - start < MEMORY_GROWTH_BUDGET_BYTES
+
+    @RESOURCE_SETTINGS
+    @given(days=st.lists(dates, min_size=20, max_size=40, unique=True))
+    def test_uncached_call_time_within_budget(self, days):
+        """Test that computing moon data costs a bounded multiple of the benchmark's position computation."""
+        # Arrange
+        adapter = AstronomyAdapter()
+        service = AppService(
+            moon_calculator=MoonCalculator(astronomy_adapter=adapter),
+            image_provider=ImageProvider(base_path=os.path.join('app', 'static', 'images'))
+        )
+        service.get_complete_moon_data(days[0])  # Warm up
+
+        # Act
+        baseline = _best_time_per_call(adapter.get_phase_state, days)
+        per_call = _best_time_per_call(service.get_complete_moon_data, days)
+
+        # Assert
+        assert per_call < TIME_BUDGET_MULTIPLE * baseline
+
+def _best_time_per_call(function, days, repeats=3):
+    """Best mean time per call over several runs, as in benchmark_astronomy.py."""
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for day in days:
+            function(day)
+        best = min(best, time.perf_counter() - started)
+    return best / len(days)
@@ -0,0 +1,87 @@
+import pytest
+import ephem
+from datetime import date, datetime
+from app.adapters.rise_set_adapter import RiseSetAdapter, ephem_days_to_datetime
+
+SITES = [
+    {'latitude': 51.5, 'longitude': -0.1},
+    {'latitude': 40.7, 'longitude': -74.0},
+    {'latitude': -33.9, 'longitude': 151.2},
+    {'latitude': 0.0, 'longitude': 0.0},
+]
+
+def ephem_event(location, method, date_obj):
+    """Get an event from a single ephem.Observer, or None if it falls after the day."""
+    observer = ephem.Observer()
+    observer.lat = str(location['latitude'])
+    observer.lon = str(location['longitude'])
+    start = ephem.Date(date_obj.strftime('%Y/%m/%d'))
+    event = getattr(observer, method)(ephem.Moon(), start=start)
+    return event.datetime() if event < start + 1 else None
+
+class TestRiseSetAdapter:
+    """Tests for the batch moonrise/moonset adapter."""
+
+    @pytest.mark.parametrize('name, method', [
+        ('moonrise', 'next_rising'), ('moonset', 'next_setting'), ('transit', 'next_transit'),
+    ])
+    def test_events_match_ephem(self, name, method):
+        """Test that batch events agree with ephem's per-observer search."""
+        # Arrange
+        adapter = RiseSetAdapter()
+        date_obj = date(2024, 3, 15)
+
+        # Act
+        results = adapter.get_rise_set_batch(date_obj, SITES)
+
+        # Assert
+        for location, result in zip(SITES, results):
+            expected = ephem_event(location, method, date_obj)
+            if expected is None:
+                assert result[name] is None
+            else:
+                assert abs((result[name] - expected).total_seconds()) < 60
+
+    def test_moon_that_never_sets(self):
+        """Test that days without a rise or set return None for those events."""
+        # Act: in mid-March 2024 the Moon stays above the horizon at 78°N
+        result = RiseSetAdapter().get_rise_set_batch(date(2024, 3, 15), [{'latitude': 78.0, 'longitude': 15.0}])[0]
+
+        # Assert
+        assert result['moonrise'] is None
+        assert result['moonset'] is None
+        assert isinstance(result['transit'], datetime)
+
+    def test_track_is_computed_once_per_day(self):
+        """Test that every batch for the same day reuses one Moon track."""
+        # Arrange
+        adapter = RiseSetAdapter()
+
+        # Act
+        first = adapter.get_track(date(2024, 3, 15))
+        adapter.get_rise_set_batch(date(2024, 3, 15), SITES)
+
+        # Assert
+        assert adapter.get_track(date(2024, 3, 15)) is first
+
+    def test_worker_pool_gives_same_results(self):
+        """Test that splitting a batch across processes keeps results and order."""
+        # Arrange
+        locations = SITES * 5
+        serial = RiseSetAdapter().get_rise_set_batch(date(2024, 3, 15), locations)
+
+        # Act
+        with RiseSetAdapter(max_workers=2, parallel_threshold=1, chunk_size=3) as adapter:
+            parallel = adapter.get_rise_set_batch(date(2024, 3, 15), locations)
+
+        # Assert
+        assert parallel == serial
+
+    def test_empty_batch(self):
+        """Test that an empty location list gives an empty result."""
+        assert RiseSetAdapter().get_rise_set_batch(date(2024, 3, 15), []) == []
+
+    def test_ephem_days_to_datetime(self):
+        """Test conversion of ephem day numbers."""
+        assert ephem_days_to_datetime(float(ephem.Date('2024/03/15 12:30:00'))) == datetime(2024, 3, 15, 12, 30)
+        assert ephem_days_to_datetime(float('nan')) is None
@@ -0,0 +1,90 @@
+import pytest
+import gzip
+import json
+import os
+from datetime import date
+from app.app import create_app
+from app.static_export import StaticSiteExporter
+from app.image_archive import build_image_archive
+from app.image_provider import ImageProvider
+
+@pytest.fixture
+def exporter(tmp_path):
+    """Create an exporter writing into a temporary directory."""
+    app = create_app(test_config={'TESTING': True})
+    return StaticSiteExporter(app, str(tmp_path / "site"))
+
+class TestStaticSiteExporter:
+    """Tests for the StaticSiteExporter component."""
+
+    def test_export_range(self, exporter):
+        """Test that each date gets a page, JSON and compressed siblings."""
+        # Act
+        page_dirs = exporter.export_range(date(2024, 1, 1), date(2024, 1, 3))
+
+        # Assert
+        assert len(page_dirs) == 3
+        page_dir = os.path.join(exporter.output_dir, "2024", "01", "02")
+        assert page_dir in page_dirs
+
+        with open(os.path.join(page_dir, "index.html"), encoding="utf-8") as page:
+            html = page.read()
+        with gzip.open(os.path.join(page_dir, "index.html.gz"), "rt", encoding="utf-8") as page:
+            assert page.read() == html
+
+        with open(os.path.join(page_dir, "moon.json")) as data_file:
+            moon_data = json.load(data_file)
+        assert moon_data["date"] == "2024-01-02"
+        assert moon_data["phase_name"] in html
+
+        # Archived pages stay on their date and link to their neighbours
+        assert "data-api-url" not in html
+        assert 'href="/2024/01/01/"' in html
+        assert 'href="/2024/01/03/"' in html
+
+        # The referenced image and static assets are exported alongside
+        assert os.path.exists(os.path.join(exporter.output_dir, "images", moon_data["image_filename"]))
+        assert os.path.exists(os.path.join(exporter.output_dir, "static", "css", "styles.css.gz"))
+
+    def test_export_date_with_image_archive(self, tmp_path):
+        """Test that images served from the packed archive are exported from it."""
+        # Arrange
+        archive_path = str(tmp_path / "images.pak")
+        build_image_archive(archive_path, [
+            (ImageProvider.phase_image_name(illumination, phase_angle, "png"), b"\x89PNG archived")
+            for illumination in range(0, 101) for phase_angle in (90.0, 270.0)
+        ])
+        app = create_app(test_config={'TESTING': True, 'IMAGE_ARCHIVE_PATH': archive_path})
+        archive_exporter = StaticSiteExporter(app, str(tmp_path / "site"))
+
+        # Act
+        page_dir = archive_exporter.export_date(date(2024, 1, 2))
+
+        # Assert
+        with open(os.path.join(page_dir, "moon.json")) as data_file:
+            moon_data = json.load(data_file)
+        with open(os.path.join(archive_exporter.output_dir, "images", moon_data["image_filename"]), "rb") as image:
+            assert image.read() == b"\x89PNG archived"
+
+    def test_export_range_rejects_reversed_dates(self, exporter):
+        """Test that an end date before the start date is rejected."""
+        with pytest.raises(ValueError):
+            exporter.export_range(date(2024, 1, 3), date(2024, 1, 1))
+
+    def test_update_today_pointer(self, exporter):
+        """Test that the today pointer is swapped to the requested date."""
+        # Arrange
+        exporter.export_range(date(2024, 1, 1), date(2024, 1, 2))
+
+        # Act
+        exporter.update_today_pointer(date(2024, 1, 1))
+        link = exporter.update_today_pointer(date(2024, 1, 2))
+
+        # Assert
+        assert os.readlink(link) == os.path.join("2024", "01", "02")
+        assert os.path.exists(os.path.join(link, "index.html"))
+
+    def test_update_today_pointer_requires_export(self, exporter):
+        """Test that the pointer is never swapped to a missing page."""
+        with pytest.raises(FileNotFoundError):
+            exporter.update_today_pointer(date(2030, 1, 1))